@@ -0,0 +1,71 @@
+from typing import Optional
+
+from PySide6.QtCore import QIODevice, QObject
+from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+
+from app.core.mixer import Mixer
+
+# Dispositivo de lectura que entrega al QAudioSink el audio generado por el mezclador
+class _MixerDevice(QIODevice):
+    def __init__(self, mixer: Mixer, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.mixer: Mixer = mixer
+
+    def readData(self, maxlen: int) -> bytes:
+        # Genera exactamente los frames que solicita el backend de audio
+        frames: int = maxlen // self.mixer.frame_bytes
+        if frames <= 0:
+            return b""
+        return self.mixer.render(frames)
+
+    def writeData(self, data: bytes) -> int:
+        # El dispositivo es de solo lectura
+        return -1
+
+    def bytesAvailable(self) -> int:
+        # El flujo es infinito: siempre hay datos disponibles
+        return 1 << 16
+
+    def isSequential(self) -> bool:
+        return True
+
+# Salida de audio basada en QAudioSink en modo pull
+# Mantiene un único flujo abierto al dispositivo predeterminado
+class QtAudioOutput(QObject):
+    def __init__(self, buffer_ms: int = 20, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        device = QMediaDevices.defaultAudioOutput()
+        preferred: QAudioFormat = device.preferredFormat()
+
+        # Usa la frecuencia nativa del dispositivo para evitar remuestreo en reproducción
+        self.format: QAudioFormat = QAudioFormat()
+        self.format.setSampleRate(preferred.sampleRate() or 48000)
+        self.format.setChannelCount(min(2, max(1, preferred.channelCount())))
+        self.format.setSampleFormat(QAudioFormat.Int16)
+
+        self.sink: QAudioSink = QAudioSink(device, self.format, self)
+        frame_bytes: int = self.format.bytesPerFrame()
+        self.sink.setBufferSize(self.format.sampleRate() * buffer_ms // 1000 * frame_bytes)
+        self._device: Optional[_MixerDevice] = None
+
+    @property
+    def sample_rate(self) -> int:
+        return self.format.sampleRate()
+
+    @property
+    def channels(self) -> int:
+        return self.format.channelCount()
+
+    def start(self, mixer: Mixer) -> None:
+        # Abre el flujo de salida alimentado por el mezclador
+        self.stop()
+        self._device = _MixerDevice(mixer, self)
+        self._device.open(QIODevice.ReadOnly)
+        self.sink.start(self._device)
+
+    def stop(self) -> None:
+        # Cierra el flujo de salida si está abierto
+        if self._device is not None:
+            self.sink.stop()
+            self._device.close()
+            self._device = None
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from PySide6.QtCore import QObject, QThread
+
+# Hilo dedicado al audio con su propio bucle de eventos
+# Aloja el motor de sonido para que la reproducción no dependa del hilo de la UI
+class AudioThread(QThread):
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.setObjectName("TypheraAudio")
+
+    def run(self) -> None:
+        # Ejecuta el bucle de eventos del hilo hasta que se invoque quit()
+        self.exec()
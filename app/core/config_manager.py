@@ -1,19 +1,45 @@
+import atexit
 import json
 import os
+import tempfile
+import threading
+import time
 from typing import Any, Dict, Optional
 from app.utils.paths import get_config_path
+from app.core.metrics import metrics
 
 # Gestiona la persistencia de la configuración del usuario
+# Los cambios se aplican en memoria al instante y se escriben en disco de forma
+# diferida desde un hilo propio, agrupando ráfagas (p. ej. el slider de volumen)
 class ConfigManager:
     _instance: Optional['ConfigManager'] = None
     _config: Dict[str, Any] = {}
     _file_path: str = ""
-    
+
+    # Tiempo de inactividad (s) antes de escribir los cambios pendientes
+    WRITE_DELAY: float = 0.5
+
     # Define la configuración base por defecto
     DEFAULT_SETTINGS: Dict[str, Any] = {
         "volume": 50,
         "theme": "dark",
-        "sound_pack": "default"
+        "sound_pack": "default",
+        "audio_engine": "auto",
+        "audio_process": False,
+        "input_backend": "auto",
+        "polyphony": 32,
+        "voice_steal": "oldest",
+        "release_sounds": True,
+        "normalize_loudness": True,
+        "idle_suspend_s": 120,
+        "rate_limit": 60,
+        "latency_stats": False,
+        "pack_cache_mb": 64,
+        "pack_prefetch": True,
+        "metrics_interval_s": 0,
+        "metrics_port": 0,
+        "update_check": True,
+        "update_url": "https://api.github.com/repos/KnnabizCode/Typhera/releases/latest"
     }
 
     def __new__(cls) -> 'ConfigManager':
@@ -27,7 +53,17 @@ class ConfigManager:
         # Establece la ruta del archivo y carga la configuración inicial
         config_dir: str = get_config_path()
         self._file_path = os.path.join(config_dir, "settings.json")
+
+        # Estado de la escritura diferida
+        self._cond: threading.Condition = threading.Condition()
+        self._write_lock: threading.Lock = threading.Lock()
+        self._dirty: bool = False
+        self._closing: bool = False
+        self._last_change: float = 0.0
+        self._writer: Optional[threading.Thread] = None
+
         self.load_config()
+        atexit.register(self.flush)
 
     def load_config(self) -> None:
         # Carga la configuración desde el disco o crea una por defecto si falla
@@ -43,18 +79,89 @@ class ConfigManager:
             self.save_config()
 
     def save_config(self) -> None:
-        # Persiste la configuración actual en el archivo JSON
-        try:
-            with open(self._file_path, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=4)
-        except Exception as e:
-            print(f"Error guardando config: {e}")
+        # Persiste la configuración actual en el archivo JSON de forma inmediata
+        with self._cond:
+            snapshot: Dict[str, Any] = dict(self._config)
+            self._dirty = False
+        self._write_file(snapshot)
+
+    def _write_file(self, data: Dict[str, Any]) -> None:
+        # Escribe en un archivo temporal y lo renombra de forma atómica
+        with self._write_lock:
+            tmp_path: str = ""
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp",
+                                                dir=os.path.dirname(self._file_path))
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._file_path)
+                metrics.config_writes += 1
+            except Exception as e:
+                print(f"Error guardando config: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+
+    def _writer_loop(self) -> None:
+        # Espera a que los cambios se estabilicen y los escribe fuera del hilo de la UI
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closing:
+                    self._cond.wait()
+                if not self._dirty:
+                    return
+
+                # Reinicia la espera con cada cambio nuevo (debounce)
+                while not self._closing:
+                    remaining: float = self._last_change + self.WRITE_DELAY - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                if not self._dirty:
+                    continue
+                snapshot: Dict[str, Any] = dict(self._config)
+                self._dirty = False
+
+            self._write_file(snapshot)
 
     def get(self, key: str, default: Any = None) -> Any:
         # Recupera un valor de configuración
         return self._config.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        # Actualiza un valor y persiste los cambios
-        self._config[key] = value
-        self.save_config()
+        # Actualiza un valor en memoria y programa su persistencia diferida
+        with self._cond:
+            if key in self._config and self._config[key] == value:
+                return
+            self._config[key] = value
+            self._dirty = True
+            self._last_change = time.monotonic()
+
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop,
+                                                name="TypheraConfigWriter", daemon=True)
+                self._writer.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        # Escribe de inmediato los cambios pendientes y detiene el hilo de escritura
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+            writer: Optional[threading.Thread] = self._writer
+
+        if writer is not None:
+            writer.join()
+
+        with self._cond:
+            self._writer = None
+            self._closing = False
+            pending: bool = self._dirty
+
+        if pending:
+            self.save_config()
@@ -0,0 +1,168 @@
+import threading
+import time
+from typing import Any, Optional, Set
+
+from app.core.config_manager import ConfigManager
+from app.core.state import AppState
+from app.core.latency import latency_tracker, now_ns
+from app.core.rate_governor import rate_governor
+from app.core.metrics import metrics
+from app.core.event_queue import key_events
+from app.core.mixer import Mixer
+from app.core.pack_cache import CachedPack
+from app.core.pack_loader import load_mixer_pack, publish_key_map
+from app.core.voices import DEFAULT_POLICY
+
+# Motor de audio sin Qt para el modo sin interfaz
+# Usa el mismo mezclador y los mismos packs que SoundEngine, pero la salida es
+# un flujo de sounddevice cuyo callback consume directamente la cola de eventos
+# (`key_events`, o la cola en memoria compartida si corre en su propio proceso)
+class DirectEngine:
+    def __init__(self, output: Optional[Any] = None, queue: Optional[Any] = None) -> None:
+        self.config: ConfigManager = ConfigManager()
+        self.volume: float = self.config.get("volume", 50) / 100.0
+        self.release_sounds: bool = bool(self.config.get("release_sounds", True))
+        self.normalize_loudness: bool = bool(self.config.get("normalize_loudness", True))
+        self.current_pack_name: str = ""
+        self.queue: Any = queue if queue is not None else key_events
+        latency_tracker.enabled = bool(self.config.get("latency_stats", False))
+        rate_governor.threshold = float(self.config.get("rate_limit", 60))
+        # Muestras ya disparadas en el lote actual de eventos (ver _play_event)
+        self._batch_sounds: Set[int] = set()
+
+        # Cualquier salida con la interfaz de SoundDeviceOutput (p. ej. la de
+        # reloj de key_trace.py, sin dispositivo)
+        if output is None:
+            from app.core.sd_output import SoundDeviceOutput
+            output = SoundDeviceOutput()
+        self.output: Any = output
+        self.mixer: Mixer = Mixer(self.output.sample_rate, self.output.channels,
+                                  max(1, int(self.config.get("polyphony", 32))),
+                                  str(self.config.get("voice_steal", DEFAULT_POLICY)))
+        self.mixer.volume = self.volume
+
+        # Reposo: tras `idle_suspend_s` sin eventos se cierra el flujo (0 lo desactiva)
+        # Mientras está cerrado, la cola despierta al motor con el primer evento
+        self.idle_suspend_s: float = float(self.config.get("idle_suspend_s", 120))
+        self.suspended: bool = False
+        self._last_activity: float = time.monotonic()
+        self._stream_lock: threading.Lock = threading.Lock()
+        # Abrir el dispositivo tarda decenas de ms: warm_up() solo lo pide y un
+        # hilo propio reabre el flujo, sin bloquear el gancho de teclado
+        self._resume_requested: threading.Event = threading.Event()
+        self._closing: bool = False
+        self._resumer: Optional[threading.Thread] = None
+
+        metrics.register_gauge("voices_in_use", self.mixer.active_voices)
+        metrics.register_gauge("voice_capacity", lambda: self.mixer.allocator.capacity)
+        metrics.register_gauge("voice_steals", lambda: self.mixer.allocator.steals)
+        metrics.register_gauge("audio_suspended", lambda: self.suspended)
+
+    def start(self) -> None:
+        # Carga el pack configurado y abre el flujo de salida
+        self.load_sound_pack(str(self.config.get("sound_pack", "Default")))
+        self.queue.clear()
+        self.output.start(self.mixer, self._drain_events)
+        self._resumer = threading.Thread(target=self._resume_loop, name="audio-resume", daemon=True)
+        self._resumer.start()
+
+    def stop(self) -> None:
+        # Cierra el flujo de salida y termina el hilo de reactivación
+        self.queue.set_waker(None)
+        self._closing = True
+        self._resume_requested.set()
+        if self._resumer is not None:
+            self._resumer.join(timeout=1.0)
+        with self._stream_lock:
+            self.output.stop()
+
+    def tick(self) -> None:
+        # Se llama periódicamente desde el hilo principal; entra en reposo si
+        # no hubo eventos durante el periodo configurado
+        if self.idle_suspend_s <= 0 or self.suspended:
+            return
+        if time.monotonic() - self._last_activity < self.idle_suspend_s:
+            return
+        with self._stream_lock:
+            self.suspended = True
+            self.output.stop()
+            self.mixer.silence()
+            self.queue.set_waker(self.warm_up)
+        # Un evento encolado justo antes de instalar el despertador no lo dispararía
+        if len(self.queue):
+            self.warm_up()
+        print("Audio en reposo")
+
+    def warm_up(self) -> None:
+        # Pide reabrir el flujo; la invocan la cola (primer evento) y el listener
+        # (modificadores) desde el hilo del gancho, así que solo marca la petición
+        if self.suspended:
+            self._resume_requested.set()
+
+    def _resume_loop(self) -> None:
+        # Atiende las peticiones de warm_up() fuera del hilo del gancho
+        while True:
+            self._resume_requested.wait()
+            self._resume_requested.clear()
+            if self._closing:
+                return
+            self._resume()
+
+    def _resume(self) -> None:
+        # Reabre el flujo; el callback consume los eventos pendientes en su primer bloque
+        with self._stream_lock:
+            if not self.suspended:
+                return
+            self.queue.set_waker(None)
+            self._last_activity = time.monotonic()
+            self.output.start(self.mixer, self._drain_events)
+            self.suspended = False
+        print("Audio reactivado")
+
+    def load_sound_pack(self, pack_name: str) -> None:
+        # Carga el pack y lo activa en el mezclador
+        started: float = time.perf_counter()
+        entry: Optional[CachedPack] = load_mixer_pack(pack_name, self.mixer.sample_rate,
+                                                      self.mixer.channels, self.normalize_loudness)
+        if entry is None:
+            return
+        metrics.pack_load_ms = (time.perf_counter() - started) * 1000.0
+        metrics.pack_loads += 1
+        self.current_pack_name = pack_name
+        self.mixer.set_samples(entry.samples, entry.gains)
+        publish_key_map(entry.pack, self.release_sounds)
+        print(f"Sonido cargado: {pack_name} -> {len(entry.pack.samples)} muestra(s), "
+              f"{len(entry.pack.release_samples)} de liberación")
+
+    def set_volume(self, volume_percent: int) -> None:
+        # Actualiza el volumen global
+        self.volume = max(0, min(100, volume_percent)) / 100.0
+        self.mixer.volume = self.volume
+
+    def reload_config(self) -> None:
+        # Vuelve a leer la configuración y aplica volumen y pack si cambiaron
+        self.config.load_config()
+        self.set_volume(int(self.config.get("volume", 50)))
+        pack_name: str = str(self.config.get("sound_pack", "Default"))
+        if pack_name != self.current_pack_name:
+            self.load_sound_pack(pack_name)
+
+    def _drain_events(self) -> None:
+        # Consume los eventos pendientes antes de cada bloque de audio
+        self._batch_sounds.clear()
+        if self.queue.drain(self._play_event):
+            self._last_activity = time.monotonic()
+
+    def _play_event(self, sound: int, key: Any, t_hook: int, t_push: int) -> None:
+        # Dispara la voz; el mezclador registra las etapas restantes al mezclarla
+        t_dispatch: int = now_ns()
+        latency_tracker.record("dispatch", t_push, t_dispatch)
+        if not AppState.is_active() or self.volume <= 0:
+            return
+        # Durante una ráfaga, la misma muestra suena una sola vez por lote
+        if rate_governor.thinning:
+            if sound in self._batch_sounds:
+                rate_governor.coalesced += 1
+                return
+            self._batch_sounds.add(sound)
+        self.mixer.trigger(sound, key, t_hook, t_dispatch)
@@ -0,0 +1,214 @@
+import gc
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+from app.core.config_manager import ConfigManager
+from app.core.metrics import metrics
+from app.core.pack_loader import publish_key_map
+from app.core.shm_ring import SharedEventRing
+from app.core.sound_pack import resolve_pack
+
+# Motor de audio en un proceso aparte
+# El proceso principal (listener e interfaz) publica los eventos en una cola de
+# registros fijos en memoria compartida y envía los cambios de configuración por
+# un canal de control (líneas JSON por la entrada estándar del proceso de audio).
+# El proceso de audio ejecuta DirectEngine sobre esa cola, de modo que el GIL,
+# el recolector de basura y el trabajo de la interfaz no retrasan el audio, y un
+# fallo del backend de audio no tumba al listener: el supervisor lo reinicia.
+#
+# Comandos de control: {"cmd": "volume" | "pack" | "invalidate" | "warm" | "stop", "value": ...}
+# En reposo el proceso de audio no sondea la cola: marca el reposo en la memoria
+# compartida y el primer evento encolado le envía "warm" por el canal de control.
+
+WORKER_FLAG: str = "--audio-worker"
+# Periodo de tick() en el proceso de audio
+TICK_S: float = 0.5
+# Esperas antes de cada reinicio tras un fallo; se reinician si el proceso
+# aguantó más de STABLE_S segundos
+RESTART_DELAYS: tuple = (1, 2, 5, 10, 30)
+STABLE_S: float = 60.0
+
+def _worker_command(ring_name: str) -> List[str]:
+    # Línea de comandos del proceso de audio (también en el ejecutable congelado)
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, WORKER_FLAG, ring_name]
+    main_path: Path = Path(__file__).resolve().parents[2] / "main.py"
+    return [sys.executable, str(main_path), WORKER_FLAG, ring_name]
+
+# Lado del proceso principal; expone la misma interfaz que usa la UI de SoundEngine
+class ProcessEngine:
+    def __init__(self) -> None:
+        self.config: ConfigManager = ConfigManager()
+        self.volume_percent: int = int(self.config.get("volume", 50))
+        self.release_sounds: bool = bool(self.config.get("release_sounds", True))
+        self.current_pack_name: str = str(self.config.get("sound_pack", "Default"))
+
+        self.ring: SharedEventRing = SharedEventRing()
+        # El primer evento con el proceso de audio en reposo lo despierta
+        self.ring.set_remote_waker(lambda: self._send("warm"))
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts: int = 0
+        self._spawned_at: float = 0.0
+        self._stopping: bool = False
+        # El canal de control se usa desde la UI y desde el listener (warm_up)
+        self._send_lock: threading.Lock = threading.Lock()
+        self._supervisor: Optional[threading.Thread] = None
+
+        metrics.register_gauge("audio_restarts", lambda: self.restarts)
+        metrics.register_gauge("queue_depth_shared", lambda: len(self.ring))
+        metrics.register_gauge("queue_full_shared", lambda: self.ring.dropped)
+
+    def start(self) -> None:
+        # El listener resuelve las muestras en este proceso: publica aquí la tabla
+        self._publish_key_map(self.current_pack_name)
+        self._spawn()
+        self._supervisor = threading.Thread(target=self._supervise, name="audio-supervisor",
+                                            daemon=True)
+        self._supervisor.start()
+
+    def stop(self) -> None:
+        # Pide al proceso de audio que termine y libera la memoria compartida
+        self._stopping = True
+        self._send("stop")
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=2.0)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        self.ring.close()
+
+    def _spawn(self) -> None:
+        # Lanza el proceso de audio; lee settings.json al arrancar, pero los
+        # cambios aún no escritos se le envían explícitamente
+        flags: int = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        self.process = subprocess.Popen(_worker_command(self.ring.name), stdin=subprocess.PIPE,
+                                        creationflags=flags)
+        self._spawned_at = time.monotonic()
+        self._send("volume", self.volume_percent)
+        self._send("pack", self.current_pack_name)
+
+    def _supervise(self) -> None:
+        # Reinicia el proceso de audio si termina sin que se haya pedido
+        attempt: int = 0
+        while True:
+            code: int = self.process.wait()
+            if self._stopping:
+                return
+            if time.monotonic() - self._spawned_at > STABLE_S:
+                attempt = 0
+            delay: int = RESTART_DELAYS[min(attempt, len(RESTART_DELAYS) - 1)]
+            attempt += 1
+            print(f"El proceso de audio terminó (código {code}); se reinicia en {delay}s")
+            time.sleep(delay)
+            if self._stopping:
+                return
+            self.restarts += 1
+            self._spawn()
+
+    def _send(self, cmd: str, value: Any = None) -> None:
+        # Envía un comando de control; si el proceso cayó, el supervisor lo reinicia
+        if self.process is None:
+            return
+        line: bytes = (json.dumps({"cmd": cmd, "value": value}) + "\n").encode('utf-8')
+        with self._send_lock:
+            try:
+                self.process.stdin.write(line)
+                self.process.stdin.flush()
+            except (OSError, ValueError):
+                pass
+
+    def _publish_key_map(self, pack_name: str) -> None:
+        publish_key_map(resolve_pack(pack_name), self.release_sounds)
+
+    def set_volume(self, volume_percent: int) -> None:
+        # Actualiza el volumen global
+        self.volume_percent = max(0, min(100, volume_percent))
+        self.config.set("volume", volume_percent)
+        self._send("volume", self.volume_percent)
+
+    def load_sound_pack(self, pack_name: str) -> None:
+        # Publica la tabla de teclas del pack y pide al proceso de audio que lo cargue
+        self.current_pack_name = pack_name
+        self._publish_key_map(pack_name)
+        self._send("pack", pack_name)
+
+    def prefetch_packs(self, pack_names: List[str]) -> None:
+        # El proceso de audio no mantiene caché de packs; la caché de importación
+        # ya hace que cargarlos sea barato
+        pass
+
+    def invalidate_pack(self, pack_name: str) -> None:
+        # Recarga el pack activo si cambió en disco
+        if pack_name == self.current_pack_name:
+            self._publish_key_map(pack_name)
+            self._send("invalidate", pack_name)
+
+    def warm_up(self) -> None:
+        # Reactiva la salida por adelantado si el proceso de audio está en reposo;
+        # con el audio activo no escribe nada en el canal de control
+        if self.ring.sleeping:
+            self._send("warm")
+
+    def reload_config(self) -> None:
+        # Vuelve a leer la configuración y aplica volumen y pack si cambiaron
+        self.config.load_config()
+        self.set_volume(int(self.config.get("volume", 50)))
+        pack_name: str = str(self.config.get("sound_pack", "Default"))
+        if pack_name != self.current_pack_name:
+            self.load_sound_pack(pack_name)
+
+    @staticmethod
+    def get_available_packs() -> List[str]:
+        # Enumera los packs de sonido disponibles según el índice de la biblioteca
+        from app.core.pack_library import get_pack_library
+        return get_pack_library().pack_names()
+
+def worker_main(argv: List[str]) -> None:
+    # Punto de entrada del proceso de audio
+    from app.core.direct_engine import DirectEngine
+    ring: SharedEventRing = SharedEventRing(argv[argv.index(WORKER_FLAG) + 1])
+    engine: DirectEngine = DirectEngine(queue=ring)
+    engine.start()
+    # Los objetos cargados hasta aquí viven todo el proceso: se excluyen del
+    # recolector para que sus pasadas no recorran los packs
+    gc.freeze()
+
+    stop: threading.Event = threading.Event()
+
+    def read_commands() -> None:
+        # Atiende el canal de control; el fin de la entrada significa que el
+        # proceso principal terminó
+        for line in sys.stdin:
+            try:
+                message: Any = json.loads(line)
+            except ValueError:
+                continue
+            cmd: str = message.get("cmd", "")
+            value: Any = message.get("value")
+            if cmd == "stop":
+                break
+            elif cmd == "volume":
+                engine.set_volume(int(value))
+            elif cmd == "pack" and value != engine.current_pack_name:
+                engine.load_sound_pack(str(value))
+            elif cmd == "invalidate" and value == engine.current_pack_name:
+                engine.load_sound_pack(str(value))
+            elif cmd == "warm":
+                engine.warm_up()
+        stop.set()
+
+    threading.Thread(target=read_commands, name="audio-control", daemon=True).start()
+
+    # En reposo el hilo principal solo despierta con tick(); los eventos llegan
+    # con la orden "warm" que envía el productor (ver SharedEventRing.set_waker)
+    while not stop.wait(TICK_S):
+        engine.tick()
+
+    engine.stop()
+    ring.close()
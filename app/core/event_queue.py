@@ -0,0 +1,81 @@
+from typing import Any, Callable, List, Optional
+
+# Capacidad por defecto de la cola de eventos (potencia de dos)
+DEFAULT_CAPACITY: int = 256
+
+# Cola circular acotada de un solo productor y un solo consumidor
+# El productor (hilo del listener) solo escribe `_tail` y el consumidor
+# (hilo de audio) solo escribe `_head`; bajo el GIL cada asignación es atómica,
+# por lo que no se necesitan bloqueos. Los registros se guardan en arreglos
+# preasignados para no reservar memoria por evento.
+class KeyEventQueue:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        # Redondea la capacidad a potencia de dos para indexar con una máscara
+        size: int = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity: int = size
+        self._mask: int = size - 1
+
+        self._sounds: List[int] = [0] * size
+        self._keys: List[Any] = [None] * size
+        self._t_hook: List[int] = [0] * size
+        self._t_push: List[int] = [0] * size
+        self._head: int = 0
+        self._tail: int = 0
+
+        # Eventos descartados por cola llena
+        self.dropped: int = 0
+
+        # Función para despertar al consumidor; se invoca solo cuando no hay
+        # un despertar pendiente para coalescer ráfagas de eventos
+        self._waker: Optional[Callable[[], None]] = None
+        self._wake_pending: bool = False
+
+    def set_waker(self, waker: Optional[Callable[[], None]]) -> None:
+        # Registra la función que notifica al hilo consumidor
+        self._waker = waker
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def push(self, sound: int, key: Any, t_hook: int, t_push: int) -> bool:
+        # Encola un evento desde el hilo productor; retorna False si está llena
+        tail: int = self._tail
+        if tail - self._head >= self.capacity:
+            self.dropped += 1
+            return False
+
+        index: int = tail & self._mask
+        self._sounds[index] = sound
+        self._keys[index] = key
+        self._t_hook[index] = t_hook
+        self._t_push[index] = t_push
+        # Publica el registro solo después de escribirlo por completo
+        self._tail = tail + 1
+
+        if not self._wake_pending and self._waker is not None:
+            self._wake_pending = True
+            self._waker()
+        return True
+
+    def drain(self, handler: Callable[[int, Any, int, int], None]) -> int:
+        # Consume todos los eventos pendientes desde el hilo consumidor
+        # El indicador se limpia antes de leer `_tail` para no perder despertares
+        self._wake_pending = False
+        head: int = self._head
+        count: int = 0
+        while head != self._tail:
+            index: int = head & self._mask
+            handler(self._sounds[index], self._keys[index], self._t_hook[index], self._t_push[index])
+            head += 1
+            self._head = head
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        # Descarta los eventos pendientes (solo desde el consumidor)
+        self._head = self._tail
+
+# Instancia global compartida entre el listener y el hilo de audio
+key_events: KeyEventQueue = KeyEventQueue()
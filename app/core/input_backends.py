@@ -0,0 +1,395 @@
+import os
+import selectors
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Fuentes de eventos de teclado para KeyboardMonitor
+# Cada fuente entrega códigos de tecla enteros a `on_press`/`on_release` desde su
+# propio hilo y publica qué códigos forman cada grupo de sonido (ver key_map.py):
+#   pynput     ganchos del sistema (Windows, macOS y X11)
+#   evdev      lectura directa de /dev/input/event* en Linux; evita la capa de
+#              traducción de X11 y funciona en sesiones Wayland (requiere permiso
+#              de lectura, p. ej. pertenecer al grupo `input`)
+#   synthetic  reproduce una secuencia de eventos; sirve para medir el recorrido
+#              de entrada en máquinas sin teclado ni servidor gráfico
+
+BACKENDS: Tuple[str, ...] = ("auto", "pynput", "evdev", "synthetic")
+
+KeyCallback = Callable[[Any], None]
+
+# Interfaz común de las fuentes de entrada
+# start() lanza OSError si la fuente no puede engancharse (p. ej. sin permisos)
+class InputBackend(ABC):
+    name: str = ""
+
+    def __init__(self, on_press: KeyCallback, on_release: KeyCallback) -> None:
+        self.on_press: KeyCallback = on_press
+        self.on_release: KeyCallback = on_release
+
+    @abstractmethod
+    def key_codes(self) -> Dict[str, List[int]]:
+        # Retorna los códigos de tecla de cada grupo de sonido
+        ...
+
+    @abstractmethod
+    def start(self) -> None:
+        # Empieza a entregar eventos desde un hilo propio
+        ...
+
+    @abstractmethod
+    def stop(self) -> None:
+        # Deja de entregar eventos y libera los recursos
+        ...
+
+    def held_keys(self) -> List[int]:
+        # Retorna las teclas pulsadas ahora mismo (vacío si no puede saberse)
+        return []
+
+# --- pynput ---
+
+# Teclas especiales de pynput que forman cada grupo de sonido
+_SPECIAL_GROUPS: Dict[str, List[str]] = {
+    "space": ["space"],
+    "enter": ["enter"],
+    "backspace": ["backspace"],
+    "modifier": ["shift", "shift_l", "shift_r", "ctrl", "ctrl_l", "ctrl_r",
+                 "alt", "alt_l", "alt_r", "alt_gr", "cmd", "cmd_l", "cmd_r"],
+}
+
+# Códigos de tecla virtuales de letras y dígitos en macOS (distribución ANSI)
+_MAC_ALPHANUMERIC: List[int] = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 14, 15, 16, 17, 18,
+                                19, 20, 21, 22, 23, 25, 26, 28, 29, 31, 32, 34, 35, 37, 38,
+                                40, 45, 46]
+
+def _alphanumeric_codes() -> List[int]:
+    # Retorna los códigos virtuales de letras y dígitos de la plataforma actual
+    if sys.platform == "darwin":
+        return list(_MAC_ALPHANUMERIC)
+    codes: List[int] = list(range(0x30, 0x3A)) + list(range(0x41, 0x5B))
+    if sys.platform != "win32":
+        # En X11 los códigos son keysyms y las minúsculas tienen valor propio
+        codes += list(range(0x61, 0x7B))
+    return codes
+
+def key_code(key: Any) -> Any:
+    # Obtiene el código virtual de un evento de pynput
+    # KeyCode lo expone en `vk`; los miembros de Key lo guardan en `value.vk`
+    vk: Optional[int] = getattr(key, "vk", None)
+    if vk is None:
+        vk = getattr(getattr(key, "value", None), "vk", None)
+    # Algunos eventos sintéticos solo traen el carácter
+    return key if vk is None else vk
+
+# Ganchos globales de pynput; se importa al crear la fuente porque en Linux
+# necesita un servidor X disponible
+class PynputBackend(InputBackend):
+    name: str = "pynput"
+
+    def __init__(self, on_press: KeyCallback, on_release: KeyCallback) -> None:
+        super().__init__(on_press, on_release)
+        from pynput import keyboard
+        self._keyboard: Any = keyboard
+        self.listener: Optional[Any] = None
+
+    def key_codes(self) -> Dict[str, List[int]]:
+        # Calcula una sola vez los códigos virtuales de cada grupo de teclas
+        codes: Dict[str, List[int]] = {"alphanumeric": _alphanumeric_codes()}
+        for group, names in _SPECIAL_GROUPS.items():
+            values: List[int] = []
+            for name in names:
+                # Algunas teclas no existen en todas las plataformas
+                member: Any = getattr(self._keyboard.Key, name, None)
+                vk: Optional[int] = getattr(getattr(member, "value", None), "vk", None)
+                if vk is not None and vk not in values:
+                    values.append(vk)
+            codes[group] = values
+        return codes
+
+    def start(self) -> None:
+        # Un Listener de pynput no puede reiniciarse: se crea uno nuevo cada vez
+        self.listener = self._keyboard.Listener(on_press=self._press, on_release=self._release)
+        self.listener.start()
+
+    def stop(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def _press(self, key: Any) -> None:
+        self.on_press(key_code(key))
+
+    def _release(self, key: Any) -> None:
+        self.on_release(key_code(key))
+
+# --- evdev ---
+
+# struct input_event: timeval (dos long), tipo, código y valor
+_INPUT_EVENT: struct.Struct = struct.Struct("llHHi")
+EV_KEY: int = 0x01
+EV_REP: int = 0x14
+# Valores de EV_KEY: 0 liberación, 1 pulsación, 2 repetición automática (se ignora)
+_KEY_UP: int = 0
+_KEY_DOWN: int = 1
+# ioctl EVIOCGKEY: mapa de bits con el estado de cada tecla (KEY_MAX = 0x2ff)
+_KEY_STATE_BYTES: int = 0x300 // 8
+_EVIOCGKEY: int = (2 << 30) | (_KEY_STATE_BYTES << 16) | (ord('E') << 8) | 0x18
+
+# Códigos de tecla del núcleo (linux/input-event-codes.h), independientes de la distribución
+_EVDEV_GROUPS: Dict[str, List[int]] = {
+    # KEY_1..KEY_0, KEY_Q..KEY_P, KEY_A..KEY_L, KEY_Z..KEY_M
+    "alphanumeric": list(range(2, 12)) + list(range(16, 26)) + list(range(30, 39)) + list(range(44, 51)),
+    "space": [57],
+    # KEY_ENTER y KEY_KPENTER
+    "enter": [28, 96],
+    "backspace": [14],
+    # Ctrl, Shift, Alt y Meta izquierdos y derechos
+    "modifier": [29, 42, 54, 56, 97, 100, 125, 126],
+}
+
+def find_keyboards() -> List[str]:
+    # Lista los dispositivos de /dev/input que son teclados según el núcleo
+    # Un teclado tiene el manejador `kbd` y admite teclas con repetición
+    # (descarta botones de encendido y similares)
+    devices: List[str] = []
+    try:
+        with open("/proc/bus/input/devices", 'r', encoding='utf-8', errors='replace') as f:
+            blocks: List[str] = f.read().split("\n\n")
+    except OSError:
+        return devices
+
+    for block in blocks:
+        handlers: List[str] = []
+        ev_bits: int = 0
+        for line in block.splitlines():
+            if line.startswith("H: Handlers="):
+                handlers = line.split("=", 1)[1].split()
+            elif line.startswith("B: EV="):
+                ev_bits = int(line.split("=", 1)[1], 16)
+        if "kbd" not in handlers or not ev_bits & (1 << EV_KEY) or not ev_bits & (1 << EV_REP):
+            continue
+        devices += [f"/dev/input/{name}" for name in handlers if name.startswith("event")]
+    return devices
+
+def evdev_available() -> bool:
+    # Indica si hay algún teclado legible directamente
+    if not sys.platform.startswith("linux"):
+        return False
+    return any(os.access(path, os.R_OK) for path in find_keyboards())
+
+# Lee los eventos del núcleo de todos los teclados con un único hilo y un selector
+class EvdevBackend(InputBackend):
+    name: str = "evdev"
+
+    def __init__(self, on_press: KeyCallback, on_release: KeyCallback,
+                 devices: Optional[List[str]] = None) -> None:
+        super().__init__(on_press, on_release)
+        self.devices: List[str] = devices if devices is not None else find_keyboards()
+        self._thread: Optional[threading.Thread] = None
+        # Tubería para despertar al hilo lector al detenerlo
+        self._wake_fds: Optional[Tuple[int, int]] = None
+
+    def key_codes(self) -> Dict[str, List[int]]:
+        return {group: list(codes) for group, codes in _EVDEV_GROUPS.items()}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        fds: List[int] = []
+        for path in self.devices:
+            try:
+                fds.append(os.open(path, os.O_RDONLY | os.O_NONBLOCK))
+            except OSError as e:
+                print(f"No se puede leer {path}: {e}")
+        if not fds:
+            raise OSError("No hay ningún teclado legible en /dev/input")
+
+        self._wake_fds = os.pipe()
+        self._thread = threading.Thread(target=self._run, args=(fds, self._wake_fds[0]),
+                                        name="evdev", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        write_fd: int = self._wake_fds[1]
+        os.write(write_fd, b"\0")
+        self._thread.join(timeout=1.0)
+        os.close(write_fd)
+        self._thread = None
+        self._wake_fds = None
+
+    def held_keys(self) -> List[int]:
+        # Consulta al núcleo qué teclas están pulsadas en cada teclado
+        # Si la fuente está detenida, abre los dispositivos solo para la consulta
+        import fcntl
+        held: List[int] = []
+        for path in self.devices:
+            try:
+                fd: int = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError:
+                continue
+            state: bytearray = bytearray(_KEY_STATE_BYTES)
+            try:
+                fcntl.ioctl(fd, _EVIOCGKEY, state)
+            except OSError:
+                continue
+            finally:
+                os.close(fd)
+            held += [index * 8 + bit for index, byte in enumerate(state) if byte
+                     for bit in range(8) if byte >> bit & 1]
+        return held
+
+    def _run(self, fds: List[int], wake_fd: int) -> None:
+        # Bucle del hilo lector; cierra los descriptores al terminar
+        selector: selectors.BaseSelector = selectors.DefaultSelector()
+        for fd in fds:
+            selector.register(fd, selectors.EVENT_READ)
+        selector.register(wake_fd, selectors.EVENT_READ)
+        try:
+            while True:
+                for key, _ in selector.select():
+                    if key.fd == wake_fd:
+                        return
+                    try:
+                        data: bytes = os.read(key.fd, _INPUT_EVENT.size * 64)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        data = b""
+                    if not data:
+                        # El dispositivo se desconectó
+                        selector.unregister(key.fd)
+                        continue
+                    for _, _, ev_type, code, value in _INPUT_EVENT.iter_unpack(data):
+                        if ev_type != EV_KEY:
+                            continue
+                        if value == _KEY_DOWN:
+                            self.on_press(code)
+                        elif value == _KEY_UP:
+                            self.on_release(code)
+        finally:
+            selector.close()
+            for fd in fds + [wake_fd]:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+# --- sintética ---
+
+# Evento sintético: instante relativo al inicio (ns), código y si es pulsación
+SyntheticEvent = Tuple[int, int, bool]
+
+# Entrega una secuencia de eventos desde un hilo propio respetando sus tiempos
+# Por defecto usa los códigos de evdev para que las secuencias sean iguales en
+# todas las plataformas; las trazas grabadas traen los grupos de su propia fuente.
+# Con `speed` mayor que 1 se acelera; con 0 se entrega sin esperas.
+class SyntheticBackend(InputBackend):
+    name: str = "synthetic"
+
+    def __init__(self, on_press: KeyCallback, on_release: KeyCallback,
+                 events: List[SyntheticEvent], speed: float = 1.0,
+                 codes: Optional[Dict[str, List[int]]] = None) -> None:
+        super().__init__(on_press, on_release)
+        self.events: List[SyntheticEvent] = events
+        self.speed: float = speed
+        self.codes: Dict[str, List[int]] = codes or _EVDEV_GROUPS
+        # Siguiente evento a entregar; al reanudar tras stop() se continúa desde aquí
+        self.position: int = 0
+        # Teclas pulsadas según la secuencia entregada hasta ahora
+        self._down: Set[int] = set()
+        # Se activa cuando se entregó el último evento
+        self.finished: threading.Event = threading.Event()
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_file(cls, on_press: KeyCallback, on_release: KeyCallback, path: Path,
+                  speed: float = 1.0) -> 'SyntheticBackend':
+        # Carga una traza grabada (ver key_trace.py) o un archivo de texto
+        from app.core import key_trace
+        if key_trace.is_trace(path):
+            meta, events = key_trace.read_trace(path)
+            return cls(on_press, on_release, events, speed, meta.get("codes"))
+        return cls(on_press, on_release, cls.read_events(path), speed)
+
+    @staticmethod
+    def read_events(path: Path) -> List[SyntheticEvent]:
+        # Lee un archivo de texto con una línea por evento: <ms> <código> <down|up>
+        # Las líneas vacías y las que empiezan por # se ignoran
+        events: List[SyntheticEvent] = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields: List[str] = line.split()
+                if not fields or fields[0].startswith("#"):
+                    continue
+                events.append((int(float(fields[0]) * 1_000_000), int(fields[1]), fields[2] == "down"))
+        return events
+
+    def key_codes(self) -> Dict[str, List[int]]:
+        return {group: list(codes) for group, codes in self.codes.items()}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, name="synthetic-input", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def held_keys(self) -> List[int]:
+        return list(self._down)
+
+    def _run(self) -> None:
+        if self.position >= len(self.events):
+            self.position = 0
+            self._down.clear()
+        base: int = self.events[self.position][0] if self.events else 0
+        start: int = time.perf_counter_ns()
+        for offset, code, pressed in self.events[self.position:]:
+            offset -= base
+            if self.speed > 0:
+                delay: float = (start + offset / self.speed - time.perf_counter_ns()) / 1e9
+                if delay > 0 and self._stop.wait(delay):
+                    return
+            elif self._stop.is_set():
+                return
+            if pressed:
+                self._down.add(code)
+                self.on_press(code)
+            else:
+                self._down.discard(code)
+                self.on_release(code)
+            self.position += 1
+        self.finished.set()
+        print("Secuencia sintética terminada")
+
+def create_backend(name: str, on_press: KeyCallback, on_release: KeyCallback,
+                   source: Optional[str] = None, speed: float = 1.0) -> InputBackend:
+    # Crea la fuente de entrada indicada; "auto" usa evdev en sesiones Wayland
+    # o sin servidor X si hay teclados legibles, y pynput en los demás casos
+    if name == "auto":
+        no_x11: bool = bool(os.environ.get("WAYLAND_DISPLAY")) or not os.environ.get("DISPLAY")
+        name = "evdev" if sys.platform.startswith("linux") and no_x11 and evdev_available() else "pynput"
+
+    if name == "evdev":
+        return EvdevBackend(on_press, on_release)
+    if name == "synthetic":
+        if source is None:
+            raise ValueError("La fuente sintética necesita un archivo de eventos")
+        return SyntheticBackend.from_file(on_press, on_release, Path(source), speed)
+    if name != "pynput":
+        raise ValueError(f"Fuente de entrada desconocida: {name}")
+    return PynputBackend(on_press, on_release)
@@ -0,0 +1,177 @@
+import argparse
+import getpass
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+# Instancia única y canal de órdenes
+# La primera instancia, con o sin interfaz, escucha en un socket local (socket
+# Unix en Linux/macOS, tubería con nombre en Windows). Una segunda ejecución de
+# main.py se conecta, le reenvía su orden y termina sin crear el motor, el
+# listener ni la interfaz.
+# El mismo canal sirve para automatizar Typhera desde scripts: cada conexión
+# envía órdenes de una línea en UTF-8 y recibe una línea de respuesta por orden
+# ("ok ..." o "error ...").
+#
+#   show | pause | resume | toggle | pack <nombre> | volume <0-100> | status | quit
+
+# Tiempo máximo de espera del cliente; la instancia responde desde su bucle de eventos
+CLIENT_TIMEOUT_MS: int = 1000
+
+# Opciones de línea de comandos que se traducen a órdenes del canal
+_FLAG_COMMANDS: Dict[str, str] = {
+    "--show": "show",
+    "--pause": "pause",
+    "--resume": "resume",
+    "--toggle": "toggle",
+    "--status": "status",
+    "--quit": "quit",
+}
+_FLAG_ARGUMENTS: Dict[str, str] = {
+    "--pack": "pack",
+    "--volume": "volume",
+    "--send": "",
+}
+
+def server_name() -> str:
+    # Nombre del socket, uno por usuario del sistema
+    try:
+        user: str = getpass.getuser()
+    except Exception:
+        user = "user"
+    return "typhera-" + re.sub(r"[^A-Za-z0-9_.-]", "_", user)
+
+def command_from_args(argv: List[str]) -> Optional[str]:
+    # Traduce las opciones de main.py a una orden; None si no se pidió ninguna
+    for index, arg in enumerate(argv):
+        if arg in _FLAG_COMMANDS:
+            return _FLAG_COMMANDS[arg]
+        if arg in _FLAG_ARGUMENTS and index + 1 < len(argv):
+            return f"{_FLAG_ARGUMENTS[arg]} {argv[index + 1]}".strip()
+    return None
+
+def add_command_arguments(parser: Any) -> None:
+    # Acepta las opciones de órdenes en un ArgumentParser (modo sin interfaz)
+    for flag in _FLAG_COMMANDS:
+        parser.add_argument(flag, action="store_true", help=argparse.SUPPRESS)
+    for flag in _FLAG_ARGUMENTS:
+        parser.add_argument(flag, default=None, help=argparse.SUPPRESS)
+
+def send_command(command: str, timeout_ms: int = CLIENT_TIMEOUT_MS) -> Optional[str]:
+    # Envía una orden a la instancia en ejecución y retorna su respuesta
+    # Retorna None si no hay ninguna escuchando
+    socket: QLocalSocket = QLocalSocket()
+    socket.connectToServer(server_name())
+    if not socket.waitForConnected(timeout_ms):
+        return None
+    socket.write((command.strip() + "\n").encode('utf-8'))
+    socket.flush()
+    reply: bytes = b""
+    while not reply.endswith(b"\n") and socket.waitForReadyRead(timeout_ms):
+        reply += bytes(socket.readAll())
+    socket.disconnectFromServer()
+    return str(reply, 'utf-8').strip()
+
+def forward_to_running(argv: List[str], default: str = "show") -> bool:
+    # Si ya hay una instancia, le pasa la orden de la línea de comandos (por
+    # defecto, mostrar la ventana), imprime la respuesta y retorna True
+    command: str = command_from_args(argv) or default
+    reply: Optional[str] = send_command(command)
+    if reply is None:
+        return False
+    print(reply or "error: sin respuesta")
+    return True
+
+def status_line(engine: Any) -> str:
+    # Respuesta común de las órdenes que terminan bien: estado, pack y volumen
+    from app.core.config_manager import ConfigManager
+    from app.core.state import AppState
+    state: str = "active" if AppState.is_active() else "paused"
+    pack: str = engine.current_pack_name if engine is not None else ""
+    return f"ok {state} pack={pack} volume={ConfigManager().get('volume', 50)}"
+
+# Servidor de órdenes de la instancia principal; vive en el hilo de la UI
+class InstanceServer(QObject):
+    def __init__(self, handler: Optional[Callable[[str], str]] = None,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        # Sin manejador, las órdenes recibidas esperan en su búfer hasta set_handler
+        self.handler: Optional[Callable[[str], str]] = handler
+        # Sin opciones de acceso: con ellas Qt reemplaza el socket existente en
+        # lugar de fallar y se perdería la detección de otra instancia. Los
+        # permisos por defecto (umask) ya impiden escribir a otros usuarios.
+        self.server: QLocalServer = QLocalServer(self)
+        self.server.newConnection.connect(self._accept)
+        self._buffers: Dict[QLocalSocket, bytes] = {}
+
+    def listen(self) -> bool:
+        # Empieza a escuchar; retorna False si otra instancia ganó la carrera
+        # Un socket huérfano de una ejecución que terminó mal impide escuchar:
+        # se elimina solo si nadie responde en él
+        name: str = server_name()
+        if not self.server.listen(name):
+            if send_command("status", 200) is not None:
+                return False
+            QLocalServer.removeServer(name)
+            if not self.server.listen(name):
+                print(f"No se pudo abrir el canal de instancia única: {self.server.errorString()}")
+                return False
+        return True
+
+    def set_handler(self, handler: Callable[[str], str]) -> None:
+        # Instala el manejador y atiende las órdenes que llegaron antes
+        self.handler = handler
+        for socket in list(self._buffers):
+            self._serve(socket)
+
+    def close(self) -> None:
+        # Deja de escuchar, cierra las conexiones abiertas y libera el socket
+        # Las conexiones se desconectan de este objeto antes de liberarlas para
+        # que ninguna señal llegue a un servidor ya destruido
+        self.server.newConnection.disconnect(self._accept)
+        for socket in list(self._buffers):
+            socket.readyRead.disconnect(self._read)
+            socket.disconnected.disconnect(self._drop)
+            socket.abort()
+            socket.deleteLater()
+        self._buffers.clear()
+        self.server.close()
+
+    def _accept(self) -> None:
+        # Atiende las conexiones pendientes
+        while self.server.hasPendingConnections():
+            socket: QLocalSocket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(self._read)
+            socket.disconnected.connect(self._drop)
+
+    def _read(self) -> None:
+        # Acumula lo recibido y lo atiende si ya hay manejador
+        socket: QLocalSocket = self.sender()
+        self._buffers[socket] = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        self._serve(socket)
+
+    def _serve(self, socket: QLocalSocket) -> None:
+        # Ejecuta cada línea completa del búfer y responde con otra línea
+        if self.handler is None:
+            return
+        *lines, rest = self._buffers.get(socket, b"").split(b"\n")
+        self._buffers[socket] = rest
+        for line in lines:
+            command: str = str(line, 'utf-8', errors='replace').strip()
+            if not command:
+                continue
+            try:
+                reply: str = self.handler(command)
+            except Exception as e:
+                reply = f"error: {e}"
+            socket.write((reply.replace("\n", " ") + "\n").encode('utf-8'))
+        socket.flush()
+
+    def _drop(self) -> None:
+        # Libera el búfer de una conexión cerrada
+        socket: QLocalSocket = self.sender()
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
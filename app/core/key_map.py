@@ -0,0 +1,49 @@
+from typing import Dict, Iterable, Tuple
+
+# Tabla precalculada código de tecla -> índice de muestra
+# La fuente de entrada registra qué códigos pertenecen a cada grupo y el motor
+# registra qué muestra usa cada grupo del pack activo; ambas partes se combinan
+# aquí una sola vez para que el listener resuelva cada evento con un único
+# `table.get(code, 0)` (la muestra 0 cubre las teclas sin grupo propio)
+# Las muestras de liberación se publican junto con su valor por defecto en la
+# tupla `release` (tabla, muestra por defecto; -1 = sin sonido al soltar)
+class KeyMap:
+    def __init__(self) -> None:
+        self.table: Dict[int, int] = {}
+        self.release: Tuple[Dict[int, int], int] = ({}, -1)
+        self._codes: Dict[str, Iterable[int]] = {}
+        self._groups: Dict[str, int] = {}
+        self._release_groups: Dict[str, int] = {}
+        self._release_default: int = -1
+
+    def set_codes(self, codes: Dict[str, Iterable[int]]) -> None:
+        # Registra los códigos de tecla de cada grupo (lado del listener)
+        self._codes = {group: tuple(values) for group, values in codes.items()}
+        self._rebuild()
+
+    def set_groups(self, groups: Dict[str, int]) -> None:
+        # Registra el índice de muestra de cada grupo (lado del motor)
+        self._groups = dict(groups)
+        self._rebuild()
+
+    def set_release(self, groups: Dict[str, int], default: int = -1) -> None:
+        # Registra las muestras de liberación de cada grupo (lado del motor)
+        self._release_groups = dict(groups)
+        self._release_default = default
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        # Publica una tabla nueva con una sola asignación atómica
+        self.table = self._resolve(self._groups)
+        self.release = (self._resolve(self._release_groups), self._release_default)
+
+    def _resolve(self, groups: Dict[str, int]) -> Dict[int, int]:
+        # Expande cada grupo a sus códigos de tecla
+        table: Dict[int, int] = {}
+        for group, sample in groups.items():
+            for code in self._codes.get(group, ()):
+                table[code] = sample
+        return table
+
+# Instancia global compartida entre el listener y el motor de audio
+key_map: KeyMap = KeyMap()
@@ -0,0 +1,208 @@
+import argparse
+import json
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.latency import latency_tracker, now_ns
+from app.core.rate_governor import rate_governor
+
+# Trazas de pulsaciones para reproducir sesiones de escritura como prueba de carga
+#
+#   cabecera   magic(8) versión(u16) tamaño_metadatos(u32)
+#   metadatos  JSON (UTF-8): fuente de entrada y códigos de cada grupo de teclas
+#   registros  delta(u32, µs desde el anterior) código(u32) pulsación(u8)
+#
+# Los códigos dependen de la fuente que grabó la traza (vk de pynput o códigos
+# de evdev); los metadatos guardan sus grupos para que la reproducción resuelva
+# las mismas muestras en cualquier plataforma.
+#
+#   python main.py --headless --record sesion.trace
+#   python -m app.core.key_trace replay sesion.trace [--speed 4] [--output null|direct]
+#   python -m app.core.key_trace info sesion.trace
+
+MAGIC: bytes = b"TYTRACE\0"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<8sHI")
+RECORD: struct.Struct = struct.Struct("<IIB")
+# Tamaño del búfer de grabación antes de escribir en disco
+FLUSH_BYTES: int = 64 * 1024
+# Tiempo que se deja sonar la última muestra antes de cerrar la reproducción
+TAIL_S: float = 0.5
+
+# Graba los eventos crudos del listener (antes de cualquier filtro)
+# Solo lo usa el hilo de la fuente de entrada, así que no necesita bloqueos
+class TraceRecorder:
+    def __init__(self, path: Path, backend: str, codes: Dict[str, List[int]]) -> None:
+        self.path: Path = path
+        self.count: int = 0
+        self._buffer: bytearray = bytearray()
+        self._last: int = 0
+        self._file: Any = open(path, 'wb')
+
+        meta: bytes = json.dumps({"backend": backend, "codes": codes}).encode('utf-8')
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(meta)))
+        self._file.write(meta)
+
+    def record(self, code: Any, pressed: bool, t_ns: int) -> None:
+        # Añade un evento; los caracteres sin código virtual no se graban
+        if not isinstance(code, int) or self._file is None:
+            return
+        delta: int = 0 if self._last == 0 else (t_ns - self._last) // 1000
+        self._last = t_ns
+        self._buffer += RECORD.pack(min(delta, 0xFFFFFFFF), code & 0xFFFFFFFF, pressed)
+        self.count += 1
+        if len(self._buffer) >= FLUSH_BYTES:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def close(self) -> None:
+        # Escribe lo pendiente y cierra el archivo
+        if self._file is None:
+            return
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._file.close()
+        self._file = None
+        print(f"Traza guardada: {self.path} ({self.count} eventos)")
+
+def is_trace(path: Path) -> bool:
+    # Indica si el archivo empieza con la cabecera de una traza
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def read_trace(path: Path) -> Tuple[Dict[str, Any], List[Tuple[int, int, bool]]]:
+    # Retorna los metadatos y los eventos (instante relativo en ns, código, pulsación)
+    with open(path, 'rb') as f:
+        magic, version, meta_len = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("No es una traza de Typhera")
+        if version > VERSION:
+            raise ValueError(f"Versión de traza no soportada: {version}")
+        meta: Dict[str, Any] = json.loads(f.read(meta_len).decode('utf-8'))
+        data: bytes = f.read()
+
+    events: List[Tuple[int, int, bool]] = []
+    offset: int = 0
+    usable: int = len(data) - len(data) % RECORD.size
+    for delta, code, pressed in RECORD.iter_unpack(data[:usable]):
+        offset += delta * 1000
+        events.append((offset, code, bool(pressed)))
+    return meta, events
+
+# Salida de reloj sin dispositivo: mezcla bloques al ritmo real y descarta el audio
+# Permite medir el recorrido completo en máquinas sin tarjeta de sonido
+class ClockOutput:
+    def __init__(self, sample_rate: int = 48000, channels: int = 2, buffer_ms: int = 10) -> None:
+        self.sample_rate: int = sample_rate
+        self.channels: int = channels
+        self.buffer_ms: int = buffer_ms
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, mixer: Any, before_render: Optional[Any] = None) -> None:
+        self.stop()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(mixer, before_render),
+                                        name="clock-output", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self, mixer: Any, before_render: Optional[Any]) -> None:
+        frames: int = self.sample_rate * self.buffer_ms // 1000
+        period: int = self.buffer_ms * 1_000_000
+        deadline: int = time.perf_counter_ns()
+        while True:
+            if before_render is not None:
+                before_render()
+            mixer.render(frames)
+            deadline += period
+            if self._stop.wait(max(0, deadline - time.perf_counter_ns()) / 1e9):
+                return
+
+def replay(path: Path, speed: float = 1.0, output: str = "null") -> Dict[str, Any]:
+    # Reproduce la traza por el recorrido real listener -> cola -> motor -> mezclador
+    # y retorna el informe de eventos perdidos, robos de voz y latencias
+    from app.core.direct_engine import DirectEngine
+    from app.core.keyboard_listener import KeyboardMonitor
+
+    engine: DirectEngine = DirectEngine(ClockOutput() if output == "null" else None)
+    engine.idle_suspend_s = 0
+    latency_tracker.enabled = True
+    latency_tracker.reset()
+    engine.start()
+
+    kb_monitor: KeyboardMonitor = KeyboardMonitor("synthetic", str(path), speed)
+    events: List[Tuple[int, int, bool]] = kb_monitor.backend.events
+    started: int = now_ns()
+    kb_monitor.start()
+    kb_monitor.backend.finished.wait()
+    time.sleep(TAIL_S)
+    elapsed: float = (now_ns() - started) / 1e9
+    kb_monitor.stop()
+    engine.stop()
+
+    presses: int = sum(1 for _, _, pressed in events if pressed)
+    report: Dict[str, Any] = {
+        "trace": str(path),
+        "events": len(events),
+        "presses": presses,
+        "speed": speed,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(len(events) / elapsed, 1) if elapsed > 0 else 0.0,
+        "voice_steals": engine.mixer.allocator.steals,
+        "voice_retriggers": engine.mixer.allocator.retriggers,
+        "drops": rate_governor.snapshot(),
+        "latency_ms": latency_tracker.snapshot(),
+    }
+    return report
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"Eventos: {report['events']} ({report['presses']} pulsaciones) en "
+          f"{report['seconds']:.2f}s, {report['events_per_second']:.0f} eventos/s")
+    drops: Dict[str, int] = report["drops"]
+    print(f"Descartados: {drops['dropped']} por ráfaga, {drops['coalesced']} agrupados, "
+          f"{drops['queue_full']} por cola llena")
+    print(f"Voces robadas: {report['voice_steals']} (reactivaciones: {report['voice_retriggers']})")
+    for stage, s in report["latency_ms"].items():
+        print(f"Latencia {stage:<8} n={int(s['count']):<7} p50={s['p50']:.3f}ms "
+              f"p95={s['p95']:.3f}ms p99={s['p99']:.3f}ms max={s['max']:.3f}ms")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Reproduce trazas de pulsaciones de Typhera")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("replay", help="reproduce una traza y mide el motor")
+    run.add_argument("trace")
+    run.add_argument("--speed", type=float, default=1.0,
+                     help="factor de velocidad (0: sin esperas entre eventos)")
+    run.add_argument("--output", choices=("null", "direct"), default="null",
+                     help="null: sin dispositivo de audio; direct: salida real")
+    run.add_argument("--json", default=None, help="guarda el informe en este archivo")
+    info = commands.add_parser("info", help="muestra los metadatos de una traza")
+    info.add_argument("trace")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        meta, events = read_trace(Path(args.trace))
+        duration: float = events[-1][0] / 1e9 if events else 0.0
+        print(f"Fuente: {meta.get('backend')}, {len(events)} eventos en {duration:.2f}s")
+        return
+
+    report: Dict[str, Any] = replay(Path(args.trace), args.speed, args.output)
+    _print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+
+if __name__ == "__main__":
+    main()
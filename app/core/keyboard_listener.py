@@ -1,53 +1,180 @@
-from typing import Set, Optional, Any
-from pynput import keyboard
-from app.core.sound_engine import sound_bridge
+from pathlib import Path
+from typing import Callable, Dict, List, Set, Optional, Any
+from app.core.event_queue import key_events
+from app.core.input_backends import InputBackend, create_backend
+from app.core.key_trace import TraceRecorder
+from app.core.key_map import key_map
 from app.core.state import AppState
+from app.core.latency import latency_tracker, now_ns
+from app.core.rate_governor import rate_governor
+from app.core.metrics import metrics
 
-# Monitoriza los eventos globales del teclado utilizando pynput
+# Monitoriza los eventos globales del teclado
+# La lectura de eventos la hace una fuente intercambiable (ver input_backends.py)
+# que entrega códigos de tecla; aquí se filtran y se encolan para el motor
 class KeyboardMonitor:
-    def __init__(self) -> None:
-        self.listener: Optional[keyboard.Listener] = None
+    def __init__(self, backend: str = "auto", source: Optional[str] = None,
+                 speed: float = 1.0) -> None:
         self.pressed_keys: Set[Any] = set()
+        # Teclas que ya estaban pulsadas al reanudar: su repetición y su
+        # liberación no deben sonar (ver _resync_held_keys)
+        self._stale_keys: Set[Any] = set()
+        self.running: bool = False
+        # Se invoca al pulsar un modificador: anticipa que viene un atajo o una
+        # palabra y permite reactivar el audio en reposo antes del primer sonido
+        self._warm_up: Optional[Callable[[], Any]] = None
+        # Grabación opcional de la sesión para reproducirla después (ver key_trace.py)
+        self.recorder: Optional[TraceRecorder] = None
+        # Cola hacia el motor: la local o la compartida con el proceso de audio
+        self.queue: Any = key_events
+
+        self.backend: InputBackend = create_backend(backend, self.on_press, self.on_release,
+                                                    source, speed)
+
+        # Publica los códigos de cada grupo para la tabla tecla -> muestra
+        codes: Dict[str, List[int]] = self.backend.key_codes()
+        self._modifier_codes: Set[int] = set(codes.get("modifier", []))
+        key_map.set_codes(codes)
+
+        # En pausa la fuente se desengancha por completo (sin coste por tecla)
+        AppState.add_listener(self._on_state_changed)
+
+    def set_warm_up(self, callback: Optional[Callable[[], Any]]) -> None:
+        # Registra la función que prepara la salida de audio
+        self._warm_up = callback
+
+    def set_queue(self, queue: Any) -> None:
+        # Cambia la cola en la que se publican los eventos
+        self.queue = queue
+
+    def start_recording(self, path: Path) -> None:
+        # Graba todos los eventos que entrega la fuente, antes de filtrarlos
+        self.recorder = TraceRecorder(path, self.backend.name, self.backend.key_codes())
 
     def start(self) -> None:
-        # Inicia el listener de teclado en un hilo separado si no está activo
-        if self.listener is None:
-            self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
-            self.listener.start()
-            print("Monitor de teclado iniciado.")
+        # Inicia la fuente de entrada en su propio hilo si no está activa
+        # Si la aplicación arranca en pausa, se engancha al reanudar
+        if not self.running:
+            self.running = True
+            if AppState.is_active():
+                try:
+                    self.backend.start()
+                except OSError as e:
+                    # Arranca en pausa; al reanudar se vuelve a intentar
+                    print(f"No se pudo enganchar el monitor de teclado ({self.backend.name}): {e}")
+                    AppState.set_active(False)
+                    return
+            print(f"Monitor de teclado iniciado ({self.backend.name}).")
 
     def stop(self) -> None:
-        # Detiene el listener y limpia el estado
-        if self.listener:
-            self.listener.stop()
-            self.listener = None
+        # Detiene la fuente de entrada y limpia el estado
+        if self.running:
+            self.backend.stop()
+            self.running = False
+            self.pressed_keys.clear()
+            self._stale_keys.clear()
+        # La fuente ya no entrega eventos: se puede cerrar la traza sin carreras
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def _on_state_changed(self, active: bool) -> None:
+        # Desengancha la fuente al pausar y la vuelve a enganchar al reanudar
+        if not self.running:
+            return
+        if active:
+            # El estado se sincroniza antes de enganchar para que ningún evento
+            # llegue con `pressed_keys` desactualizado
+            self._resync_held_keys()
+            try:
+                self.backend.start()
+            except OSError as e:
+                # Sin gancho no puede haber sonido: la aplicación vuelve a la pausa
+                print(f"No se pudo reenganchar el monitor de teclado ({self.backend.name}): {e}")
+                self.pressed_keys.clear()
+                self._stale_keys.clear()
+                AppState.set_active(False)
+                return
+            print("Monitor de teclado reenganchado.")
+        else:
+            self.backend.stop()
             self.pressed_keys.clear()
+            self._stale_keys.clear()
+            print("Monitor de teclado desenganchado (pausa).")
 
-    def on_release(self, key: Any) -> None:
+    def _resync_held_keys(self) -> None:
+        # Las teclas mantenidas durante la pausa cuentan como pulsadas pero
+        # silenciosas: la repetición automática se filtra como cualquier tecla
+        # mantenida y su liberación no suena. Las fuentes que no pueden consultar
+        # el estado del teclado (pynput) no reportan ninguna.
+        held: Set[Any] = set(self.backend.held_keys())
+        self.pressed_keys = set(held)
+        self._stale_keys = held
+
+    def on_release(self, code: Any) -> None:
         # Gestiona el evento de liberación de tecla
-        try:
-            if key in self.pressed_keys:
-                self.pressed_keys.remove(key)
-        except Exception:
-            pass
+        t_hook: int = now_ns()
+        if self.recorder is not None:
+            self.recorder.record(code, False, t_hook)
+        metrics.events_received += 1
+
+        # Solo suena la liberación de teclas cuya pulsación se registró
+        if code not in self.pressed_keys:
+            return
+
+        self.pressed_keys.discard(code)
+
+        # Tecla que ya estaba pulsada al reanudar: su pulsación no sonó
+        if code in self._stale_keys:
+            self._stale_keys.discard(code)
+            return
+
+        if not AppState.is_active():
+            return
+
+        # Resuelve la muestra de liberación; -1 indica que el pack no tiene
+        table, default = key_map.release
+        sound: int = table.get(code, default)
+        if sound < 0:
+            return
+
+        # Durante una ráfaga las liberaciones no suenan
+        if not rate_governor.admit_release():
+            return
+
+        # Usa la misma cola que las pulsaciones
+        t_push: int = now_ns()
+        latency_tracker.record("hook", t_hook, t_push)
+        self.queue.push(sound, code, t_hook, t_push)
 
-    def on_press(self, key: Any) -> None:
+    def on_press(self, code: Any) -> None:
         # Gestiona el evento de presión de tecla
-        
+        t_hook: int = now_ns()
+        if self.recorder is not None:
+            self.recorder.record(code, True, t_hook)
+        metrics.events_received += 1
+
         # Evita repeticiones si la tecla se mantiene presionada
-        if key in self.pressed_keys:
+        if code in self.pressed_keys:
             return
-            
-        self.pressed_keys.add(key)
+
+        self.pressed_keys.add(code)
 
         # Ignora el evento si la aplicación está pausada globalmente
         if not AppState.is_active():
             return
 
-        try:
-            # Emite la señal al hilo principal para reproducir el efecto de sonido
-            sound_bridge.play_sound.emit("click")
-        except Exception:
-            # Previene que un error de audio detenga el listener
-            pass
+        if code in self._modifier_codes and self._warm_up is not None:
+            self._warm_up()
+
+        # Descarta el exceso de eventos durante una ráfaga
+        if not rate_governor.admit(t_hook):
+            return
+
+        # Resuelve la muestra con una sola búsqueda en la tabla precalculada
+        sound: int = key_map.table.get(code, 0)
 
+        # Encola el evento para el hilo de audio sin pasar por el hilo de la UI
+        t_push: int = now_ns()
+        latency_tracker.record("hook", t_hook, t_push)
+        self.queue.push(sound, code, t_hook, t_push)
@@ -0,0 +1,125 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from app.utils.paths import get_config_path
+
+# Reloj monotónico de alta resolución usado para sellar cada salto del evento
+now_ns = time.perf_counter_ns
+
+# Resolución de los histogramas: 16 sub-cubetas por potencia de dos (error < 7%)
+_SUB_BUCKETS: int = 16
+_SUB_BITS: int = 4
+_MAGNITUDES: int = 32
+
+# Histograma de latencias con cubetas log-lineales de tamaño fijo
+# Registrar una muestra es O(1) y no reserva memoria
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (_SUB_BUCKETS * (_MAGNITUDES + 1))
+        self.total: int = 0
+        self.max_us: int = 0
+
+    @staticmethod
+    def _index(value_us: int) -> int:
+        # Calcula la cubeta de un valor en microsegundos
+        if value_us < _SUB_BUCKETS:
+            return value_us
+        shift: int = value_us.bit_length() - _SUB_BITS - 1
+        return _SUB_BUCKETS + shift * _SUB_BUCKETS + ((value_us >> shift) - _SUB_BUCKETS)
+
+    @staticmethod
+    def _lower_bound(index: int) -> int:
+        # Retorna el valor mínimo (µs) representado por una cubeta
+        if index < _SUB_BUCKETS:
+            return index
+        shift, offset = divmod(index - _SUB_BUCKETS, _SUB_BUCKETS)
+        return (offset + _SUB_BUCKETS) << shift
+
+    def record(self, value_us: int) -> None:
+        # Registra una muestra; descarta valores negativos por relojes cruzados
+        if value_us < 0:
+            return
+        index: int = self._index(value_us)
+        if index >= len(self.counts):
+            index = len(self.counts) - 1
+        self.counts[index] += 1
+        self.total += 1
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, pct: float) -> float:
+        # Retorna el percentil solicitado en milisegundos
+        if self.total == 0:
+            return 0.0
+        target: float = self.total * pct / 100.0
+        seen: int = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return self._lower_bound(index) / 1000.0
+        return self.max_us / 1000.0
+
+    def reset(self) -> None:
+        # Limpia todas las muestras
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.max_us = 0
+
+# Agrupa los histogramas por etapa del recorrido tecla -> sonido:
+#   hook:     entrada al callback del listener -> evento publicado
+#   dispatch: evento publicado -> recibido por el motor de audio
+#   backend:  recibido por el motor -> entregado al backend de audio
+#   total:    entrada al callback del listener -> entregado al backend
+class LatencyTracker:
+    STAGES: tuple = ("hook", "dispatch", "backend", "total")
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.histograms: Dict[str, LatencyHistogram] = {
+            stage: LatencyHistogram() for stage in self.STAGES
+        }
+
+    def record(self, stage: str, start_ns: int, end_ns: int) -> None:
+        # Registra la duración de una etapa a partir de dos sellos de tiempo
+        if self.enabled and start_ns:
+            self.histograms[stage].record((end_ns - start_ns) // 1000)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        # Retorna p50/p95/p99/máximo (ms) y el número de muestras por etapa
+        result: Dict[str, Dict[str, float]] = {}
+        for stage, hist in self.histograms.items():
+            result[stage] = {
+                "count": hist.total,
+                "p50": hist.percentile(50),
+                "p95": hist.percentile(95),
+                "p99": hist.percentile(99),
+                "max": hist.max_us / 1000.0,
+            }
+        return result
+
+    def dump(self, path: Optional[str] = None) -> str:
+        # Escribe el resumen en JSON y lo muestra por consola
+        if path is None:
+            path = os.path.join(get_config_path(), "latency.json")
+
+        stats: Dict[str, Dict[str, float]] = self.snapshot()
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, indent=4)
+        except Exception as e:
+            print(f"Error guardando latencias: {e}")
+
+        for stage, s in stats.items():
+            print(f"Latencia {stage:<8} n={int(s['count']):<7} p50={s['p50']:.3f}ms "
+                  f"p95={s['p95']:.3f}ms p99={s['p99']:.3f}ms max={s['max']:.3f}ms")
+        return path
+
+    def reset(self) -> None:
+        # Reinicia todos los histogramas
+        for hist in self.histograms.values():
+            hist.reset()
+
+# Instancia global compartida por el listener y el motor de audio
+latency_tracker: LatencyTracker = LatencyTracker()
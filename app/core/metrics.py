@@ -0,0 +1,146 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.paths import get_config_path
+
+# Métricas de ejecución del listener y del motor de audio
+# Los contadores son enteros que incrementa un solo hilo cada uno (bajo el GIL
+# `+= 1` sobre un atributo no necesita bloqueos y su coste es el de una suma).
+# Los indicadores (voces en uso, profundidad de la cola...) no se mantienen en el
+# camino caliente: cada componente registra una función que se evalúa solo al
+# leer la instantánea. Se leen desde el tooltip de la bandeja, un archivo JSON
+# que se reescribe periódicamente (`metrics_interval_s`) y un endpoint HTTP que
+# solo escucha en 127.0.0.1 (`metrics_port`).
+class Metrics:
+    def __init__(self) -> None:
+        self.started: float = time.time()
+        # Listener: eventos recibidos de la fuente; en pausa la fuente está
+        # desenganchada, así que no hay eventos descartados que contar
+        self.events_received: int = 0
+        # Motor: efectos creados al crecer la reserva de voces y packs cargados
+        self.effects_created: int = 0
+        self.pack_loads: int = 0
+        self.pack_load_ms: float = 0.0
+        # Escrituras de settings.json
+        self.config_writes: int = 0
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def register_gauge(self, name: str, read: Callable[[], Any]) -> None:
+        # Registra un indicador que se evalúa al tomar la instantánea
+        self._gauges[name] = read
+
+    def snapshot(self) -> Dict[str, Any]:
+        # Retorna todos los valores actuales; los indicadores que fallen se omiten
+        from app.core.event_queue import key_events
+        from app.core.rate_governor import rate_governor
+        data: Dict[str, Any] = {
+            "uptime_s": round(time.time() - self.started, 1),
+            "events_received": self.events_received,
+            "effects_created": self.effects_created,
+            "pack_loads": self.pack_loads,
+            "pack_load_ms": round(self.pack_load_ms, 2),
+            "config_writes": self.config_writes,
+            "queue_depth": len(key_events),
+        }
+        data.update({f"events_{name}": value for name, value in rate_governor.snapshot().items()})
+        for name, read in list(self._gauges.items()):
+            try:
+                data[name] = read()
+            except Exception:
+                pass
+        return data
+
+    def summary(self) -> str:
+        # Resumen corto para el tooltip (Windows lo limita a 127 caracteres)
+        data: Dict[str, Any] = self.snapshot()
+        return (f"Eventos {data['events_received']} · Voces {data.get('voices_in_use', 0)}"
+                f" · Robos {data.get('voice_steals', 0)} · Cola {data['queue_depth']}")
+
+    def dump(self, path: Optional[str] = None) -> str:
+        # Escribe la instantánea en JSON de forma atómica
+        if path is None:
+            path = os.path.join(get_config_path(), "metrics.json")
+        # Un fallo (carpeta borrada, disco lleno, archivo bloqueado en Windows)
+        # se registra y no interrumpe el volcado periódico
+        tmp_path: Optional[str] = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".metrics-", suffix=".tmp",
+                                            dir=os.path.dirname(path))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, indent=4)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error guardando métricas: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+        return path
+
+# Instancia global compartida por el listener y el motor de audio
+metrics: Metrics = Metrics()
+
+# http.server solo se importa si el endpoint está activado, para no pesar en el arranque
+_server: Optional[Any] = None
+_flusher: Optional[threading.Thread] = None
+_stop_flush: threading.Event = threading.Event()
+
+def start_publishing(interval_s: float = 0, port: int = 0) -> None:
+    # Inicia el volcado periódico a metrics.json y el endpoint local (0 = desactivado)
+    global _server, _flusher
+    if interval_s > 0 and _flusher is None:
+        _stop_flush.clear()
+
+        def flush_loop() -> None:
+            while not _stop_flush.wait(interval_s):
+                metrics.dump()
+
+        _flusher = threading.Thread(target=flush_loop, name="metrics-flush", daemon=True)
+        _flusher.start()
+
+    if port > 0 and _server is None:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        # Responde GET /metrics con la instantánea en JSON
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body: bytes = json.dumps(metrics.snapshot()).encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Sin registro por petición en la consola
+                pass
+
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        except OSError as e:
+            print(f"No se pudo abrir el puerto de métricas {port}: {e}")
+            return
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"Métricas disponibles en http://127.0.0.1:{port}/metrics")
+
+def stop_publishing() -> None:
+    # Detiene el volcado y el endpoint; deja un último metrics.json si estaba activo
+    global _server, _flusher
+    if _flusher is not None:
+        _stop_flush.set()
+        _flusher.join(timeout=1.0)
+        _flusher = None
+        metrics.dump()
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
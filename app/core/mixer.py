@@ -0,0 +1,205 @@
+import threading
+import wave
+from pathlib import Path
+from typing import Any, List, Optional
+
+from app.core.latency import latency_tracker, now_ns
+from app.core.voices import DEFAULT_POLICY, VoiceAllocator
+
+# NumPy es una dependencia opcional: sin ella el motor usa QSoundEffect
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Formato de salida del mezclador (PCM entero de 16 bits)
+SAMPLE_WIDTH: int = 2
+INT16_SCALE: float = 32767.0
+
+def is_available() -> bool:
+    # Indica si el mezclador por software puede utilizarse
+    return np is not None
+
+def decode_wav(path: Path, sample_rate: int, channels: int) -> Any:
+    # Decodifica un archivo WAV PCM a un arreglo float32 (frames, canales)
+    # ya convertido a la frecuencia y número de canales de la salida
+    with wave.open(str(path), 'rb') as wav:
+        src_rate: int = wav.getframerate()
+        src_channels: int = wav.getnchannels()
+        width: int = wav.getsampwidth()
+        raw: bytes = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        # WAV de 8 bits es sin signo
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif width == 3:
+        # Expande las muestras de 24 bits a 32 bits con signo
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        ints = (packed[:, 0].astype(np.int32)
+                | (packed[:, 1].astype(np.int32) << 8)
+                | (packed[:, 2].astype(np.int32) << 16))
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Ancho de muestra no soportado: {width}")
+
+    return convert(data.reshape(-1, src_channels), src_rate, sample_rate, channels)
+
+def convert(data: Any, src_rate: int, sample_rate: int, channels: int) -> Any:
+    # Convierte un arreglo (frames, canales) a la frecuencia y canales de la salida
+    src_channels: int = data.shape[1]
+
+    # Ajusta el número de canales al de la salida
+    if src_channels != channels:
+        mono = data.mean(axis=1, keepdims=True)
+        data = np.repeat(mono, channels, axis=1)
+
+    # Remuestrea linealmente si la frecuencia no coincide
+    if src_rate != sample_rate and len(data) > 1:
+        dst_frames: int = max(1, int(round(len(data) * sample_rate / src_rate)))
+        src_x = np.arange(len(data), dtype=np.float64)
+        dst_x = np.linspace(0, len(data) - 1, dst_frames)
+        data = np.stack([np.interp(dst_x, src_x, data[:, c]) for c in range(channels)], axis=1)
+
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+def load_pcm(path: Path, sample_rate: int, channels: int) -> Any:
+    # Carga una muestra como búfer inmutable para compartir entre voces
+    # Un WAV de 16 bits en el formato de la salida (el caso habitual tras la
+    # importación) se usa como int16 sin convertir, a la mitad de memoria
+    with wave.open(str(path), 'rb') as wav:
+        if (wav.getsampwidth() == SAMPLE_WIDTH and wav.getframerate() == sample_rate
+                and wav.getnchannels() == channels):
+            raw: bytes = wav.readframes(wav.getnframes())
+            return np.frombuffer(raw, dtype='<i2').reshape(-1, channels)
+
+    data = decode_wav(path, sample_rate, channels)
+    data.setflags(write=False)
+    return data
+
+# Mezclador por software: mantiene las muestras decodificadas en memoria
+# y suma todas las voces activas en un único flujo de salida
+# Cada muestra se guarda una sola vez en un búfer de solo lectura; una voz es
+# únicamente un índice de muestra y un cursor de reproducción, por lo que la
+# memoria depende del tamaño del pack y no del número de voces
+class Mixer:
+    def __init__(self, sample_rate: int, channels: int, max_voices: int = 32,
+                 steal_policy: str = DEFAULT_POLICY) -> None:
+        self.sample_rate: int = sample_rate
+        self.channels: int = channels
+        self.max_voices: int = max(1, max_voices)
+        self.volume: float = 1.0
+        self.samples: List[Any] = []
+        # Factor de escala de cada muestra: ganancia de normalización y, para
+        # búferes int16 (p. ej. mapeados desde un .typhera), conversión a [-1, 1]
+        self._scales: List[Any] = []
+        # Nivel de pico y duración (ns) de cada muestra para la política de robo
+        self._levels: List[float] = []
+        self._durations: List[int] = []
+
+        # Estado de las voces en arreglos de tamaño fijo (-1 = voz libre)
+        self._voice_sample = np.full(self.max_voices, -1, dtype=np.int32)
+        self._voice_pos = np.zeros(self.max_voices, dtype=np.int64)
+        # Sellos de tiempo del evento que disparó cada voz (0 = ya medido)
+        self._voice_origin: List[int] = [0] * self.max_voices
+        self._voice_queued: List[int] = [0] * self.max_voices
+        self.allocator: VoiceAllocator = VoiceAllocator(self.max_voices, steal_policy)
+        # Búfer intermedio para escalar muestras sin reservar memoria por bloque
+        self._scratch = np.empty((0, channels), dtype=np.float32)
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def frame_bytes(self) -> int:
+        # Tamaño en bytes de un frame de salida
+        return self.channels * SAMPLE_WIDTH
+
+    def set_samples(self, samples: List[Any], gains: Optional[List[float]] = None) -> None:
+        # Reemplaza el banco de muestras y silencia las voces en curso
+        # Las muestras pueden ser float32 en [-1, 1] o int16 a escala completa
+        scales: List[Any] = []
+        levels: List[float] = []
+        for index, sample in enumerate(samples):
+            # Las voces leen el búfer compartido sin copiarlo; nadie puede modificarlo
+            sample.setflags(write=False)
+            gain: float = gains[index] if gains and index < len(gains) else 1.0
+            if sample.dtype == np.int16:
+                gain /= 32768.0
+            scales.append(np.float32(gain))
+            # Recorrer la muestra también carga sus páginas antes de reproducirla
+            # Se compara en float: int() truncaría las muestras float32 a 0 y
+            # np.abs desbordaría con -32768 en int16
+            peak: float = max(float(sample.max()), -float(sample.min())) if len(sample) else 0.0
+            levels.append(peak * gain)
+
+        with self._lock:
+            self.samples = samples
+            self._scales = scales
+            self._levels = levels
+            self._durations = [len(s) * 1_000_000_000 // self.sample_rate for s in samples]
+            self._voice_sample.fill(-1)
+            self._voice_pos.fill(0)
+            self.allocator.reset()
+
+    def trigger(self, sample_index: int = 0, key: Any = None,
+                t_origin: int = 0, t_queued: int = 0) -> None:
+        # Asigna una voz a la muestra indicada; si todas están ocupadas
+        # el asignador decide cuál reutilizar según la política configurada
+        # El límite se comprueba bajo el candado: set_samples puede cambiar
+        # el pack entre la comprobación y la asignación
+        with self._lock:
+            if not 0 <= sample_index < len(self.samples):
+                return
+            voice: int = self.allocator.allocate(key, self._levels[sample_index], now_ns(),
+                                                 self._durations[sample_index])
+            self._voice_sample[voice] = sample_index
+            self._voice_pos[voice] = 0
+            self._voice_origin[voice] = t_origin
+            self._voice_queued[voice] = t_queued
+
+    def silence(self) -> None:
+        # Detiene todas las voces y las devuelve al asignador
+        with self._lock:
+            self._voice_sample.fill(-1)
+            self._voice_pos.fill(0)
+            self.allocator.reset()
+
+    def active_voices(self) -> int:
+        # Retorna el número de voces sonando
+        return self.allocator.active_count
+
+    def render(self, frames: int) -> bytes:
+        # Mezcla las voces activas y retorna `frames` frames PCM de 16 bits
+        out = np.zeros((frames, self.channels), dtype=np.float32)
+        if len(self._scratch) < frames:
+            self._scratch = np.empty((frames, self.channels), dtype=np.float32)
+
+        with self._lock:
+            t_render: int = now_ns()
+            for voice in np.flatnonzero(self._voice_sample >= 0):
+                index: int = int(self._voice_sample[voice])
+                sample = self.samples[index]
+                pos: int = int(self._voice_pos[voice])
+                if pos == 0 and self._voice_queued[voice]:
+                    # Primera mezcla de la voz: cierra la medición de latencia
+                    latency_tracker.record("backend", self._voice_queued[voice], t_render)
+                    latency_tracker.record("total", self._voice_origin[voice], t_render)
+                    self._voice_queued[voice] = 0
+                count: int = min(frames, len(sample) - pos)
+                if count > 0:
+                    scaled = np.multiply(sample[pos:pos + count], self._scales[index],
+                                         out=self._scratch[:count])
+                    out[:count] += scaled
+                pos += count
+                if pos >= len(sample):
+                    self._voice_sample[voice] = -1
+                    self.allocator.release(int(voice))
+                    pos = 0
+                self._voice_pos[voice] = pos
+
+        out *= self.volume
+        np.clip(out, -1.0, 1.0, out=out)
+        return (out * INT16_SCALE).astype('<i2').tobytes()
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Any, Iterator, List, Optional
+
+from app.core.sound_pack import SoundPack
+
+# Pack listo para reproducir: muestras decodificadas (mezclador) o
+# voces de QSoundEffect ya creadas, junto con su coste estimado en memoria
+class CachedPack:
+    def __init__(self, pack: SoundPack, samples: Optional[List[Any]] = None,
+                 effects: Optional[List[Any]] = None, nbytes: int = 0,
+                 durations: Optional[List[int]] = None,
+                 gains: Optional[List[float]] = None) -> None:
+        self.pack: SoundPack = pack
+        self.samples: List[Any] = samples or []
+        self.effects: List[Any] = effects or []
+        # Duración (ns) de cada muestra, usada por la política de robo de voces
+        self.durations: List[int] = durations or []
+        # Ganancia de normalización de sonoridad de cada muestra
+        self.gains: List[float] = gains or []
+        self.nbytes: int = nbytes
+
+# Caché LRU de packs cargados limitada por un presupuesto de memoria
+# Al superar el presupuesto se descartan los packs usados hace más tiempo;
+# el pack recién insertado y el pack fijado (el activo) nunca se descartan
+class PackCache:
+    def __init__(self, budget_bytes: int) -> None:
+        self.budget_bytes: int = max(0, budget_bytes)
+        self.total_bytes: int = 0
+        self._entries: 'OrderedDict[str, CachedPack]' = OrderedDict()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def get(self, name: str) -> Optional[CachedPack]:
+        # Retorna el pack y lo marca como el más reciente
+        entry: Optional[CachedPack] = self._entries.get(name)
+        if entry is not None:
+            self._entries.move_to_end(name)
+        return entry
+
+    def put(self, name: str, entry: CachedPack, pinned: Optional[str] = None) -> None:
+        # Inserta o reemplaza un pack y aplica el presupuesto de memoria
+        self.invalidate(name)
+        self._entries[name] = entry
+        self.total_bytes += entry.nbytes
+
+        for candidate in list(self._entries):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if candidate in (name, pinned):
+                continue
+            self.total_bytes -= self._entries.pop(candidate).nbytes
+
+    def invalidate(self, name: str) -> None:
+        # Descarta un pack (p. ej. si sus archivos cambiaron en disco)
+        entry: Optional[CachedPack] = self._entries.pop(name, None)
+        if entry is not None:
+            self.total_bytes -= entry.nbytes
+
+    def clear(self) -> None:
+        # Vacía la caché por completo
+        self._entries.clear()
+        self.total_bytes = 0
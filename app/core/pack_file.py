@@ -0,0 +1,222 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core import mixer
+from app.core.sound_pack import SoundPack
+
+# Contenedor de un solo archivo para packs de sonido (.typhera)
+#
+#   cabecera   magic(8) versión(u16) flags(u16) tamaño_manifiesto(u32) inicio_datos(u64)
+#   manifiesto JSON (UTF-8): formato, grupos y la ubicación de cada bloque
+#              (posición relativa al inicio de datos y tamaño en bytes)
+#   bloques    PCM int16 intercalado, uno por muestra
+#
+# En la variante comprimida cada bloque es un frame zstd independiente. En la
+# variante sin comprimir los bloques empiezan en límites de página, de modo que
+# el archivo se mapea en memoria y cada muestra es una vista sin copia ni análisis.
+#
+#   python -m app.core.pack_file build <carpeta> <salida.typhera> [--raw]
+#   python -m app.core.pack_file info <pack.typhera>
+
+# zstandard es opcional: sin él solo se leen y escriben contenedores sin comprimir
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC: bytes = b"TYPHERA\0"
+VERSION: int = 1
+FLAG_COMPRESSED: int = 0x1
+HEADER: struct.Struct = struct.Struct("<8sHHIQ")
+# Alineación de los bloques sin comprimir (página de 4 KiB en todas las plataformas)
+PAGE_SIZE: int = 4096
+DEFAULT_RATE: int = 48000
+DEFAULT_CHANNELS: int = 2
+ZSTD_LEVEL: int = 19
+
+def _align(offset: int) -> int:
+    # Redondea al siguiente límite de página
+    return (offset + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+def read_manifest(path: Path) -> Dict[str, Any]:
+    # Lee solo la cabecera y el manifiesto del contenedor
+    with open(path, 'rb') as f:
+        return _read_header(f)[0]
+
+def _read_header(f: Any) -> Tuple[Dict[str, Any], int, int]:
+    # Retorna (manifiesto, flags, inicio de datos) y valida la cabecera
+    # Cualquier archivo truncado o dañado se rechaza con ValueError
+    header: bytes = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Pack truncado: cabecera incompleta")
+    magic, version, flags, manifest_len, data_offset = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("No es un pack de Typhera")
+    if version > VERSION:
+        raise ValueError(f"Versión de pack no soportada: {version}")
+    if data_offset < HEADER.size + manifest_len:
+        raise ValueError("Pack dañado: los datos se solapan con el manifiesto")
+    encoded: bytes = f.read(manifest_len)
+    if len(encoded) < manifest_len:
+        raise ValueError("Pack truncado: manifiesto incompleto")
+    try:
+        manifest: Dict[str, Any] = json.loads(encoded.decode('utf-8'))
+        entries: List[Dict[str, Any]] = manifest["samples"]
+        for entry in entries:
+            if min(int(entry["offset"]), int(entry["size"]), int(entry["frames"])) < 0:
+                raise ValueError
+        int(manifest["channels"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Pack dañado: manifiesto no válido") from None
+    return manifest, flags, data_offset
+
+def to_sound_pack(name: str, path: Path, manifest: Dict[str, Any]) -> SoundPack:
+    # Describe el contenedor como SoundPack; las muestras se identifican por
+    # nombre y se cargan todas juntas desde el contenedor
+    names: List[Path] = [Path(entry["name"]) for entry in manifest["samples"]]
+    press: int = manifest["press_count"]
+    pack: SoundPack = SoundPack(name, names[:press], manifest.get("groups", {}),
+                                names[press:], manifest.get("release_groups", {}),
+                                manifest.get("release_default", -1))
+    pack.container = path
+    return pack
+
+def load_samples(path: Path) -> Tuple[Dict[str, Any], List[Any]]:
+    # Carga todas las muestras con una sola apertura del archivo
+    # Retorna el manifiesto y un arreglo int16 (frames, canales) por muestra
+    np = mixer.np
+    with open(path, 'rb') as f:
+        manifest, flags, data_offset = _read_header(f)
+        channels: int = manifest["channels"]
+        entries: List[Dict[str, Any]] = manifest["samples"]
+        # Todos los bloques deben caber en el archivo (un pack truncado fallaría
+        # más tarde, al reproducir, en lugar de al cargarlo)
+        file_size: int = os.fstat(f.fileno()).st_size
+        for e in entries:
+            if data_offset + e["offset"] + e["size"] > file_size:
+                raise ValueError(f"Pack truncado: falta la muestra {e.get('name', '?')}")
+
+        if not flags & FLAG_COMPRESSED:
+            # Vistas sobre el mapa; el mapa sigue vivo mientras existan las vistas
+            for e in entries:
+                if e["size"] != e["frames"] * channels * mixer.SAMPLE_WIDTH:
+                    raise ValueError(f"Pack dañado: tamaño incorrecto de {e.get('name', '?')}")
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            samples: List[Any] = [
+                np.frombuffer(view, dtype='<i2', count=e["frames"] * channels,
+                              offset=data_offset + e["offset"]).reshape(-1, channels)
+                for e in entries
+            ]
+            return manifest, samples
+
+        if zstandard is None:
+            raise ValueError("Se necesita zstandard para leer packs comprimidos")
+        decompressor = zstandard.ZstdDecompressor()
+        samples = []
+        for e in entries:
+            f.seek(data_offset + e["offset"])
+            try:
+                raw: bytes = decompressor.decompress(f.read(e["size"]))
+            except zstandard.ZstdError as error:
+                raise ValueError(f"Pack dañado: {e.get('name', '?')}: {error}") from None
+            if len(raw) != e["frames"] * channels * mixer.SAMPLE_WIDTH:
+                raise ValueError(f"Pack dañado: tamaño incorrecto de {e.get('name', '?')}")
+            # Igual que las vistas del mapa, los arreglos sobre bytes son de solo lectura
+            samples.append(np.frombuffer(raw, dtype='<i2').reshape(-1, channels))
+        return manifest, samples
+
+def write_pack(path: Path, pack: SoundPack, sample_rate: int = DEFAULT_RATE,
+               channels: int = DEFAULT_CHANNELS, compress: bool = True) -> None:
+    # Empaqueta un pack (carpeta o archivo) en un contenedor .typhera
+    # Cada muestra pasa por el mismo análisis que la importación: se recorta el
+    # silencio inicial y se guarda su ganancia de normalización en el manifiesto
+    from app.core.sound_import import decode_audio, find_onset, loudness_gain
+    np = mixer.np
+    if compress and zstandard is None:
+        raise ValueError("Se necesita zstandard para comprimir el pack")
+
+    blocks: List[bytes] = []
+    entries: List[Dict[str, Any]] = []
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL) if compress else None
+    for sample_path in pack.bank():
+        data = decode_audio(sample_path, sample_rate, channels)
+        onset: int = find_onset(data, sample_rate)
+        data = data[onset:]
+        pcm: bytes = (np.clip(data, -1.0, 1.0) * mixer.INT16_SCALE).astype('<i2').tobytes()
+        blocks.append(compressor.compress(pcm) if compressor else pcm)
+        entries.append({"name": sample_path.name, "frames": len(data),
+                        "gain": loudness_gain(data, sample_rate)})
+
+    manifest: Dict[str, Any] = {
+        "name": pack.name,
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "format": "s16le",
+        "press_count": len(pack.samples),
+        "groups": pack.groups,
+        "release_groups": pack.release_groups,
+        "release_default": pack.release_default,
+        "samples": entries,
+    }
+
+    # Las posiciones son relativas al inicio de datos para no depender del
+    # tamaño del propio manifiesto
+    offset: int = 0
+    for entry, block in zip(entries, blocks):
+        entry["offset"], entry["size"] = offset, len(block)
+        offset += len(block)
+        if not compress:
+            offset = _align(offset)
+    encoded: bytes = json.dumps(manifest, ensure_ascii=False).encode('utf-8')
+    data_offset: int = HEADER.size + len(encoded)
+    if not compress:
+        data_offset = _align(data_offset)
+
+    flags: int = FLAG_COMPRESSED if compress else 0
+    fd, tmp_path = tempfile.mkstemp(prefix=".pack-", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, len(encoded), data_offset))
+            f.write(encoded)
+            for entry, block in zip(entries, blocks):
+                f.write(b"\0" * (data_offset + entry["offset"] - f.tell()))
+                f.write(block)
+        # mkstemp crea el archivo privado; el pack está pensado para compartirse
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Empaqueta packs de sonido de Typhera")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="crea un .typhera a partir de una carpeta")
+    build.add_argument("folder")
+    build.add_argument("output")
+    build.add_argument("--raw", action="store_true", help="sin comprimir, alineado para mmap")
+    build.add_argument("--rate", type=int, default=DEFAULT_RATE)
+    build.add_argument("--channels", type=int, default=DEFAULT_CHANNELS)
+    info = commands.add_parser("info", help="muestra el manifiesto de un .typhera")
+    info.add_argument("pack")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        print(json.dumps(read_manifest(Path(args.pack)), indent=2, ensure_ascii=False))
+        return
+
+    folder: Path = Path(args.folder)
+    pack: Optional[SoundPack] = SoundPack.from_folder(folder.name, folder)
+    if pack is None:
+        raise SystemExit(f"La carpeta no contiene un pack: {folder}")
+    write_pack(Path(args.output), pack, args.rate, args.channels, compress=not args.raw)
+    print(f"Pack creado: {args.output} ({len(pack.bank())} muestras)")
+
+if __name__ == "__main__":
+    main()
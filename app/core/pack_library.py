@@ -0,0 +1,228 @@
+import json
+import os
+import wave
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal, Slot
+
+from app.utils.paths import get_config_path, get_custom_sounds_path
+from app.core.sound_pack import (DEFAULT_SAMPLE, PACK_EXTENSION, SUPPORTED_EXTENSIONS,
+                                 find_sample, is_pack_folder)
+
+# Versión 2: duración y formato también para FLAC/OGG y contenedores
+INDEX_VERSION: int = 2
+
+# Espera (ms) para agrupar ráfagas de cambios en la carpeta de sonidos
+RESCAN_DELAY_MS: int = 300
+
+# Ancho en bytes de los subtipos de libsndfile que lo tienen fijo
+_SUBTYPE_WIDTHS: Dict[str, int] = {"PCM_S8": 1, "PCM_U8": 1, "PCM_16": 2, "PCM_24": 3,
+                                   "PCM_32": 4, "FLOAT": 4, "DOUBLE": 8}
+
+def _probe_sample(path: str) -> Dict[str, Any]:
+    # Lee solo la cabecera de la muestra principal para obtener duración y formato
+    # Los contenedores lo traen en el manifiesto; FLAC/OGG necesitan soundfile
+    lowered: str = path.lower()
+    try:
+        if lowered.endswith(PACK_EXTENSION):
+            from app.core.pack_file import read_manifest
+            manifest: Dict[str, Any] = read_manifest(Path(path))
+            rate: int = int(manifest.get("sample_rate", 0))
+            frames: int = int(manifest["samples"][0]["frames"]) if manifest["samples"] else 0
+            return {
+                "duration": frames / rate if rate else 0.0,
+                "format": {"rate": rate, "channels": int(manifest["channels"]), "width": 2},
+            }
+        if lowered.endswith(".wav"):
+            with wave.open(path, 'rb') as wav:
+                rate = wav.getframerate()
+                return {
+                    "duration": wav.getnframes() / rate if rate else 0.0,
+                    "format": {"rate": rate, "channels": wav.getnchannels(),
+                               "width": wav.getsampwidth()},
+                }
+        try:
+            import soundfile
+        except (ImportError, OSError):
+            return {"duration": 0.0, "format": None}
+        info: Any = soundfile.info(path)
+        return {
+            "duration": info.frames / info.samplerate if info.samplerate else 0.0,
+            "format": {"rate": info.samplerate, "channels": info.channels,
+                       "width": _SUBTYPE_WIDTHS.get(info.subtype)},
+        }
+    except (wave.Error, EOFError, OSError, ValueError, RuntimeError):
+        # Cabecera ilegible (ValueError del contenedor, RuntimeError de libsndfile)
+        return {"duration": 0.0, "format": None}
+
+# Mantiene un índice persistente de los packs de la carpeta de sonidos
+# y lo actualiza de forma incremental cuando cambian los archivos
+class PackLibrary(QObject):
+    # Emite la lista completa de nombres cuando se agregan o eliminan packs
+    packs_changed: Signal = Signal(list)
+    # Emite el nombre de un pack cuyos archivos cambiaron en disco
+    pack_modified: Signal = Signal(str)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.sounds_dir: str = get_custom_sounds_path()
+        self.index_path: str = os.path.join(get_config_path(), "pack_index.json")
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dir_mtime: int = 0
+
+        # Vigila la carpeta raíz y las carpetas de cada pack
+        self.watcher: QFileSystemWatcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._schedule_rescan)
+        self._rescan_timer: QTimer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self.rescan)
+
+        self._load_index()
+
+        # Solo recorre la carpeta si se agregaron o eliminaron packs desde la
+        # última ejecución; en caso contrario el índice guardado es válido
+        if self._stat_mtime(self.sounds_dir) != self._dir_mtime:
+            self.rescan()
+        else:
+            self._update_watches()
+
+    @staticmethod
+    def _stat_mtime(path: str) -> int:
+        # Retorna la fecha de modificación en ns o 0 si no existe
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def pack_names(self) -> List[str]:
+        # Retorna los nombres de los packs en orden estable para el selector
+        names: List[str] = sorted({entry["name"] for entry in self.entries.values()}, key=str.lower)
+        return ["Default"] + names
+
+    def _load_index(self) -> None:
+        # Carga el índice guardado; lo ignora si es de otra versión o está dañado
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data: Dict[str, Any] = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("root") == self.sounds_dir:
+                self.entries = dict(data.get("entries", {}))
+                self._dir_mtime = int(data.get("dir_mtime", 0))
+        except (OSError, ValueError):
+            pass
+
+    def _save_index(self) -> None:
+        # Persiste el índice de forma atómica
+        data: Dict[str, Any] = {
+            "version": INDEX_VERSION,
+            "root": self.sounds_dir,
+            "dir_mtime": self._dir_mtime,
+            "entries": self.entries,
+        }
+        tmp_path: str = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Error guardando índice de packs: {e}")
+
+    def _signature(self, entry: os.DirEntry) -> Optional[Dict[str, Any]]:
+        # Calcula mtime y tamaño de un pack sin leer su contenido
+        if entry.is_file() and entry.name.lower().endswith(PACK_EXTENSION):
+            # El nombre del contenedor se conserva tal cual, como el de las carpetas
+            st = entry.stat()
+            return {"kind": "container", "name": os.path.splitext(entry.name)[0],
+                    "mtime": st.st_mtime_ns, "size": st.st_size,
+                    "sample": entry.path}
+
+        if entry.is_file() and entry.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            st = entry.stat()
+            return {"kind": "file", "name": os.path.splitext(entry.name)[0].capitalize(),
+                    "mtime": st.st_mtime_ns, "size": st.st_size,
+                    "sample": entry.path}
+
+        if entry.is_dir() and is_pack_folder(Path(entry.path)):
+            # El pack cambia si cambia cualquiera de sus muestras
+            mtime: int = entry.stat().st_mtime_ns
+            size: int = 0
+            for item in os.scandir(entry.path):
+                if item.is_file():
+                    st = item.stat()
+                    mtime = max(mtime, st.st_mtime_ns)
+                    size += st.st_size
+            sample: Optional[Path] = find_sample(Path(entry.path), Path(DEFAULT_SAMPLE).stem)
+            return {"kind": "folder", "name": entry.name, "mtime": mtime, "size": size,
+                    "sample": str(sample or Path(entry.path) / DEFAULT_SAMPLE)}
+        return None
+
+    @Slot()
+    def rescan(self) -> None:
+        # Compara la carpeta con el índice y solo vuelve a leer lo que cambió
+        previous_names: List[str] = self.pack_names()
+        current: Dict[str, Dict[str, Any]] = {}
+        modified: List[str] = []
+
+        try:
+            listing = list(os.scandir(self.sounds_dir))
+        except OSError:
+            listing = []
+
+        for entry in listing:
+            sig: Optional[Dict[str, Any]] = self._signature(entry)
+            if sig is None:
+                continue
+            old: Optional[Dict[str, Any]] = self.entries.get(entry.name)
+            if old and old.get("mtime") == sig["mtime"] and old.get("size") == sig["size"]:
+                current[entry.name] = old
+                continue
+
+            # Pack nuevo o modificado: lee solo la cabecera de su muestra principal
+            sig.update(_probe_sample(sig.pop("sample")))
+            current[entry.name] = sig
+            if old:
+                modified.append(sig["name"])
+
+        removed: List[str] = [old["name"] for key, old in self.entries.items() if key not in current]
+        changed: bool = current != self.entries
+        self.entries = current
+        self._dir_mtime = self._stat_mtime(self.sounds_dir)
+        if changed:
+            self._save_index()
+
+        self._update_watches()
+        for name in modified + removed:
+            self.pack_modified.emit(name)
+        names: List[str] = self.pack_names()
+        if names != previous_names:
+            self.packs_changed.emit(names)
+
+    @Slot(str)
+    def _schedule_rescan(self, _path: str) -> None:
+        # Agrupa las notificaciones del sistema de archivos
+        self._rescan_timer.start()
+
+    def _update_watches(self) -> None:
+        # Sincroniza las rutas vigiladas con las carpetas de packs actuales
+        wanted: List[str] = [self.sounds_dir] + [
+            os.path.join(self.sounds_dir, key)
+            for key, entry in self.entries.items() if entry.get("kind") == "folder"
+        ]
+        watched: List[str] = self.watcher.directories()
+        stale: List[str] = [p for p in watched if p not in wanted]
+        missing: List[str] = [p for p in wanted if p not in watched and os.path.isdir(p)]
+        if stale:
+            self.watcher.removePaths(stale)
+        if missing:
+            self.watcher.addPaths(missing)
+
+# Variable global para el Singleton
+_library_instance: Optional[PackLibrary] = None
+
+def get_pack_library() -> PackLibrary:
+    # Obtiene (o crea en el hilo actual) la biblioteca de packs
+    global _library_instance
+    if _library_instance is None:
+        _library_instance = PackLibrary()
+    return _library_instance
@@ -0,0 +1,90 @@
+from typing import Any, List, Optional, Tuple
+
+from app.core.key_map import key_map
+from app.core.pack_cache import CachedPack
+from app.core.sound_pack import SoundPack, get_default_sound, resolve_pack
+from app.core.sound_import import ImportedSample, import_container, import_sample
+
+# Carga de packs para el mezclador por software, sin dependencias de Qt
+# La comparten el motor de Qt (SoundEngine) y el motor directo sin Qt (DirectEngine);
+# ninguna función toca objetos de Qt, por lo que pueden ejecutarse en cualquier hilo
+
+def native_bank(pack: SoundPack, sample_rate: int, channels: int,
+                normalize: bool = True) -> List[ImportedSample]:
+    # Importa las muestras del pack al formato de la salida, sin silencio
+    # inicial y con su ganancia de normalización (solo la primera vez;
+    # después se leen de la caché); si falla usa el archivo original
+    bank: List[ImportedSample] = []
+    if pack.container is not None:
+        bank = import_container(pack.container, sample_rate, channels)
+    else:
+        for path in pack.bank():
+            try:
+                bank.append(import_sample(path, sample_rate, channels))
+            except Exception as e:
+                if path.suffix.lower() == ".wav":
+                    print(f"Error importando {path}: {e}")
+                    bank.append(ImportedSample(path))
+                    continue
+                # Sin NumPy o soundfile un FLAC/OGG no se puede convertir y ni el
+                # mezclador ni QSoundEffect lo leen: se omite y su posición usa
+                # la muestra principal del pack, para no desplazar los índices
+                print(f"Se omite {path.name}: {e}")
+                bank.append(_fallback_sample(bank))
+
+    if not normalize:
+        for sample in bank:
+            sample.gain = 1.0
+    return bank
+
+def _fallback_sample(bank: List[ImportedSample]) -> ImportedSample:
+    # Primera muestra WAV ya importada del banco o, si no hay, el sonido incluido
+    for item in bank:
+        if item.path.suffix.lower() == ".wav":
+            return item
+    return ImportedSample(get_default_sound())
+
+def load_mixer_pack(pack_name: str, sample_rate: int, channels: int,
+                    normalize: bool = True) -> Optional[CachedPack]:
+    # Carga el pack una sola vez a PCM para el mezclador
+    from app.core.mixer import load_pcm
+    pack: SoundPack = resolve_pack(pack_name)
+    if pack.container is not None:
+        return _load_container(pack, sample_rate, channels, normalize)
+    try:
+        bank: List[ImportedSample] = native_bank(pack, sample_rate, channels, normalize)
+        samples: List[Any] = [load_pcm(item.path, sample_rate, channels) for item in bank]
+    except Exception as e:
+        print(f"Error decodificando {pack_name}: {e}")
+        return None
+    return CachedPack(pack, samples=samples, nbytes=sum(s.nbytes for s in samples),
+                      gains=[item.gain for item in bank])
+
+def _load_container(pack: SoundPack, sample_rate: int, channels: int,
+                    normalize: bool) -> Optional[CachedPack]:
+    # Carga un .typhera con una sola apertura; si su formato coincide con la
+    # salida, las muestras int16 se usan directamente (vistas del mapa o
+    # bloques descomprimidos) y el mezclador aplica la escala al mezclar
+    from app.core.pack_file import load_samples
+    from app.core.mixer import convert
+    try:
+        manifest, samples = load_samples(pack.container)
+    except Exception as e:
+        print(f"Error cargando {pack.container}: {e}")
+        return None
+
+    source_format: Tuple[int, int] = (manifest["sample_rate"], manifest["channels"])
+    if source_format != (sample_rate, channels):
+        samples = [convert(sample / 32768.0, manifest["sample_rate"], sample_rate, channels)
+                   for sample in samples]
+    gains: List[float] = [entry.get("gain", 1.0) if normalize else 1.0
+                          for entry in manifest["samples"]]
+    return CachedPack(pack, samples=samples, nbytes=sum(s.nbytes for s in samples), gains=gains)
+
+def publish_key_map(pack: SoundPack, release_sounds: bool = True) -> None:
+    # Publica para el listener qué muestra suena al pulsar y al soltar cada tecla
+    key_map.set_groups(pack.groups)
+    if release_sounds:
+        key_map.set_release(*pack.release_indices())
+    else:
+        key_map.set_release({})
@@ -0,0 +1,96 @@
+from typing import Dict
+
+from app.core.event_queue import key_events
+
+# Límite por defecto de pulsaciones por segundo
+# Solo cuentan las pulsaciones: con las liberaciones una persona escribiendo a
+# 15 pulsaciones/s ya generaría 30 eventos/s y, con solapes entre teclas, se
+# acercaría al límite. Nadie sostiene 60 pulsaciones/s; las ráfagas por encima
+# vienen de macros, lectores de códigos de barras o pegado como tecleo
+DEFAULT_THRESHOLD: float = 60.0
+# Ventana sobre la que se mide la frecuencia de eventos
+WINDOW_NS: int = 100_000_000
+# Histéresis: se sale del modo aclarado por debajo de esta fracción del límite
+EXIT_RATIO: float = 0.5
+
+# Limita la frecuencia de eventos que llegan al motor de audio
+# El listener mide la frecuencia de pulsaciones por ventanas de 100 ms. Por
+# encima del límite pasa a modo aclarado: solo deja pasar una pulsación cada
+# 1/límite segundos, descarta el resto y todas las liberaciones (ver
+# admit_release) antes de encolarlas, de modo que las señales
+# entre hilos y las reproducciones quedan acotadas sin importar la velocidad
+# de entrada. En ese modo el motor además agrupa los eventos que piden la misma
+# muestra dentro de un mismo lote, que sonarían a la vez.
+# `admit` solo se llama desde el hilo del listener y `coalesced` solo lo escribe
+# el hilo de audio, así que no hacen falta bloqueos.
+class RateGovernor:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD) -> None:
+        self.threshold: float = threshold
+        self.thinning: bool = False
+        self.rate: float = 0.0
+
+        # Eventos descartados por el listener y agrupados por el motor
+        self.dropped: int = 0
+        self.coalesced: int = 0
+
+        self._window_start: int = 0
+        self._window_count: int = 0
+        self._next_admit: int = 0
+        self._burst_dropped: int = 0
+
+    def admit(self, now: int) -> bool:
+        # Indica si la pulsación debe encolarse; coste constante por evento
+        if self.threshold <= 0:
+            return True
+
+        elapsed: int = now - self._window_start
+        if elapsed >= WINDOW_NS:
+            self.rate = self._window_count * 1e9 / elapsed
+            self._window_start = now
+            self._window_count = 0
+            if not self.thinning and self.rate > self.threshold:
+                self.thinning = True
+                self._burst_dropped = 0
+                print(f"Ráfaga de teclas detectada ({self.rate:.0f} pulsaciones/s), "
+                      f"se limita a {self.threshold:.0f} pulsaciones/s")
+            elif self.thinning and self.rate < self.threshold * EXIT_RATIO:
+                self.thinning = False
+                print(f"Ráfaga terminada: {self._burst_dropped} evento(s) descartado(s)")
+        self._window_count += 1
+
+        if not self.thinning:
+            return True
+        if now >= self._next_admit:
+            self._next_admit = now + int(1e9 / self.threshold)
+            return True
+        self.dropped += 1
+        self._burst_dropped += 1
+        return False
+
+    def admit_release(self) -> bool:
+        # Indica si la liberación debe encolarse; no cuenta para la frecuencia
+        # En una ráfaga se descartan todas: duplicarían los sonidos que ya
+        # acota el límite de pulsaciones
+        if not self.thinning:
+            return True
+        self.dropped += 1
+        self._burst_dropped += 1
+        return False
+
+    def snapshot(self) -> Dict[str, int]:
+        # Retorna los contadores de eventos perdidos, incluidos los de cola llena
+        return {
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "queue_full": key_events.dropped,
+        }
+
+    def report(self) -> None:
+        # Muestra por consola los eventos perdidos en la sesión, si los hubo
+        stats: Dict[str, int] = self.snapshot()
+        if any(stats.values()):
+            print(f"Eventos descartados: {stats['dropped']} por ráfaga, "
+                  f"{stats['coalesced']} agrupados, {stats['queue_full']} por cola llena")
+
+# Instancia global compartida por el listener y el motor de audio
+rate_governor: RateGovernor = RateGovernor()
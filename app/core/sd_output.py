@@ -0,0 +1,43 @@
+from typing import Any, Callable, Optional
+
+import sounddevice
+
+from app.core.mixer import Mixer
+
+# Salida de audio sin Qt basada en PortAudio (sounddevice)
+# El callback del flujo consume primero los eventos de teclado pendientes y
+# después mezcla, de modo que no hace falta un hilo consumidor adicional
+class SoundDeviceOutput:
+    def __init__(self, buffer_ms: int = 10) -> None:
+        device: Any = sounddevice.query_devices(kind='output')
+        # Usa la frecuencia nativa del dispositivo para evitar remuestreo en reproducción
+        self.sample_rate: int = int(device["default_samplerate"]) or 48000
+        self.channels: int = min(2, max(1, int(device["max_output_channels"])))
+        self.buffer_ms: int = buffer_ms
+        self.stream: Optional[sounddevice.RawOutputStream] = None
+        self._mixer: Optional[Mixer] = None
+        self._before_render: Optional[Callable[[], Any]] = None
+
+    def start(self, mixer: Mixer, before_render: Optional[Callable[[], Any]] = None) -> None:
+        # Abre el flujo de salida alimentado por el mezclador
+        self.stop()
+        self._mixer = mixer
+        self._before_render = before_render
+        self.stream = sounddevice.RawOutputStream(
+            samplerate=self.sample_rate, channels=self.channels, dtype='int16',
+            blocksize=self.sample_rate * self.buffer_ms // 1000, latency='low',
+            callback=self._callback)
+        self.stream.start()
+
+    def stop(self) -> None:
+        # Cierra el flujo de salida si está abierto
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def _callback(self, outdata: Any, frames: int, time_info: Any, status: Any) -> None:
+        # Se ejecuta en el hilo de audio de PortAudio
+        if self._before_render is not None:
+            self._before_render()
+        outdata[:] = self._mixer.render(frames)
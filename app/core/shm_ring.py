@@ -0,0 +1,146 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+
+from app.core.event_queue import DEFAULT_CAPACITY
+
+# Cola de eventos de teclado en memoria compartida entre dos procesos
+# Tiene la misma interfaz que KeyEventQueue (push/drain/clear/len) para que el
+# listener y DirectEngine la usen sin cambios cuando el motor corre en otro proceso.
+#
+#   línea 0    head (u64), solo lo escribe el consumidor
+#   línea 1    tail (u64), solo lo escribe el productor
+#   línea 2    capacidad (u64) y consumidor en reposo (u64, ver set_waker)
+#   registros  sonido(i32) tecla(i64) t_hook(i64) t_push(i64) secuencia(u32), 32 bytes
+#
+# Cada índice vive en su propia línea de caché para que productor y consumidor
+# no se invaliden mutuamente. El productor escribe el registro completo antes de
+# avanzar `tail`. Entre procesos el GIL no ordena nada: que el consumidor vea
+# el registro antes que el nuevo `tail` depende de que la CPU haga visibles las
+# escrituras en orden, lo que garantiza x86/x86-64 (TSO) pero no ARM. Python no
+# ofrece barreras de memoria, así que cada registro lleva además el número de
+# secuencia de su posición (índice + 1): si el consumidor ve `tail` antes que el
+# registro, la secuencia no coincide y deja ese evento para el siguiente drain.
+# En ARM esto reduce la ventana pero no la elimina del todo (la secuencia puede
+# hacerse visible antes que el resto del registro); el peor caso es un clic con
+# la muestra o la marca de tiempo de un evento anterior, no una corrupción.
+# Los sellos de tiempo son de perf_counter_ns, que usa un reloj monotónico común
+# a todo el sistema, así que las latencias siguen siendo comparables entre procesos.
+
+_LINE: int = 64
+_INDEX: struct.Struct = struct.Struct("<Q")
+RECORD: struct.Struct = struct.Struct("<iqqqI")
+_SEQ_MASK: int = 0xFFFFFFFF
+_HEAD: int = 0
+_TAIL: int = _LINE
+_CAPACITY: int = 2 * _LINE
+_SLEEPING: int = 2 * _LINE + _INDEX.size
+_DATA: int = 3 * _LINE
+
+class SharedEventRing:
+    def __init__(self, name: Optional[str] = None, capacity: int = DEFAULT_CAPACITY) -> None:
+        # Sin nombre crea el segmento (proceso del listener); con nombre se une
+        # a uno existente (proceso de audio)
+        if name is None:
+            size: int = 1
+            while size < capacity:
+                size <<= 1
+            self.shm: shared_memory.SharedMemory = shared_memory.SharedMemory(
+                create=True, size=_DATA + size * RECORD.size)
+            self.owner: bool = True
+            _INDEX.pack_into(self.shm.buf, _HEAD, 0)
+            _INDEX.pack_into(self.shm.buf, _TAIL, 0)
+            _INDEX.pack_into(self.shm.buf, _CAPACITY, size)
+            _INDEX.pack_into(self.shm.buf, _SLEEPING, 0)
+        else:
+            self.shm = _attach(name)
+            self.owner = False
+
+        self.name: str = self.shm.name
+        self._buf: Any = self.shm.buf
+        self.capacity: int = _INDEX.unpack_from(self._buf, _CAPACITY)[0]
+        self._mask: int = self.capacity - 1
+        # Eventos descartados por cola llena (en el proceso productor)
+        self.dropped: int = 0
+        # Aviso al consumidor dormido, en el proceso productor (ver set_remote_waker)
+        self._remote_waker: Optional[Callable[[], None]] = None
+
+    def set_waker(self, waker: Optional[Callable[[], None]]) -> None:
+        # Lado consumidor: el despertador no puede cruzar procesos, así que solo
+        # se publica si el consumidor está en reposo; el productor avisa por el
+        # canal de control con el primer evento (ver set_remote_waker)
+        _INDEX.pack_into(self._buf, _SLEEPING, 1 if waker is not None else 0)
+
+    def set_remote_waker(self, waker: Optional[Callable[[], None]]) -> None:
+        # Lado productor: función que despierta al consumidor en reposo
+        self._remote_waker = waker
+
+    @property
+    def sleeping(self) -> bool:
+        # Indica si el consumidor está en reposo esperando un aviso
+        return bool(_INDEX.unpack_from(self._buf, _SLEEPING)[0])
+
+    def __len__(self) -> int:
+        return _INDEX.unpack_from(self._buf, _TAIL)[0] - _INDEX.unpack_from(self._buf, _HEAD)[0]
+
+    def push(self, sound: int, key: Any, t_hook: int, t_push: int) -> bool:
+        # Encola un evento desde el proceso productor; retorna False si está llena
+        buf: Any = self._buf
+        tail: int = _INDEX.unpack_from(buf, _TAIL)[0]
+        if tail - _INDEX.unpack_from(buf, _HEAD)[0] >= self.capacity:
+            self.dropped += 1
+            return False
+        # Las teclas sin código entero (caracteres sueltos) viajan como -1
+        code: int = key if isinstance(key, int) else -1
+        RECORD.pack_into(buf, _DATA + (tail & self._mask) * RECORD.size, sound, code, t_hook, t_push,
+                         (tail + 1) & _SEQ_MASK)
+        _INDEX.pack_into(buf, _TAIL, tail + 1)
+        # Primer evento con el consumidor en reposo: un solo aviso por reposo
+        if self._remote_waker is not None and _INDEX.unpack_from(buf, _SLEEPING)[0]:
+            _INDEX.pack_into(buf, _SLEEPING, 0)
+            self._remote_waker()
+        return True
+
+    def drain(self, handler: Callable[[int, Any, int, int], None]) -> int:
+        # Consume todos los eventos pendientes desde el proceso consumidor
+        buf: Any = self._buf
+        head: int = _INDEX.unpack_from(buf, _HEAD)[0]
+        tail: int = _INDEX.unpack_from(buf, _TAIL)[0]
+        count: int = 0
+        while head != tail:
+            sound, code, t_hook, t_push, seq = RECORD.unpack_from(
+                buf, _DATA + (head & self._mask) * RECORD.size)
+            if seq != (head + 1) & _SEQ_MASK:
+                # Registro aún no visible: se reintenta en el siguiente drain
+                break
+            handler(sound, code, t_hook, t_push)
+            head += 1
+            count += 1
+            _INDEX.pack_into(buf, _HEAD, head)
+        return count
+
+    def clear(self) -> None:
+        # Descarta los eventos pendientes (solo desde el consumidor)
+        _INDEX.pack_into(self._buf, _HEAD, _INDEX.unpack_from(self._buf, _TAIL)[0])
+
+    def close(self) -> None:
+        # Libera el mapeo; el proceso que creó el segmento también lo elimina
+        self._buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Se une a un segmento existente sin registrarlo en el resource_tracker de
+    # este proceso, que lo eliminaría al salir (el dueño es el otro proceso)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 no tiene `track`
+        shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
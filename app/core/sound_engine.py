@@ -1,136 +1,508 @@
 import os
+import time
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Set, Tuple, Union, TYPE_CHECKING
 
-from PySide6.QtMultimedia import QSoundEffect, QAudioOutput, QMediaPlayer
-from PySide6.QtCore import QUrl, QObject, Signal, Slot
+from PySide6.QtMultimedia import QSoundEffect, QAudioOutput, QMediaPlayer, QMediaDevices
+from PySide6.QtCore import QUrl, QObject, QThread, QMetaObject, QTimer, Qt, Signal, Slot
 
-from app.utils.paths import get_resource_path, get_user_sounds_path, get_custom_sounds_path
+from app.utils.paths import get_custom_sounds_path
 from app.core.config_manager import ConfigManager
 from app.core.state import AppState
+from app.core.latency import latency_tracker, now_ns
+from app.core.rate_governor import rate_governor
+from app.core.metrics import metrics
+from app.core.audio_thread import AudioThread
+from app.core.event_queue import key_events
+from app.core.sound_pack import SoundPack, resolve_pack
+from app.core.pack_library import get_pack_library
+from app.core.pack_cache import CachedPack, PackCache
+from app.core.voices import DEFAULT_POLICY, VoiceAllocator
 
-# Implementa el motor de audio basado en QtMultimedia
-# Gestiona la carga y reproducción de efectos de sonido con baja latencia
-class SoundSignalBridge(QObject):
-    play_sound = Signal(str)
+# El mezclador (NumPy) y su salida se importan solo si se activan en la configuración
+if TYPE_CHECKING:
+    from app.core.engine_process import ProcessEngine
+    from app.core.mixer import Mixer
+    from app.core.sound_import import ImportedSample
 
-# Instancia global para el puente de señales entre hilos
-sound_bridge: SoundSignalBridge = SoundSignalBridge()
+def _wav_duration_ns(path: Path) -> int:
+    # Lee la duración de la muestra desde la cabecera del WAV
+    try:
+        with wave.open(str(path), 'rb') as wav:
+            rate: int = wav.getframerate()
+            return wav.getnframes() * 1_000_000_000 // rate if rate else 0
+    except Exception:
+        return 0
 
+# Implementa el motor de audio basado en QtMultimedia
+# Gestiona la carga y reproducción de efectos de sonido con baja latencia
+# El motor vive en un hilo de audio dedicado y consume los eventos de teclado
+# directamente de `key_events`, sin pasar por el hilo de la UI
 class SoundEngine(QObject):
+    # Señales internas para ejecutar operaciones en el hilo de audio
+    _wake: Signal = Signal()
+    _pack_requested: Signal = Signal(str)
+    _volume_changed: Signal = Signal()
+    _prefetch_requested: Signal = Signal(list)
+    _prefetched: Signal = Signal(str, object)
+    _warm_requested: Signal = Signal()
+
     def __init__(self) -> None:
         super().__init__()
         self.config: ConfigManager = ConfigManager()
-        self.effects: List[QSoundEffect] = [] 
-        self.current_pack_path: Optional[Path] = None
+        # Efectos de QSoundEffect por índice de muestra; dentro de cada grupo
+        # el efecto de la posición N es el que usa la voz N (creado al necesitarse)
+        self.effects: List[List[Optional[QSoundEffect]]] = []
+        self._durations: List[int] = []
+        # Ganancia de normalización de cada muestra del pack activo
+        self._gains: List[float] = []
+        self.current_pack: Optional[SoundPack] = None
+        self.current_pack_name: str = ""
+
+        # Caché LRU de packs cargados para cambiar de pack sin tocar el disco
+        budget_mb: int = int(self.config.get("pack_cache_mb", 64))
+        self.pack_cache: PackCache = PackCache(budget_mb * 1024 * 1024)
+        self._prefetch_pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="TypheraPrefetch")
+        self._prefetching: Set[str] = set()
         self.volume: float = self.config.get("volume", 50) / 100.0
-        
-        # Conecta la señal del puente para ejecución en el hilo principal
-        sound_bridge.play_sound.connect(self._play_on_main_thread)
+
+        # Límite de voces simultáneas y política de robo compartidos por ambos motores
+        # El límite cubre a la vez las muestras de pulsación y las de liberación:
+        # las voces se preasignan y ambos bancos compiten por el mismo conjunto
+        self.polyphony: int = max(1, int(self.config.get("polyphony", 32)))
+        self.steal_policy: str = str(self.config.get("voice_steal", DEFAULT_POLICY))
+        self.release_sounds: bool = bool(self.config.get("release_sounds", True))
+        self.normalize_loudness: bool = bool(self.config.get("normalize_loudness", True))
+        self.voices: VoiceAllocator = VoiceAllocator(self.polyphony, self.steal_policy)
+        # Efecto que está sonando en cada voz del motor QSoundEffect
+        self._voice_effect: List[Optional[QSoundEffect]] = [None] * self.voices.capacity
+        latency_tracker.enabled = bool(self.config.get("latency_stats", False))
+        rate_governor.threshold = float(self.config.get("rate_limit", 60))
+        # Muestras ya disparadas en el lote actual de eventos (ver _play_event)
+        self._batch_sounds: Set[int] = set()
+
+        # Motor seleccionado en start(): mezclador por software (NumPy) o QSoundEffect
+        self.mixer: Optional['Mixer'] = None
+        self.output: Optional[Any] = None
+        # Frecuencia y canales a los que se importan las muestras
+        self.native_format: Tuple[int, int] = (48000, 2)
+
+        # Reposo: tras `idle_suspend_s` sin eventos se libera la salida y las voces
+        # (0 lo desactiva); el primer evento o una tecla modificadora la reactivan
+        self.idle_suspend_s: float = float(self.config.get("idle_suspend_s", 120))
+        self.suspended: bool = False
+        self._last_activity: float = time.monotonic()
+        self._idle_timer: Optional[QTimer] = None
+
+        # Las conexiones automáticas se resuelven como encoladas cuando se
+        # emiten desde otro hilo y directas desde el propio hilo de audio
+        self._wake.connect(self._drain_events)
+        self._pack_requested.connect(self._apply_sound_pack)
+        self._volume_changed.connect(self._apply_volume)
+        self._prefetch_requested.connect(self._prefetch)
+        self._prefetched.connect(self._store_prefetched)
+        self._warm_requested.connect(self._resume)
+
+        # Indicadores que se leen solo al consultar las métricas
+        metrics.register_gauge("voices_in_use", self._voices_in_use)
+        metrics.register_gauge("voice_capacity", lambda: self.voices.capacity)
+        metrics.register_gauge("voice_steals", self._voice_steals)
+        metrics.register_gauge("audio_suspended", lambda: self.suspended)
         
         # Asegura la existencia del directorio de sonidos personalizados
         Path(get_custom_sounds_path()).mkdir(parents=True, exist_ok=True)
-        self.load_sound_pack(str(self.config.get("sound_pack", "Default")))
 
-    def load_sound_pack(self, pack_name: str) -> None:
-        # Carga el pack de sonidos especificado en memoria
-        self.effects.clear()
-        
-        sound_file: Optional[Path] = None
-        
-        if pack_name == "Default":
-            # Carga el sonido predeterminado de los recursos
-            sound_file = Path(get_resource_path("sounds")) / "click.wav"
+    @Slot()
+    def start(self) -> None:
+        # Crea los objetos de audio dentro del hilo de audio y carga el pack
+        # "auto" usa el mezclador (un búfer por muestra compartido por todas
+        # las voces) si NumPy está disponible y QSoundEffect en caso contrario
+        engine: str = str(self.config.get("audio_engine", "auto"))
+        if engine == "mixer" or engine == "auto":
+            self._init_mixer(quiet=engine == "auto")
+
+        if self.mixer is not None:
+            self.native_format = (self.mixer.sample_rate, self.mixer.channels)
         else:
-            # Busca archivos en ubicaciones personalizadas
-            custom_path: Path = Path(get_custom_sounds_path())
-            potential_file: Path = custom_path / f"{pack_name}.wav"
-            
-            if potential_file.exists():
-                sound_file = potential_file
-            else:
-                user_path: Path = Path(get_user_sounds_path()) / pack_name / "click.wav"
-                if user_path.exists():
-                    sound_file = user_path
+            preferred = QMediaDevices.defaultAudioOutput().preferredFormat()
+            self.native_format = (preferred.sampleRate() or 48000,
+                                  min(2, max(1, preferred.channelCount())))
 
-        # Fallback al sonido por defecto si no se encuentra el archivo
-        if not sound_file or not sound_file.exists():
-            print(f"No se encontró sonido para: {pack_name}")
-            sound_file = Path(get_resource_path("sounds")) / "click.wav"
+        self._apply_sound_pack(str(self.config.get("sound_pack", "Default")))
 
-        self.current_pack_path = sound_file
+        if self.idle_suspend_s > 0:
+            # El temporizador se crea aquí para que pertenezca al hilo de audio
+            self._idle_timer = QTimer(self)
+            self._idle_timer.setSingleShot(True)
+            self._idle_timer.timeout.connect(self._check_idle)
+            self._idle_timer.start(int(self.idle_suspend_s * 1000))
 
-        # Inicializa el objeto QSoundEffect
-        effect: QSoundEffect = QSoundEffect()
-        effect.setSource(QUrl.fromLocalFile(str(sound_file)))
-        effect.setVolume(self.volume)
-        self.effects.append(effect)
-        print(f"Sonido cargado: {pack_name} -> {sound_file}")
+        key_events.set_waker(self._wake.emit)
+        self._drain_events()
+
+    @Slot()
+    def stop(self) -> None:
+        # Deja de consumir eventos y libera la salida de audio
+        key_events.set_waker(None)
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        if self._idle_timer is not None:
+            self._idle_timer.stop()
+        if self.output is not None:
+            self.output.stop()
+        self._stop_voices()
+        self.effects = []
+        self.pack_cache.clear()
+
+    def _init_mixer(self, quiet: bool = False) -> None:
+        # Prepara el mezclador y abre el flujo de salida; si no es posible,
+        # continúa con el motor basado en QSoundEffect
+        from app.core import mixer as mixer_module
+        if not mixer_module.is_available():
+            if not quiet:
+                print("NumPy no disponible, se usa QSoundEffect")
+            return
+
+        try:
+            from app.core.audio_output import QtAudioOutput
+            output: QtAudioOutput = QtAudioOutput(parent=self)
+            self.mixer = mixer_module.Mixer(output.sample_rate, output.channels,
+                                            self.polyphony, self.steal_policy)
+            self.mixer.volume = self.volume
+            output.start(self.mixer)
+            self.output = output
+        except Exception as e:
+            print(f"Error iniciando el mezclador: {e}")
+            self.mixer = None
+            self.output = None
+
+    def load_sound_pack(self, pack_name: str) -> None:
+        # Solicita la carga del pack en el hilo de audio
+        self._pack_requested.emit(pack_name)
+
+    def prefetch_packs(self, pack_names: List[str]) -> None:
+        # Solicita precargar en segundo plano los packs indicados
+        if self.config.get("pack_prefetch", True):
+            self._prefetch_requested.emit(list(pack_names))
 
     @Slot(str)
-    def _play_on_main_thread(self, sound_name: str) -> None:
-        # Ejecuta la reproducción del sonido en el hilo UI
+    def _apply_sound_pack(self, pack_name: str) -> None:
+        # Activa el pack desde la caché o lo carga desde disco si no está
+        entry: Optional[CachedPack] = self.pack_cache.get(pack_name)
+        if entry is None:
+            started: float = time.perf_counter()
+            entry = self._load_pack(pack_name)
+            metrics.pack_load_ms = (time.perf_counter() - started) * 1000.0
+            metrics.pack_loads += 1
+            self.pack_cache.put(pack_name, entry)
+        self.current_pack_name = pack_name
+        self._activate_pack(entry)
+        print(f"Sonido cargado: {pack_name} -> {len(entry.pack.samples)} muestra(s), "
+              f"{len(entry.pack.release_samples)} de liberación")
+
+    def _activate_pack(self, entry: CachedPack) -> None:
+        # Reutiliza las muestras o voces ya cargadas del pack
+        self.current_pack = entry.pack
+        if self.mixer is not None:
+            self.mixer.set_samples(entry.samples, entry.gains)
+
+        # Las voces del pack anterior se detienen y quedan libres
+        self._stop_voices()
+        self.effects = entry.effects
+        self._durations = entry.durations
+        self._gains = entry.gains
+        self._apply_effect_volumes()
+
+        from app.core.pack_loader import publish_key_map
+        publish_key_map(entry.pack, self.release_sounds)
+
+    def _load_pack(self, pack_name: str) -> CachedPack:
+        # Carga en memoria todas las muestras del pack (pulsación y liberación)
+        if self.mixer is not None:
+            entry: Optional[CachedPack] = self._decode_pack(pack_name)
+            if entry is not None:
+                return entry
+        return self._build_effects(pack_name)
+
+    def _native_bank(self, pack: SoundPack) -> List['ImportedSample']:
+        # Importa las muestras al formato de la salida (ver pack_loader)
+        from app.core.pack_loader import native_bank
+        rate, channels = self.native_format
+        return native_bank(pack, rate, channels, self.normalize_loudness)
+
+    def _decode_pack(self, pack_name: str) -> Optional[CachedPack]:
+        # Carga el pack una sola vez a PCM para el mezclador
+        # No toca objetos de Qt, por lo que puede ejecutarse en otro hilo
+        from app.core.pack_loader import load_mixer_pack
+        return load_mixer_pack(pack_name, self.mixer.sample_rate, self.mixer.channels,
+                               self.normalize_loudness)
+
+    def _build_effects(self, pack_name: str) -> CachedPack:
+        # Inicializa un QSoundEffect por muestra; cada uno es la primera voz de su grupo
+        pack: SoundPack = resolve_pack(pack_name)
+        effects: List[List[Optional[QSoundEffect]]] = []
+        durations: List[int] = []
+        gains: List[float] = []
+        nbytes: int = 0
+        for item in self._native_bank(pack):
+            effects.append([self._create_effect(QUrl.fromLocalFile(str(item.path)), 0,
+                                                self.volume * item.gain)])
+            durations.append(_wav_duration_ns(item.path))
+            gains.append(item.gain)
+            nbytes += os.path.getsize(item.path)
+        return CachedPack(pack, effects=effects, nbytes=nbytes, durations=durations, gains=gains)
+
+    def _create_effect(self, source: QUrl, voice: int, volume: float) -> QSoundEffect:
+        # Crea el efecto que usará la voz indicada y libera la voz al terminar
+        effect: QSoundEffect = QSoundEffect()
+        effect.setSource(source)
+        effect.setVolume(min(1.0, volume))
+        effect.playingChanged.connect(lambda v=voice, e=effect: self._on_voice_finished(v, e))
+        metrics.effects_created += 1
+        return effect
+
+    def _voices_in_use(self) -> int:
+        # Voces sonando en el motor activo
+        if self.mixer is not None:
+            return self.mixer.active_voices()
+        return self.voices.active_count
+
+    def _voice_steals(self) -> int:
+        # Voces robadas desde el arranque en el motor activo
+        if self.mixer is not None:
+            return self.mixer.allocator.steals
+        return self.voices.steals
+
+    def _on_voice_finished(self, voice: int, effect: QSoundEffect) -> None:
+        # Devuelve la voz al asignador si el efecto que terminó sigue siendo el suyo
+        if self._voice_effect[voice] is effect and not effect.isPlaying():
+            self._voice_effect[voice] = None
+            self.voices.release(voice)
+
+    def _stop_voices(self) -> None:
+        # Detiene los efectos en curso y libera todas las voces
+        playing: List[Optional[QSoundEffect]] = self._voice_effect
+        self._voice_effect = [None] * self.voices.capacity
+        self.voices.reset()
+        for effect in playing:
+            if effect is not None:
+                effect.stop()
+
+    @Slot(list)
+    def _prefetch(self, pack_names: List[str]) -> None:
+        # Precarga los packs que no estén ya en caché
+        for name in pack_names:
+            if name in self.pack_cache or name in self._prefetching:
+                continue
+            if self.mixer is not None:
+                # La decodificación se hace fuera del hilo de audio
+                self._prefetching.add(name)
+                future: Future = self._prefetch_pool.submit(self._decode_pack, name)
+                future.add_done_callback(
+                    lambda f, n=name: self._prefetched.emit(n, None if f.exception() else f.result()))
+            else:
+                # QSoundEffect carga su fuente de forma asíncrona
+                self.pack_cache.put(name, self._build_effects(name), pinned=self.current_pack_name)
+
+    @Slot(str, object)
+    def _store_prefetched(self, pack_name: str, entry: Optional[CachedPack]) -> None:
+        # Guarda en caché un pack decodificado en segundo plano
+        self._prefetching.discard(pack_name)
+        if entry is not None and pack_name not in self.pack_cache:
+            self.pack_cache.put(pack_name, entry, pinned=self.current_pack_name)
+
+    @Slot()
+    def _drain_events(self) -> None:
+        # Consume los eventos pendientes de la cola del listener
+        # Si el audio está en reposo, lo reactiva antes de reproducir
+        if self.suspended and len(key_events):
+            self._resume()
+        self._batch_sounds.clear()
+        if key_events.drain(self._play_event):
+            self._last_activity = time.monotonic()
+
+    def warm_up(self) -> None:
+        # Reactiva la salida por adelantado (p. ej. al pulsar un modificador)
+        # Puede llamarse desde cualquier hilo; sin reposo no hace nada
+        if self.suspended:
+            self._warm_requested.emit()
+
+    @Slot()
+    def _check_idle(self) -> None:
+        # Entra en reposo si no hubo eventos durante el periodo configurado
+        # Solo se consulta la marca de tiempo: los eventos no reinician el temporizador
+        idle: float = time.monotonic() - self._last_activity
+        if idle >= self.idle_suspend_s:
+            self._suspend()
+        else:
+            self._idle_timer.start(int((self.idle_suspend_s - idle) * 1000) + 1)
+
+    def _suspend(self) -> None:
+        # Libera el flujo de salida y las voces; las muestras siguen en memoria
+        if self.suspended:
+            return
+        self.suspended = True
+        if self.mixer is not None:
+            if self.output is not None:
+                self.output.stop()
+            self.mixer.silence()
+        self._stop_voices()
+        # Descarta los efectos adicionales de cada voz; el primero se conserva
+        for pool in self.effects:
+            del pool[1:]
+        print("Audio en reposo")
+
+    @Slot()
+    def _resume(self) -> None:
+        # Vuelve a abrir la salida antes de reproducir
+        if not self.suspended:
+            return
+        self.suspended = False
+        self._last_activity = time.monotonic()
+        if self.mixer is not None and self.output is not None:
+            self.output.start(self.mixer)
+        elif self.effects and self.effects[0]:
+            # QSoundEffect abre el dispositivo al reproducir: lo prepara en silencio
+            primer: QSoundEffect = self.effects[0][0]
+            primer.setVolume(0.0)
+            primer.play()
+        if self._idle_timer is not None:
+            self._idle_timer.start(int(self.idle_suspend_s * 1000))
+        print("Audio reactivado")
+
+    def _play_event(self, sound: int, key: Any, t_hook: int, t_push: int) -> None:
+        # Reproduce un evento de teclado en el hilo de audio
+        t_dispatch: int = now_ns()
+        latency_tracker.record("dispatch", t_push, t_dispatch)
+
         if not AppState.is_active():
             return
             
         if self.volume <= 0:
             return
 
-        # Gestiona la polifonía rotando o creando nuevos efectos
-        if self.effects:
-            # Busca un efecto disponible (inactivo)
-            available: Optional[QSoundEffect] = None
-            for ef in self.effects:
-                if not ef.isPlaying():
-                    available = ef
-                    break
-            
-            # Si todos están ocupados, crea uno nuevo hasta el límite
-            if not available:
-                if len(self.effects) < 10: # Límite de polifonía
-                    new_ef: QSoundEffect = QSoundEffect()
-                    new_ef.setSource(self.effects[0].source())
-                    new_ef.setVolume(self.volume)
-                    self.effects.append(new_ef)
-                    available = new_ef
-                else:
-                    available = self.effects[0] # Reusa el primero si se excede el límite
-
-            available.setVolume(self.volume)
-            available.play()
+        # Durante una ráfaga, la misma muestra suena una sola vez por lote
+        if rate_governor.thinning:
+            if sound in self._batch_sounds:
+                rate_governor.coalesced += 1
+                return
+            self._batch_sounds.add(sound)
+
+        # Delega en el mezclador si hay muestras decodificadas
+        if self.mixer is not None and self.mixer.samples:
+            # El mezclador registra las etapas restantes al mezclar la voz
+            self.mixer.trigger(sound, key, t_hook, t_dispatch)
+            return
+
+        # Gestiona la polifonía con el asignador de voces (coste constante)
+        if 0 <= sound < len(self.effects):
+            pool: List[Optional[QSoundEffect]] = self.effects[sound]
+            duration: int = self._durations[sound] if sound < len(self._durations) else 0
+            voice: int = self.voices.allocate(key, 1.0, t_dispatch, duration)
+
+            # Cada voz tiene su propio efecto por muestra, creado la primera vez
+            if voice >= len(pool):
+                pool.extend([None] * (voice + 1 - len(pool)))
+            effect: Optional[QSoundEffect] = pool[voice]
+            if effect is None:
+                effect = self._create_effect(pool[0].source(), voice, self._effect_volume(sound))
+                pool[voice] = effect
+
+            # Si la voz estaba ocupada por otra muestra, corta el efecto anterior
+            previous: Optional[QSoundEffect] = self._voice_effect[voice]
+            self._voice_effect[voice] = effect
+            if previous is not None and previous is not effect:
+                previous.stop()
+
+            effect.setVolume(self._effect_volume(sound))
+            effect.play()
+
+            # play() solo encola la reproducción en el backend de Qt
+            t_backend: int = now_ns()
+            latency_tracker.record("backend", t_dispatch, t_backend)
+            latency_tracker.record("total", t_hook, t_backend)
 
     def set_volume(self, volume_percent: int) -> None:
         # Actualiza el volumen global
         self.volume = max(0, min(100, volume_percent)) / 100.0
         self.config.set("volume", volume_percent)
+        self._volume_changed.emit()
+
+    @Slot()
+    def _apply_volume(self) -> None:
+        # Aplica el volumen actual en el hilo de audio
+        if self.mixer is not None:
+            self.mixer.volume = self.volume
         
         # Aplica el nuevo volumen a todas las instancias activas
-        for ef in self.effects:
-            ef.setVolume(self.volume)
+        self._apply_effect_volumes()
+
+    def _effect_volume(self, sound: int) -> float:
+        # Volumen de QSoundEffect para una muestra (no admite valores mayores a 1)
+        gain: float = self._gains[sound] if sound < len(self._gains) else 1.0
+        return min(1.0, self.volume * gain)
+
+    def _apply_effect_volumes(self) -> None:
+        # Ajusta el volumen de todos los efectos del pack activo
+        for sound, pool in enumerate(self.effects):
+            volume: float = self._effect_volume(sound)
+            for ef in pool:
+                if ef is not None:
+                    ef.setVolume(volume)
+
+    @Slot(str)
+    def invalidate_pack(self, pack_name: str) -> None:
+        # Descarta de la caché un pack modificado en disco y recarga si está activo
+        self.pack_cache.invalidate(pack_name)
+        if pack_name == self.current_pack_name:
+            self._apply_sound_pack(pack_name)
 
     @staticmethod
     def get_available_packs() -> List[str]:
-        # Enumera los packs de sonido disponibles
-        packs: List[str] = ["Default"]
-        
-        custom_path: Path = Path(get_custom_sounds_path())
-        if custom_path.exists():
-            for item in custom_path.glob("*.wav"):
-                # Formatea el nombre para visualización
-                clean_name: str = item.stem.capitalize()
-                packs.append(clean_name)
-                
-        return packs
-
-# Variable global para el Singleton
-_engine_instance: Optional[SoundEngine] = None
+        # Enumera los packs de sonido disponibles según el índice de la biblioteca
+        return get_pack_library().pack_names()
+
+# Variables globales para el Singleton y su hilo de audio
+_engine_instance: Optional[Union[SoundEngine, 'ProcessEngine']] = None
+_audio_thread: Optional[AudioThread] = None
 
 def initialize_sound_engine() -> SoundEngine:
-    # Inicializa y retorna la instancia única del motor de sonido
-    global _engine_instance
+    # Inicializa el motor y lo traslada a su hilo de audio dedicado
+    global _engine_instance, _audio_thread
+    _audio_thread = AudioThread()
     _engine_instance = SoundEngine()
+    _engine_instance.moveToThread(_audio_thread)
+    _audio_thread.started.connect(_engine_instance.start)
+    _audio_thread.start(QThread.TimeCriticalPriority)
     return _engine_instance
 
-def get_engine() -> Optional[SoundEngine]:
+def initialize_process_engine() -> Union[SoundEngine, 'ProcessEngine']:
+    # Inicializa el motor en un proceso aparte (ver engine_process.py)
+    # Necesita el motor directo; sin NumPy o sounddevice usa el hilo de audio
+    global _engine_instance
+    from app.headless import direct_available
+    if not direct_available():
+        print("Motor directo no disponible, el audio corre en este proceso")
+        return initialize_sound_engine()
+    from app.core.engine_process import ProcessEngine
+    _engine_instance = ProcessEngine()
+    _engine_instance.start()
+    return _engine_instance
+
+def shutdown_sound_engine() -> None:
+    # Detiene el motor dentro de su hilo y finaliza el hilo de audio
+    global _audio_thread
+    if _engine_instance is not None and _audio_thread is not None:
+        QMetaObject.invokeMethod(_engine_instance, "stop", Qt.BlockingQueuedConnection)
+        _audio_thread.quit()
+        _audio_thread.wait()
+        _audio_thread = None
+    elif _engine_instance is not None:
+        # Motor en proceso aparte
+        _engine_instance.stop()
+
+def get_engine() -> Optional[Union[SoundEngine, 'ProcessEngine']]:
     # Obtiene la instancia actual del motor
     return _engine_instance
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.utils.paths import get_user_sounds_path
+from app.core import mixer
+
+# Importa una sola vez las muestras de los packs al formato nativo de la salida
+# Cada archivo se decodifica (WAV, FLAC u OGG), se convierte a la frecuencia y
+# canales del dispositivo en PCM de 16 bits y se guarda en una caché indexada
+# por el hash de su contenido; la reproducción nunca paga la conversión.
+# Al importar también se analiza la muestra: se recorta el silencio inicial y
+# se calcula la ganancia que iguala su sonoridad. El resultado se guarda en el
+# índice de la caché para no repetir el análisis en el siguiente arranque.
+
+# libsndfile (soundfile) es opcional: sin él solo se importan archivos WAV
+try:
+    import soundfile
+except (ImportError, OSError):
+    soundfile = None
+
+CACHE_DIR_NAME: str = ".imported"
+INDEX_NAME: str = "index.json"
+INDEX_VERSION: int = 1
+
+# Umbral de inicio: nivel absoluto mínimo y fracción del pico de la muestra
+ONSET_FLOOR: float = 0.001        # -60 dBFS
+ONSET_RELATIVE: float = 0.02      # -34 dB bajo el pico
+# Margen que se conserva antes del inicio para no cortar el ataque
+PRE_ROLL_MS: float = 1.0
+# Ventana tras el inicio sobre la que se mide la sonoridad
+LOUDNESS_WINDOW_MS: float = 50.0
+# Nivel RMS de referencia y límites de la ganancia de normalización
+TARGET_RMS: float = 0.1           # -20 dBFS
+MIN_GAIN: float = 0.25
+MAX_GAIN: float = 4.0
+# Un archivo modificado poco antes de calcular su hash puede volver a cambiar
+# sin que cambie su mtime (sistemas de archivos con resolución gruesa): su
+# hash no se reutiliza hasta que la modificación sea más antigua que esto
+RACY_NS: int = 2_000_000_000
+
+# Muestra lista para cargar: archivo nativo y metadatos del análisis
+class ImportedSample:
+    def __init__(self, path: Path, gain: float = 1.0, trimmed_ms: float = 0.0) -> None:
+        self.path: Path = path
+        self.gain: float = gain
+        self.trimmed_ms: float = trimmed_ms
+
+# Índice persistente de la caché de importación
+#   sources: ruta de origen -> firma del archivo (mtime, ctime, tamaño, inodo) y
+#            hash del contenido; la firma solo evita volver a leer el archivo
+#   samples: <hash>-<frecuencia>-<canales> -> archivo, ganancia y recorte
+_index: Optional[Dict[str, Any]] = None
+_index_dirty: bool = False
+_index_lock: threading.Lock = threading.Lock()
+
+def get_import_cache_path() -> Path:
+    # Directorio con las muestras ya convertidas
+    path: Path = Path(get_user_sounds_path()) / CACHE_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def _load_index() -> Dict[str, Any]:
+    # Lee el índice una sola vez por proceso
+    global _index
+    if _index is None:
+        _index = {"version": INDEX_VERSION, "sources": {}, "samples": {}}
+        try:
+            with open(get_import_cache_path() / INDEX_NAME, 'r', encoding='utf-8') as f:
+                data: Dict[str, Any] = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                _index = data
+        except (OSError, ValueError):
+            pass
+    return _index
+
+def _save_index() -> None:
+    # Persiste el índice de forma atómica si hubo cambios
+    global _index_dirty
+    if not _index_dirty:
+        return
+    path: Path = get_import_cache_path() / INDEX_NAME
+    fd, tmp_path = tempfile.mkstemp(prefix=".index-", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(_index, f, indent=1)
+        os.replace(tmp_path, path)
+        _index_dirty = False
+    except OSError as e:
+        print(f"Error guardando índice de importación: {e}")
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+def _signature(st: os.stat_result) -> List[int]:
+    # Firma del archivo: ctime cambia con cualquier escritura aunque se
+    # restaure el mtime (cp -p, touch -r) y el inodo con los reemplazos atómicos
+    return [st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino]
+
+def _content_digest(path: Path) -> str:
+    # Calcula el hash del contenido; se reutiliza mientras no cambie la firma
+    global _index_dirty
+    st = path.stat()
+    sources: Dict[str, Any] = _load_index()["sources"]
+    known: Optional[Dict[str, Any]] = sources.get(str(path))
+    signature: List[int] = _signature(st)
+    if (known and known.get("signature") == signature
+            and known.get("hashed_ns", 0) - st.st_mtime_ns > RACY_NS):
+        return known["digest"]
+
+    hashed_ns: int = time.time_ns()
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            hasher.update(chunk)
+    digest: str = hasher.hexdigest()
+    sources[str(path)] = {"signature": signature, "hashed_ns": hashed_ns, "digest": digest}
+    _index_dirty = True
+    return digest
+
+def _still_valid(meta: Dict[str, Any], path: Path, digest: str) -> bool:
+    # Comprueba que el archivo de una entrada sigue teniendo el contenido del hash
+    # Las conversiones de la caché llevan el hash en el nombre; un WAV nativo se
+    # usa tal cual y puede ser otro archivo idéntico que se editó después
+    target: Path = Path(meta["file"])
+    if not target.exists():
+        return False
+    if target.parent == get_import_cache_path() or target == path:
+        return True
+    return _content_digest(target) == digest
+
+def _is_native(path: Path, sample_rate: int, channels: int) -> bool:
+    # Comprueba si un WAV ya está en PCM de 16 bits con el formato de la salida
+    if path.suffix.lower() != ".wav":
+        return False
+    try:
+        with wave.open(str(path), 'rb') as wav:
+            return (wav.getframerate() == sample_rate and wav.getnchannels() == channels
+                    and wav.getsampwidth() == mixer.SAMPLE_WIDTH)
+    except Exception:
+        return False
+
+def decode_audio(path: Path, sample_rate: int, channels: int) -> Any:
+    # Decodifica cualquier formato soportado a float32 (frames, canales)
+    if path.suffix.lower() == ".wav":
+        return mixer.decode_wav(path, sample_rate, channels)
+    if soundfile is None:
+        raise ValueError(f"Formato no soportado sin soundfile: {path.suffix}")
+    data, src_rate = soundfile.read(str(path), dtype='float32', always_2d=True)
+    return mixer.convert(data, src_rate, sample_rate, channels)
+
+def find_onset(data: Any, sample_rate: int) -> int:
+    # Retorna el primer frame audible menos un pequeño margen
+    if not len(data):
+        return 0
+    envelope = mixer.np.max(mixer.np.abs(data), axis=1)
+    threshold: float = max(ONSET_FLOOR, float(envelope.max()) * ONSET_RELATIVE)
+    loud = mixer.np.flatnonzero(envelope > threshold)
+    if not len(loud):
+        return 0
+    return max(0, int(loud[0]) - int(sample_rate * PRE_ROLL_MS / 1000.0))
+
+def loudness_gain(data: Any, sample_rate: int) -> float:
+    # Ganancia que lleva el RMS del ataque al nivel de referencia sin saturar
+    window = data[:max(1, int(sample_rate * LOUDNESS_WINDOW_MS / 1000.0))]
+    if not len(window):
+        return 1.0
+    rms: float = float(mixer.np.sqrt(mixer.np.mean(mixer.np.square(window))))
+    peak: float = float(mixer.np.max(mixer.np.abs(data)))
+    if rms <= 0.0 or peak <= 0.0:
+        return 1.0
+    gain: float = min(TARGET_RMS / rms, 1.0 / peak)
+    return max(MIN_GAIN, min(MAX_GAIN, gain))
+
+def _write_wav(path: Path, data: Any, sample_rate: int) -> None:
+    # Escribe el PCM de 16 bits de forma atómica
+    pcm: bytes = (mixer.np.clip(data, -1.0, 1.0) * mixer.INT16_SCALE).astype('<i2').tobytes()
+    fd, tmp_path = tempfile.mkstemp(prefix=".import-", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            with wave.open(f, 'wb') as wav:
+                wav.setnchannels(data.shape[1])
+                wav.setsampwidth(mixer.SAMPLE_WIDTH)
+                wav.setframerate(sample_rate)
+                wav.writeframes(pcm)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def import_container(path: Path, sample_rate: int, channels: int) -> List[ImportedSample]:
+    # Extrae las muestras de un .typhera como WAV nativos para QSoundEffect
+    # Ya vienen recortadas y con su ganancia en el manifiesto
+    from app.core.pack_file import load_samples, read_manifest
+    with _index_lock:
+        digest: str = _content_digest(path)
+        _save_index()
+
+    manifest: Dict[str, Any] = read_manifest(path)
+    folder: Path = get_import_cache_path()
+    targets: List[Path] = [folder / f"{digest}-{index}-{sample_rate}-{channels}.wav"
+                           for index in range(len(manifest["samples"]))]
+    if not all(target.exists() for target in targets):
+        manifest, samples = load_samples(path)
+        for target, sample in zip(targets, samples):
+            if not target.exists():
+                data = mixer.convert(sample / 32768.0, manifest["sample_rate"], sample_rate, channels)
+                _write_wav(target, data, sample_rate)
+    return [ImportedSample(target, entry.get("gain", 1.0))
+            for target, entry in zip(targets, manifest["samples"])]
+
+def import_sample(path: Path, sample_rate: int, channels: int) -> ImportedSample:
+    # Retorna la muestra en el formato nativo, ya recortada y analizada
+    # La primera vez se convierte y se analiza; después solo se consulta el índice
+    global _index_dirty
+    if not mixer.is_available():
+        if path.suffix.lower() == ".wav":
+            return ImportedSample(path)
+        raise ValueError(f"Se necesita NumPy para importar {path.name}")
+
+    with _index_lock:
+        digest: str = _content_digest(path)
+        key: str = f"{digest}-{sample_rate}-{channels}"
+        meta: Optional[Dict[str, Any]] = _load_index()["samples"].get(key)
+        if meta is not None and _still_valid(meta, path, digest):
+            _save_index()
+            return ImportedSample(Path(meta["file"]), meta["gain"], meta["trimmed_ms"])
+
+    data = decode_audio(path, sample_rate, channels)
+    onset: int = find_onset(data, sample_rate)
+    gain: float = loudness_gain(data[onset:], sample_rate)
+
+    # Los WAV nativos sin silencio inicial se usan tal cual
+    target: Path = path
+    if onset > 0 or not _is_native(path, sample_rate, channels):
+        target = get_import_cache_path() / f"{key}.wav"
+        _write_wav(target, data[onset:], sample_rate)
+
+    trimmed_ms: float = onset * 1000.0 / sample_rate
+    print(f"Muestra importada: {path.name} (recorte {trimmed_ms:.1f} ms, ganancia {gain:.2f})")
+    with _index_lock:
+        _load_index()["samples"][key] = {"file": str(target), "gain": gain, "trimmed_ms": trimmed_ms}
+        _index_dirty = True
+        _save_index()
+    return ImportedSample(target, gain, trimmed_ms)
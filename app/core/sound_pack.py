@@ -0,0 +1,167 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.paths import get_resource_path, get_user_sounds_path, get_custom_sounds_path
+
+# Grupos de teclas que un pack puede sonorizar por separado
+# "alphanumeric" actúa también como sonido para cualquier tecla sin grupo propio
+KEY_GROUPS: tuple = ("alphanumeric", "space", "enter", "backspace", "modifier")
+
+# Formatos de audio aceptados en los packs; se convierten al importarlos
+SUPPORTED_EXTENSIONS: Tuple[str, ...] = (".wav", ".flac", ".ogg")
+# Extensión de los packs empaquetados en un solo archivo (ver pack_file.py)
+PACK_EXTENSION: str = ".typhera"
+
+# Archivo que cubre todas las teclas sin muestra específica
+DEFAULT_SAMPLE: str = "click.wav"
+# Archivo que suena al soltar cualquier tecla sin muestra de liberación propia
+RELEASE_SAMPLE: str = "release.wav"
+# Sufijo de las muestras de liberación por grupo (<grupo>_up.wav)
+RELEASE_SUFFIX: str = "_up"
+MANIFEST_NAME: str = "pack.json"
+
+# Describe un pack de sonidos: las muestras a precargar y qué grupo usa cada una
+# La muestra 0 siempre es la que suena para las teclas sin grupo propio
+# Las muestras de liberación forman un banco aparte; `release_default` es el
+# índice dentro de ese banco para las teclas sin grupo propio (-1 = silencio)
+# Si `container` apunta a un .typhera, las muestras son nombres dentro de él
+class SoundPack:
+    def __init__(self, name: str, samples: List[Path], groups: Dict[str, int],
+                 release_samples: Optional[List[Path]] = None,
+                 release_groups: Optional[Dict[str, int]] = None,
+                 release_default: int = -1) -> None:
+        self.name: str = name
+        self.samples: List[Path] = samples
+        self.groups: Dict[str, int] = groups
+        self.release_samples: List[Path] = release_samples or []
+        self.release_groups: Dict[str, int] = release_groups or {}
+        self.release_default: int = release_default
+        self.container: Optional[Path] = None
+
+    def bank(self) -> List[Path]:
+        # Retorna todas las muestras a precargar: primero las de pulsación y
+        # a continuación las de liberación
+        return self.samples + self.release_samples
+
+    def release_indices(self) -> Tuple[Dict[str, int], int]:
+        # Traduce el banco de liberación a índices absolutos dentro de bank()
+        offset: int = len(self.samples)
+        groups: Dict[str, int] = {group: offset + index for group, index in self.release_groups.items()}
+        default: int = offset + self.release_default if self.release_default >= 0 else -1
+        return groups, default
+
+    @classmethod
+    def single(cls, name: str, sound_file: Path) -> 'SoundPack':
+        # Crea un pack con una única muestra para todas las teclas
+        return cls(name, [sound_file], {})
+
+    @classmethod
+    def from_folder(cls, name: str, folder: Path) -> Optional['SoundPack']:
+        # Construye un pack a partir de una carpeta
+        # Las muestras se declaran en pack.json ({"samples": {"space": "space.wav"},
+        # "release": {"space": "space_up.wav"}}) o por convención con archivos
+        # <grupo>.wav y <grupo>_up.wav junto a click.wav y release.wav
+        # (en cualquier formato soportado, p. ej. click.flac)
+        files: Dict[str, str] = {}
+        release_files: Dict[str, str] = {}
+        manifest: Path = folder / MANIFEST_NAME
+        if manifest.exists():
+            try:
+                with open(manifest, 'r', encoding='utf-8') as f:
+                    data: Dict = json.load(f)
+                files = dict(data.get("samples", {}))
+                release_files = dict(data.get("release", {}))
+            except Exception as e:
+                print(f"Error leyendo {manifest}: {e}")
+
+        for group in KEY_GROUPS:
+            found: Optional[Path] = find_sample(folder, group)
+            if group not in files and found is not None:
+                files[group] = found.name
+            found = find_sample(folder, f"{group}{RELEASE_SUFFIX}")
+            if group not in release_files and found is not None:
+                release_files[group] = found.name
+
+        default_file: Optional[Path] = find_sample(folder, Path(DEFAULT_SAMPLE).stem)
+        if default_file is None and "alphanumeric" in files:
+            default_file = folder / files["alphanumeric"]
+        if default_file is None or not default_file.exists():
+            return None
+
+        samples: List[Path] = [default_file]
+        groups: Dict[str, int] = _collect_samples(folder, files, samples)
+
+        # El banco de liberación es opcional; sin release.wav solo suenan
+        # las teclas cuyo grupo tiene muestra de liberación propia
+        release_samples: List[Path] = []
+        release_default: int = -1
+        release_file: Optional[Path] = find_sample(folder, Path(RELEASE_SAMPLE).stem)
+        if release_file is not None:
+            release_samples.append(release_file)
+            release_default = 0
+        release_groups: Dict[str, int] = _collect_samples(folder, release_files, release_samples)
+        return cls(name, samples, groups, release_samples, release_groups, release_default)
+
+def _collect_samples(folder: Path, files: Dict[str, str], samples: List[Path]) -> Dict[str, int]:
+    # Agrega a `samples` los archivos de cada grupo (cada archivo distinto se
+    # precarga una sola vez) y retorna el índice de muestra de cada grupo
+    groups: Dict[str, int] = {}
+    for group in KEY_GROUPS:
+        if group not in files:
+            continue
+        path: Path = folder / files[group]
+        if not path.exists():
+            print(f"No se encontró la muestra {path} del grupo {group}")
+            continue
+        if path not in samples:
+            samples.append(path)
+        groups[group] = samples.index(path)
+    return groups
+
+def find_sample(folder: Path, stem: str) -> Optional[Path]:
+    # Busca <stem> con cualquiera de las extensiones soportadas
+    for extension in SUPPORTED_EXTENSIONS:
+        path: Path = folder / f"{stem}{extension}"
+        if path.exists():
+            return path
+    return None
+
+def is_pack_folder(folder: Path) -> bool:
+    # Indica si una carpeta contiene un pack con muestras por grupo
+    if not folder.is_dir():
+        return False
+    return find_sample(folder, Path(DEFAULT_SAMPLE).stem) is not None or (folder / MANIFEST_NAME).exists()
+
+def get_default_sound() -> Path:
+    # Retorna el sonido incluido con la aplicación
+    return Path(get_resource_path("sounds")) / DEFAULT_SAMPLE
+
+def resolve_pack(pack_name: str) -> SoundPack:
+    # Localiza el pack por nombre; recurre al sonido por defecto si no existe
+    if pack_name != "Default":
+        # Busca archivos en ubicaciones personalizadas
+        custom_path: Path = Path(get_custom_sounds_path())
+
+        # Un contenedor .typhera se describe con una sola lectura de su manifiesto
+        container: Path = custom_path / f"{pack_name}{PACK_EXTENSION}"
+        if container.exists():
+            from app.core import pack_file
+            try:
+                return pack_file.to_sound_pack(pack_name, container, pack_file.read_manifest(container))
+            except Exception as e:
+                print(f"Error leyendo {container}: {e}")
+
+        potential_file: Optional[Path] = find_sample(custom_path, pack_name)
+        if potential_file is not None:
+            return SoundPack.single(pack_name, potential_file)
+
+        folder: Path = Path(get_user_sounds_path()) / pack_name
+        if folder.is_dir():
+            pack: Optional[SoundPack] = SoundPack.from_folder(pack_name, folder)
+            if pack is not None:
+                return pack
+
+        print(f"No se encontró sonido para: {pack_name}")
+
+    return SoundPack.single(pack_name, get_default_sound())
@@ -1,19 +1,36 @@
+from typing import Callable, List
+
 # Gestiona el estado global de la aplicación
 # Permite un acceso centralizado para verificar si la aplicación está activa o en pausa
 class AppState:
     # Mantiene el estado activo compartir entre componentes
     _is_active: bool = True
+    # Funciones notificadas con el nuevo estado cuando cambia
+    _listeners: List[Callable[[bool], None]] = []
     
     @classmethod
     def is_active(cls) -> bool:
         # Retorna el estado actual
         return cls._is_active
     
+    @classmethod
+    def add_listener(cls, callback: Callable[[bool], None]) -> None:
+        # Registra una función que se llama al pausar o reanudar
+        cls._listeners.append(callback)
+
     @classmethod
     def set_active(cls, active: bool) -> None:
         # Actualiza el estado global de la aplicación
+        changed: bool = active != cls._is_active
         cls._is_active = active
         print(f"Estado cambiado a: {'Activo' if active else 'Pausa'}")
+        if changed:
+            for callback in list(cls._listeners):
+                # Un oyente puede revertir el cambio (p. ej. si no pudo
+                # engancharse); los demás ya recibieron el estado nuevo
+                if cls._is_active != active:
+                    break
+                callback(active)
 
     @classmethod
     def toggle(cls) -> None:
@@ -0,0 +1,143 @@
+from typing import Any, Dict, List
+
+# Políticas para elegir qué voz se reutiliza cuando todas están ocupadas:
+#   oldest:    la voz que empezó a sonar hace más tiempo
+#   quietest:  la voz con menor nivel estimado (ganancia x fracción restante)
+#   retrigger: si la misma tecla ya suena, reinicia esa voz; si no, la más antigua
+STEAL_POLICIES: tuple = ("oldest", "quietest", "retrigger")
+DEFAULT_POLICY: str = "oldest"
+
+# Asignador de voces con coste constante
+# Las voces libres forman una pila y las activas una lista doblemente enlazada
+# en orden de inicio (arreglos preasignados, sin reservar memoria por evento).
+# Las voces se crean de forma perezosa hasta `capacity`, por lo que el llamador
+# debe construir la voz cuando reciba un índice >= al número que ya tiene.
+class VoiceAllocator:
+    def __init__(self, capacity: int, policy: str = DEFAULT_POLICY) -> None:
+        self.capacity: int = max(1, capacity)
+        self.policy: str = policy if policy in STEAL_POLICIES else DEFAULT_POLICY
+
+        self._prev: List[int] = [-1] * self.capacity
+        self._next: List[int] = [-1] * self.capacity
+        self._active: List[bool] = [False] * self.capacity
+        self._key: List[Any] = [None] * self.capacity
+        self._level: List[float] = [0.0] * self.capacity
+        self._start: List[int] = [0] * self.capacity
+        self._duration: List[int] = [1] * self.capacity
+        self._by_key: Dict[Any, int] = {}
+
+        # Estadísticas acumuladas
+        self.steals: int = 0
+        self.retriggers: int = 0
+        # Indica si la última asignación reutilizó una voz en curso
+        self.last_stolen: bool = False
+
+        self.reset()
+
+    def reset(self) -> None:
+        # Libera todas las voces (p. ej. al cambiar de pack)
+        self._free: List[int] = []
+        self._created: int = 0
+        self._oldest: int = -1
+        self._newest: int = -1
+        self.active_count: int = 0
+        for voice in range(self.capacity):
+            self._active[voice] = False
+            self._key[voice] = None
+        self._by_key.clear()
+
+    @property
+    def created(self) -> int:
+        # Número de voces que el llamador ya ha construido
+        return self._created
+
+    def _link(self, voice: int) -> None:
+        # Agrega la voz al final (la más reciente) de la lista activa
+        self._prev[voice] = self._newest
+        self._next[voice] = -1
+        if self._newest != -1:
+            self._next[self._newest] = voice
+        else:
+            self._oldest = voice
+        self._newest = voice
+
+    def _unlink(self, voice: int) -> None:
+        # Quita la voz de la lista activa
+        prev: int = self._prev[voice]
+        nxt: int = self._next[voice]
+        if prev != -1:
+            self._next[prev] = nxt
+        else:
+            self._oldest = nxt
+        if nxt != -1:
+            self._prev[nxt] = prev
+        else:
+            self._newest = prev
+
+    def _forget_key(self, voice: int) -> None:
+        # Elimina la asociación tecla -> voz si sigue apuntando a esta voz
+        key: Any = self._key[voice]
+        if key is not None and self._by_key.get(key) == voice:
+            del self._by_key[key]
+
+    def _quietest(self, now: int) -> int:
+        # Busca la voz de menor nivel estimado (acotado por la capacidad)
+        best: int = self._oldest
+        best_level: float = 2.0
+        voice: int = self._oldest
+        while voice != -1:
+            remaining: float = 1.0 - (now - self._start[voice]) / self._duration[voice]
+            level: float = self._level[voice] * (remaining if remaining > 0.0 else 0.0)
+            if level < best_level:
+                best, best_level = voice, level
+            voice = self._next[voice]
+        return best
+
+    def allocate(self, key: Any, level: float, now: int, duration_ns: int) -> int:
+        # Retorna la voz que debe reproducir el evento
+        voice: int = -1
+        self.last_stolen = False
+
+        if self.policy == "retrigger" and key is not None:
+            voice = self._by_key.get(key, -1)
+            if voice != -1:
+                self.retriggers += 1
+                self.last_stolen = True
+
+        if voice == -1:
+            if self._free:
+                voice = self._free.pop()
+            elif self._created < self.capacity:
+                voice = self._created
+                self._created += 1
+            else:
+                voice = self._quietest(now) if self.policy == "quietest" else self._oldest
+                self.steals += 1
+                self.last_stolen = True
+
+        if self._active[voice]:
+            self._unlink(voice)
+            self._forget_key(voice)
+        else:
+            self.active_count += 1
+
+        self._active[voice] = True
+        self._key[voice] = key
+        self._level[voice] = level
+        self._start[voice] = now
+        self._duration[voice] = duration_ns if duration_ns > 0 else 1
+        if key is not None:
+            self._by_key[key] = voice
+        self._link(voice)
+        return voice
+
+    def release(self, voice: int) -> None:
+        # Devuelve a la pila libre una voz que terminó de sonar
+        if not 0 <= voice < self.capacity or not self._active[voice]:
+            return
+        self._unlink(voice)
+        self._forget_key(voice)
+        self._active[voice] = False
+        self._key[voice] = None
+        self._free.append(voice)
+        self.active_count -= 1
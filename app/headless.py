@@ -0,0 +1,206 @@
+import argparse
+import importlib.util
+import signal
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from app.utils import startup_profile
+from app.core.config_manager import ConfigManager
+from app.core.keyboard_listener import KeyboardMonitor
+from app.core.input_backends import BACKENDS as INPUT_BACKENDS
+from app.core.state import AppState
+from app.core.latency import latency_tracker
+from app.core.rate_governor import rate_governor
+from app.core import metrics
+from app.core.instance import (InstanceServer, add_command_arguments, command_from_args,
+                               forward_to_running)
+
+# QtCore y QtNetwork solo sostienen el bucle de eventos y el canal de instancia
+# única; el motor directo no usa Qt para el audio
+from PySide6.QtCore import QCoreApplication, QTimer
+
+# Modo sin interfaz: solo el listener de teclado y el motor de audio
+# No carga QtWidgets, la bandeja, los temas ni el verificador de actualizaciones.
+# Todo corre sobre un QCoreApplication, que atiende el canal de instancia única
+# (ver app/core/instance.py). Con el motor directo (NumPy + sounddevice) el audio
+# no pasa por Qt; si no está disponible, se usa el motor de Qt sin QtWidgets.
+#
+#   python main.py --headless [--backend auto|direct|process|qt] [--input auto|pynput|evdev|synthetic]
+#
+# Con `--input synthetic --input-file eventos.txt` la entrada se lee de un archivo
+# (una línea `<ms> <código evdev> <down|up>` por evento) en lugar del teclado.
+#
+# Control por señales (POSIX):
+#   SIGTERM / SIGINT   termina
+#   SIGUSR1            pausa o reanuda
+#   SIGHUP             vuelve a leer settings.json (volumen y pack)
+#
+# También atiende las órdenes del canal de instancia única (pause, pack, volume...).
+
+BACKENDS: tuple = ("auto", "direct", "process", "qt")
+
+def direct_available() -> bool:
+    # Indica si el motor sin Qt puede usarse (PortAudio puede faltar en el sistema)
+    # NumPy basta con encontrarlo; sounddevice sí se importa porque es al
+    # importarlo cuando carga PortAudio y falla si no está instalado
+    if importlib.util.find_spec("numpy") is None:
+        return False
+    try:
+        import sounddevice  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+def _install_signals(on_quit: Callable[[], Any], on_reload: Callable[[], Any]) -> None:
+    # Registra los manejadores disponibles en la plataforma
+    signal.signal(signal.SIGINT, lambda *_: on_quit())
+    signal.signal(signal.SIGTERM, lambda *_: on_quit())
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: AppState.toggle())
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda *_: on_reload())
+
+def _command_handler(engine: Any, quit: Callable[[], Any]) -> Callable[[str], str]:
+    # Órdenes del canal de instancia única (ver app/core/instance.py) sin interfaz
+    from app.core.instance import status_line
+    config: ConfigManager = ConfigManager()
+
+    def handle(command: str) -> str:
+        verb, _, arg = command.partition(" ")
+        arg = arg.strip()
+        if verb in ("pause", "resume", "toggle"):
+            AppState.set_active(not AppState.is_active() if verb == "toggle" else verb == "resume")
+        elif verb == "pack":
+            from app.core.pack_library import get_pack_library
+            if arg not in get_pack_library().pack_names():
+                return f"error: pack desconocido '{arg}'"
+            engine.load_sound_pack(arg)
+            config.set("sound_pack", arg)
+        elif verb == "volume":
+            if not arg.isdigit():
+                return "error: volumen entre 0 y 100"
+            engine.set_volume(min(100, int(arg)))
+            config.set("volume", min(100, int(arg)))
+        elif verb == "show":
+            return "error: ejecución sin interfaz"
+        elif verb == "quit":
+            QTimer.singleShot(0, quit)
+            return "ok"
+        elif verb != "status":
+            return f"error: orden desconocida '{verb}'"
+        return status_line(engine)
+
+    return handle
+
+def _serve(app: Any, server: Any, engine: Any, kb_monitor: KeyboardMonitor,
+           reload: Callable[[], Any], tick: Optional[Callable[[], Any]] = None) -> None:
+    # Arranca el listener y atiende órdenes, señales y el tick del motor hasta salir
+    kb_monitor.set_warm_up(engine.warm_up)
+    kb_monitor.start()
+    startup_profile.mark("keyboard")
+
+    server.handler = _command_handler(engine, app.quit)
+    _install_signals(app.quit, reload)
+
+    # El intérprete solo atiende señales cuando recupera el control; el mismo
+    # temporizador lleva el reposo del motor directo
+    timer: QTimer = QTimer()
+    timer.timeout.connect(tick if tick is not None else (lambda: None))
+    timer.start(500)
+
+    if startup_profile.is_enabled():
+        QTimer.singleShot(0, lambda: (startup_profile.mark("event_loop"), startup_profile.report(), app.quit()))
+
+    app.exec()
+    kb_monitor.stop()
+
+def _run_direct(app: Any, server: Any, kb_monitor: KeyboardMonitor) -> None:
+    # Ejecuta el motor sin Qt; el bucle de eventos solo atiende el canal y las señales
+    from app.core.direct_engine import DirectEngine
+    engine: DirectEngine = DirectEngine()
+    engine.start()
+    startup_profile.mark("sound_engine")
+    _serve(app, server, engine, kb_monitor, engine.reload_config, engine.tick)
+    engine.stop()
+
+def _run_process(app: Any, server: Any, kb_monitor: KeyboardMonitor) -> None:
+    # Ejecuta el motor directo en un proceso aparte (ver engine_process.py)
+    from app.core.engine_process import ProcessEngine
+    engine: ProcessEngine = ProcessEngine()
+    engine.start()
+    startup_profile.mark("sound_engine")
+    kb_monitor.set_queue(engine.ring)
+    _serve(app, server, engine, kb_monitor, engine.reload_config)
+    engine.stop()
+
+def _run_qt(app: Any, server: Any, kb_monitor: KeyboardMonitor) -> None:
+    # Ejecuta el motor de Qt sobre el mismo QCoreApplication (sin QtWidgets)
+    from app.core.sound_engine import initialize_sound_engine, shutdown_sound_engine
+    config: ConfigManager = ConfigManager()
+    engine = initialize_sound_engine()
+    startup_profile.mark("sound_engine")
+
+    def reload_config() -> None:
+        # Aplica volumen y pack desde el archivo de configuración
+        config.load_config()
+        engine.set_volume(int(config.get("volume", 50)))
+        engine.load_sound_pack(str(config.get("sound_pack", "Default")))
+
+    _serve(app, server, engine, kb_monitor, reload_config)
+    shutdown_sound_engine()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Typhera sin interfaz")
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="motor de audio (auto: directo si está disponible)")
+    parser.add_argument("--input", choices=INPUT_BACKENDS, default=None,
+                        help="fuente de eventos de teclado (por defecto, la de settings.json)")
+    parser.add_argument("--input-file", default=None,
+                        help="archivo de eventos o traza para la fuente sintética")
+    parser.add_argument("--record", default=None,
+                        help="graba las pulsaciones en una traza (ver app/core/key_trace.py)")
+    add_command_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # Reserva el canal de instancia única antes de enganchar el teclado; si otra
+    # instancia (con o sin interfaz) ya corre, informa de su estado y termina
+    app: QCoreApplication = QCoreApplication(["typhera"])
+    server: InstanceServer = InstanceServer(lambda command: "error: iniciando")
+    if not startup_profile.is_enabled() and not server.listen() \
+            and forward_to_running(argv or [], default="status"):
+        return
+
+    config: ConfigManager = ConfigManager()
+    startup_profile.mark("config")
+
+    backend: str = args.backend
+    if backend == "auto":
+        backend = "direct" if direct_available() else "qt"
+    input_backend: str = args.input or str(config.get("input_backend", "auto"))
+    kb_monitor: KeyboardMonitor = KeyboardMonitor(input_backend, args.input_file)
+    if args.record:
+        kb_monitor.start_recording(Path(args.record))
+    print(f"Typhera sin interfaz (motor: {backend}, entrada: {kb_monitor.backend.name})")
+
+    metrics.start_publishing(float(config.get("metrics_interval_s", 0)),
+                             int(config.get("metrics_port", 0)))
+    # Aplica la orden de la línea de comandos (p. ej. --pause) en esta instancia
+    startup_command: Optional[str] = command_from_args(argv or [])
+    if startup_command is not None:
+        QTimer.singleShot(0, lambda: print(server.handler(startup_command)))
+
+    if backend == "direct":
+        _run_direct(app, server, kb_monitor)
+    elif backend == "process":
+        _run_process(app, server, kb_monitor)
+    else:
+        _run_qt(app, server, kb_monitor)
+    server.close()
+    metrics.stop_publishing()
+
+    # Garantiza que los cambios de configuración pendientes lleguen al disco
+    config.flush()
+    if latency_tracker.enabled:
+        latency_tracker.dump()
+    rate_governor.report()
@@ -1,5 +1,5 @@
 import sys
-from typing import Optional
+from typing import List, Optional
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, 
@@ -11,8 +11,9 @@ from PySide6.QtGui import QIcon, QAction, QDesktopServices, QMouseEvent, QEnterE
 from app.core.config_manager import ConfigManager
 from app.core.state import AppState
 from app.core.sound_engine import get_engine, SoundEngine
+from app.core.pack_library import PackLibrary, get_pack_library
 from app.utils.paths import get_resource_path, get_custom_sounds_path
-from app.utils.updater import check_for_updates
+from app.ui.themes import compiled_stylesheet, get_next_theme, get_theme_icon, get_theme_name
 
 # Etiqueta clickeable que actúa como un hipervínculo
 class WebLinkLabel(QLabel):
@@ -74,6 +75,7 @@ class TypheraWindow(QMainWindow):
         self.update_btn.setCursor(Qt.PointingHandCursor)
         self.update_btn.setToolTip("Buscar Actualizaciones")
         self.update_btn.clicked.connect(self.manual_update_check)
+        self.update_btn.setProperty("role", "top")
         top_bar_layout.addWidget(self.update_btn)
 
         # Empujar a la derecha
@@ -84,6 +86,7 @@ class TypheraWindow(QMainWindow):
         self.theme_btn.setFixedSize(40, 40)
         self.theme_btn.setCursor(Qt.PointingHandCursor)
         self.theme_btn.clicked.connect(self.toggle_theme)
+        self.theme_btn.setProperty("role", "top")
         # Tooltip
         self.theme_btn.setToolTip("Cambiar Tema")
         top_bar_layout.addWidget(self.theme_btn)
@@ -132,13 +135,15 @@ class TypheraWindow(QMainWindow):
         sound_pack_layout: QHBoxLayout = QHBoxLayout()
         sound_pack_layout.setSpacing(10)
 
-        # Selector de Pack de Sonido
+        # Selector de Pack de Sonido, actualizado en vivo por la biblioteca
+        self.pack_library: PackLibrary = get_pack_library()
         self.pack_selector: QComboBox = QComboBox()
-        self.pack_selector.addItems(SoundEngine.get_available_packs())
+        self.pack_selector.addItems(self.pack_library.pack_names())
         # Seleccionar el pack actual guardado en la configuración
         current_pack: str = str(self.config.get("sound_pack", "Default"))
         self.pack_selector.setCurrentText(current_pack)
         self.pack_selector.currentTextChanged.connect(self.change_sound_pack)
+        self.pack_library.packs_changed.connect(self.refresh_pack_list)
         
         # Botón para agregar sonidos
         self.add_sound_btn: QPushButton = QPushButton("+")
@@ -169,210 +174,31 @@ class TypheraWindow(QMainWindow):
         
         # Enlace del pie de página
         self.footer_link: WebLinkLabel = WebLinkLabel("Web: knnabiz.vip", "https://knnabiz.vip")
+        self.footer_link.setObjectName("footer_link")
         content_layout.addWidget(self.footer_link)
 
         # Aplica el tema inicial y actualiza la UI
         self.apply_theme()
         self.update_ui_state()
+        self.prefetch_adjacent_packs()
 
     def apply_theme(self) -> None:
-        # Aplica los colores y estilos CSS basados en el tema seleccionado
-        current_theme: str = str(self.config.get("theme", "dark"))
-        
-        if current_theme == "dark":
-            # Colores oscuros (#1e1e2e)
-            bg_color = "#1e1e2e"
-            text_color = "#ffffff"
-            btn_bg = "#313244" # Surface0
-            btn_text = "#cdd6f4" # Text
-            btn_hover = "#45475a" # Surface1
-            
-            # Estilo especifico para el boton de tema
-            theme_btn_style = f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {text_color};
-                    border: 1px solid {btn_hover};
-                    border-radius: 20px; /* Redondo */
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    background-color: {btn_hover};
-                    border-color: {text_color};
-                }}
-            """
-        else:
-            # Modo Claro - Paleta Mejorada
-            bg_color = "#FAFAFA" # Blanco Roto / Gris Muy Claro
-            text_color = "#2C3E50" # Azul Oscuro / Gris Antracita
-            btn_bg = "#FFFFFF" # Superficie Blanca
-            btn_text = "#2C3E50"
-            btn_hover = "#F0F0F0" # Gris Tenue
-            
-            theme_btn_style = f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {text_color};
-                    border: 1px solid #E0E0E0;
-                    border-radius: 20px;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    background-color: #F0F0F0;
-                    border-color: {text_color};
-                }}
-            """
-
-        # Actualiza el texto del botón de tema y aplica estilos a los botones de la barra superior
-        self.theme_btn.setText("🌙" if current_theme == "light" else "☀️")
-        self.theme_btn.setStyleSheet(theme_btn_style)
-        self.update_btn.setStyleSheet(theme_btn_style)
-
-        # Actualiza el estilo del footer
-        self.footer_link.setStyleSheet(f"color: {text_color}; margin-top: 10px; font-size: 12px;")
-
-        # Aplica la hoja de estilo global
-        if current_theme == "dark":
-            # Estilo Dark Mode (Mejorado)
-            self.setStyleSheet(f"""
-                QMainWindow {{
-                    background-color: {bg_color};
-                }}
-                QLabel {{
-                    color: {text_color};
-                }}
-                QPushButton {{
-                    background-color: {btn_bg};
-                    color: {btn_text};
-                    border: none;
-                    border-radius: 8px;
-                    padding: 10px;
-                    font-size: 14px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {btn_hover};
-                }}
-                QPushButton:pressed {{
-                    background-color: #585b70;
-                }}
-                QComboBox {{
-                    padding: 5px;
-                    border: 1px solid {btn_hover};
-                    border-radius: 5px;
-                    background-color: {btn_bg};
-                    color: {text_color};
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                }}
-                QComboBox QAbstractItemView {{
-                    border: 1px solid {btn_hover};
-                    selection-background-color: {btn_hover};
-                    selection-color: {text_color};
-                    background-color: {btn_bg};
-                    color: {text_color};
-                    outline: none;
-                }}
-                QSlider::groove:horizontal {{
-                    border: 1px solid {btn_hover};
-                    height: 6px;
-                    background: {btn_bg};
-                    margin: 2px 0;
-                    border-radius: 3px;
-                }}
-                QSlider::sub-page:horizontal {{
-                    background: #585b70;
-                    border: 1px solid #585b70;
-                    height: 6px;
-                    border-radius: 3px;
-                }}
-                QSlider::handle:horizontal {{
-                    background: {text_color};
-                    border: 1px solid {text_color};
-                    width: 16px;
-                    height: 16px;
-                    margin: -6px 0;
-                    border-radius: 8px;
-                }}
-            """)
-        else:
-            # Estilo Light Mode (Nuevo y Mejorado)
-            self.setStyleSheet(f"""
-                QMainWindow {{
-                    background-color: {bg_color};
-                }}
-                QLabel {{
-                    color: {text_color};
-                }}
-                QPushButton {{
-                    background-color: {btn_bg};
-                    color: {btn_text};
-                    border: 1px solid #E0E0E0; /* Borde sutil */
-                    border-radius: 8px;
-                    padding: 10px;
-                    font-size: 14px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {btn_hover};
-                    border: 1px solid #D0D0D0;
-                }}
-                QPushButton:pressed {{
-                    background-color: #E6E6E6;
-                    border: 1px solid #C0C0C0;
-                }}
-                QPushButton:disabled {{
-                    background-color: #F5F5F5;
-                    color: #A0A0A0;
-                    border: 1px solid #EEEEEE;
-                }}
-                QComboBox {{
-                    padding: 5px;
-                    border: 1px solid #E0E0E0;
-                    border-radius: 5px;
-                    background-color: {btn_bg};
-                    color: {text_color};
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                }}
-                QComboBox QAbstractItemView {{
-                     border: 1px solid #E0E0E0;
-                     selection-background-color: #D6D6D6; /* Un poco mas oscuro para resaltar seleccion */
-                     selection-color: {text_color};
-                     background-color: {btn_bg};
-                     color: {text_color}; /* Forzar color de texto oscuro */
-                     outline: none;
-                }}
-                QSlider::groove:horizontal {{
-                    border: 1px solid #E0E0E0;
-                    height: 6px; /* ranura ligeramente más delgada */
-                    background: #F0F0F0;
-                    margin: 2px 0;
-                    border-radius: 3px;
-                }}
-                QSlider::sub-page:horizontal {{
-                    background: #A0A0A0; /* Color de la parte rellena */
-                    border: 1px solid #A0A0A0;
-                    height: 6px;
-                    border-radius: 3px;
-                }}
-                QSlider::handle:horizontal {{
-                    background: {text_color};
-                    border: 1px solid {text_color};
-                    width: 16px;
-                    height: 16px;
-                    margin: -6px 0;
-                    border-radius: 8px;
-                }}
-            """)
+        # Aplica el tema seleccionado usando la hoja de estilo precompilada
+        current_theme: str = get_theme_name(str(self.config.get("theme", "dark")))
+
+        # Qt vuelve a pulir la ventana y sus hijos en una sola pasada; si el tema
+        # no cambió no hay nada que aplicar
+        stylesheet: str = compiled_stylesheet(current_theme)
+        if self.styleSheet() != stylesheet:
+            self.setStyleSheet(stylesheet)
+
+        # Actualiza el icono del botón de tema
+        self.theme_btn.setText(get_theme_icon(current_theme))
         
     def toggle_theme(self) -> None:
-        # Alterna entre temas claro y oscuro y persiste la elección
+        # Pasa al siguiente tema disponible y persiste la elección
         current: str = str(self.config.get("theme", "dark"))
-        new_theme: str = "light" if current == "dark" else "dark"
-        self.config.set("theme", new_theme)
+        self.config.set("theme", get_next_theme(current))
         self.apply_theme()
 
     def update_ui_state(self) -> None:
@@ -403,6 +229,34 @@ class TypheraWindow(QMainWindow):
         if self.sound_engine:
             self.sound_engine.load_sound_pack(pack_name)
             self.config.set("sound_pack", pack_name)
+            self.prefetch_adjacent_packs()
+
+    def refresh_pack_list(self, pack_names: List[str]) -> None:
+        # Repuebla el selector conservando la selección si el pack sigue existiendo
+        current: str = self.pack_selector.currentText()
+        self.pack_selector.blockSignals(True)
+        self.pack_selector.clear()
+        self.pack_selector.addItems(pack_names)
+        self.pack_selector.blockSignals(False)
+
+        if current in pack_names:
+            self.pack_selector.setCurrentText(current)
+        else:
+            # El pack activo fue eliminado: vuelve al sonido por defecto
+            self.pack_selector.setCurrentText("Default")
+            self.change_sound_pack("Default")
+
+    def prefetch_adjacent_packs(self) -> None:
+        # Precarga los packs contiguos al actual en el selector
+        if not self.sound_engine:
+            return
+        index: int = self.pack_selector.currentIndex()
+        neighbours: List[str] = [
+            self.pack_selector.itemText(i)
+            for i in (index - 1, index + 1)
+            if 0 <= i < self.pack_selector.count()
+        ]
+        self.sound_engine.prefetch_packs(neighbours)
 
     def open_sounds_folder(self) -> None:
         # Abre el directorio de sonidos personalizados en el explorador de archivos
@@ -411,6 +265,8 @@ class TypheraWindow(QMainWindow):
 
     def manual_update_check(self) -> None:
         # Inicia una búsqueda forzada de actualizaciones
+        # El verificador (y QtNetwork) se importa solo al usarlo
+        from app.utils.updater import check_for_updates
         check_for_updates(self, force=True)
 
     def closeEvent(self, event: QEvent) -> None:
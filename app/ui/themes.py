@@ -0,0 +1,161 @@
+from functools import lru_cache
+from string import Template
+from typing import Dict, List
+
+# Define los temas como datos: una paleta por tema y plantillas QSS comunes
+# La hoja de cada tema se genera una sola vez; al cambiar de tema la ventana la
+# aplica con un único setStyleSheet y Qt vuelve a pulir los widgets por su cuenta
+
+DEFAULT_THEME: str = "dark"
+
+THEMES: Dict[str, Dict[str, str]] = {
+    "dark": {
+        "icon": "☀️",
+        "bg": "#1e1e2e",
+        "text": "#ffffff",
+        "button_bg": "#313244",          # Surface0
+        "button_text": "#cdd6f4",        # Text
+        "button_border": "none",
+        "button_hover": "#45475a",       # Surface1
+        "button_hover_border": "none",
+        "button_pressed": "#585b70",
+        "button_pressed_border": "none",
+        "disabled_bg": "#313244",
+        "disabled_text": "#6c7086",
+        "disabled_border": "none",
+        "input_border": "#45475a",
+        "selection_bg": "#45475a",
+        "groove_bg": "#313244",
+        "groove_border": "#45475a",
+        "slider_fill": "#585b70",
+        "top_border": "#45475a",
+        "top_hover": "#45475a",
+    },
+    "light": {
+        "icon": "🌙",
+        "bg": "#FAFAFA",                 # Blanco Roto / Gris Muy Claro
+        "text": "#2C3E50",               # Azul Oscuro / Gris Antracita
+        "button_bg": "#FFFFFF",          # Superficie Blanca
+        "button_text": "#2C3E50",
+        "button_border": "1px solid #E0E0E0",
+        "button_hover": "#F0F0F0",       # Gris Tenue
+        "button_hover_border": "1px solid #D0D0D0",
+        "button_pressed": "#E6E6E6",
+        "button_pressed_border": "1px solid #C0C0C0",
+        "disabled_bg": "#F5F5F5",
+        "disabled_text": "#A0A0A0",
+        "disabled_border": "1px solid #EEEEEE",
+        "input_border": "#E0E0E0",
+        "selection_bg": "#D6D6D6",       # Un poco mas oscuro para resaltar seleccion
+        "groove_bg": "#F0F0F0",
+        "groove_border": "#E0E0E0",
+        "slider_fill": "#A0A0A0",
+        "top_border": "#E0E0E0",
+        "top_hover": "#F0F0F0",
+    },
+}
+
+# Plantilla de la ventana principal
+WINDOW_TEMPLATE: Template = Template("""
+QMainWindow {
+    background-color: $bg;
+}
+QLabel {
+    color: $text;
+}
+QPushButton {
+    background-color: $button_bg;
+    color: $button_text;
+    border: $button_border;
+    border-radius: 8px;
+    padding: 10px;
+    font-size: 14px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: $button_hover;
+    border: $button_hover_border;
+}
+QPushButton:pressed {
+    background-color: $button_pressed;
+    border: $button_pressed_border;
+}
+QPushButton:disabled {
+    background-color: $disabled_bg;
+    color: $disabled_text;
+    border: $disabled_border;
+}
+QComboBox {
+    padding: 5px;
+    border: 1px solid $input_border;
+    border-radius: 5px;
+    background-color: $button_bg;
+    color: $text;
+}
+QComboBox::drop-down {
+    border: none;
+}
+QComboBox QAbstractItemView {
+    border: 1px solid $input_border;
+    selection-background-color: $selection_bg;
+    selection-color: $text;
+    background-color: $button_bg;
+    color: $text;
+    outline: none;
+}
+QSlider::groove:horizontal {
+    border: 1px solid $groove_border;
+    height: 6px;
+    background: $groove_bg;
+    margin: 2px 0;
+    border-radius: 3px;
+}
+QSlider::sub-page:horizontal {
+    background: $slider_fill;
+    border: 1px solid $slider_fill;
+    height: 6px;
+    border-radius: 3px;
+}
+QSlider::handle:horizontal {
+    background: $text;
+    border: 1px solid $text;
+    width: 16px;
+    height: 16px;
+    margin: -6px 0;
+    border-radius: 8px;
+}
+QPushButton[role="top"] {
+    background-color: transparent;
+    color: $text;
+    border: 1px solid $top_border;
+    border-radius: 20px;
+    font-size: 14px;
+}
+QPushButton[role="top"]:hover {
+    background-color: $top_hover;
+    border-color: $text;
+}
+QLabel#footer_link {
+    color: $text;
+    margin-top: 10px;
+    font-size: 12px;
+}
+""")
+
+def get_theme_name(name: str) -> str:
+    # Normaliza el nombre del tema; recurre al tema por defecto si no existe
+    return name if name in THEMES else DEFAULT_THEME
+
+def get_theme_icon(name: str) -> str:
+    # Retorna el icono del botón de cambio de tema
+    return THEMES[get_theme_name(name)]["icon"]
+
+def get_next_theme(name: str) -> str:
+    # Retorna el tema siguiente en orden de definición (cíclico)
+    names: List[str] = list(THEMES)
+    return names[(names.index(get_theme_name(name)) + 1) % len(names)]
+
+@lru_cache(maxsize=None)
+def compiled_stylesheet(name: str) -> str:
+    # Renderiza una única vez la hoja de estilo de cada tema
+    return WINDOW_TEMPLATE.substitute(THEMES[get_theme_name(name)])
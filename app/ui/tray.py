@@ -1,22 +1,29 @@
+from typing import Callable, Optional
 from PySide6.QtWidgets import QSystemTrayIcon, QMenu, QMainWindow
 from PySide6.QtGui import QIcon, QAction
-from PySide6.QtCore import QCoreApplication
+from PySide6.QtCore import QCoreApplication, QEvent, QTimer
 from app.utils.paths import get_resource_path
+from app.core.config_manager import ConfigManager
 from app.core.state import AppState
+from app.core.latency import latency_tracker
+from app.core.metrics import metrics
 
 # Controla el icono en la bandeja del sistema y su menú contextual
 # Permite interacción básica con la aplicación minimizada
 class TypheraTray(QSystemTrayIcon):
-    def __init__(self, main_window: QMainWindow) -> None:
-        # Inicializa el icono con la referencia a la ventana principal
+    def __init__(self, window_factory: Callable[[], QMainWindow]) -> None:
+        # Inicializa el icono; la ventana principal se crea bajo demanda
         icon_path: str = get_resource_path("icons/icon.ico")
-        super().__init__(QIcon(icon_path), main_window)
+        super().__init__(QIcon(icon_path))
         
-        self.window: QMainWindow = main_window
-        self.setToolTip("Typhera")
+        self.window_factory: Callable[[], QMainWindow] = window_factory
+        self.window: Optional[QMainWindow] = None
+        # Las métricas del tooltip se leen solo cuando se van a mostrar (ver event)
+        self.update_tooltip()
         
-        # Construye el menú contextual
+        # Construye el menú contextual; abrirlo también refresca el tooltip
         self.menu: QMenu = QMenu()
+        self.menu.aboutToShow.connect(self.update_tooltip)
         
         # Opción para restaurar la ventana
         self.action_show: QAction = self.menu.addAction("Abrir Configuración")
@@ -26,6 +33,11 @@ class TypheraTray(QSystemTrayIcon):
         self.action_toggle: QAction = self.menu.addAction("Pausar")
         self.action_toggle.triggered.connect(self.toggle_state)
         
+        # Opción para volcar los histogramas de latencia si están habilitados
+        if latency_tracker.enabled:
+            self.action_latency: QAction = self.menu.addAction("Exportar latencias")
+            self.action_latency.triggered.connect(self.dump_latency)
+
         self.menu.addSeparator()
         
         # Opción para cerrar la aplicación completamente
@@ -40,30 +52,95 @@ class TypheraTray(QSystemTrayIcon):
         self.show()
 
     def show_window(self) -> None:
-        # Restaura y enfoca la ventana principal
+        # Crea la ventana en el primer uso, luego la restaura y enfoca
+        if self.window is None:
+            self.window = self.window_factory()
         self.window.show()
         self.window.activateWindow()
 
     def toggle_state(self) -> None:
         # Alterna el estado global de pausa
         AppState.toggle()
+        self.sync_state()
+
+    def sync_state(self) -> None:
+        # Refleja el estado de pausa en el menú y en la ventana principal si existe
         self.update_menu_text()
-        
-        # Sincroniza la interfaz de la ventana principal si está visible
-        if hasattr(self.window, 'update_ui_state'):
+        if self.window is not None and hasattr(self.window, 'update_ui_state'):
             self.window.update_ui_state()
 
+    def run_command(self, command: str) -> str:
+        # Ejecuta una orden recibida por el canal de instancia única (ver instance.py)
+        # Los cambios pasan por los controles de la ventana si ya existe, para que
+        # se mantengan sincronizados
+        from app.core.sound_engine import get_engine
+        from app.core.instance import status_line
+        verb, _, arg = command.partition(" ")
+        arg = arg.strip()
+        engine = get_engine()
+        config: ConfigManager = ConfigManager()
+
+        if verb == "show":
+            self.show_window()
+        elif verb in ("pause", "resume", "toggle"):
+            AppState.set_active(not AppState.is_active() if verb == "toggle" else verb == "resume")
+            self.sync_state()
+        elif verb == "pack":
+            if engine is None or arg not in engine.get_available_packs():
+                return f"error: pack desconocido '{arg}'"
+            if self.window is not None and hasattr(self.window, 'pack_selector'):
+                self.window.pack_selector.setCurrentText(arg)
+            else:
+                engine.load_sound_pack(arg)
+                config.set("sound_pack", arg)
+        elif verb == "volume":
+            if engine is None or not arg.isdigit():
+                return "error: volumen entre 0 y 100"
+            volume: int = min(100, int(arg))
+            if self.window is not None and hasattr(self.window, 'vol_slider'):
+                self.window.vol_slider.setValue(volume)
+            else:
+                engine.set_volume(volume)
+        elif verb == "status":
+            pass
+        elif verb == "quit":
+            # Sale después de responder
+            QTimer.singleShot(0, self.quit_app)
+            return "ok"
+        else:
+            return f"error: orden desconocida '{verb}'"
+
+        return status_line(engine)
+
     def update_menu_text(self) -> None:
         # Actualiza el texto del menú según el estado actual
         if AppState.is_active():
             self.action_toggle.setText("Pausar")
-            self.setToolTip("Typhera: Activo")
         else:
             self.action_toggle.setText("Reanudar")
-            self.setToolTip("Typhera: Pausa")
+        self.update_tooltip()
+
+    def update_tooltip(self) -> None:
+        # Muestra el estado y las métricas principales del motor
+        state: str = "Activo" if AppState.is_active() else "Pausa"
+        self.setToolTip(f"Typhera: {state}\n{metrics.summary()}")
+
+    def dump_latency(self) -> None:
+        # Guarda los percentiles de latencia por etapa y muestra la ruta
+        path: str = latency_tracker.dump()
+        self.showMessage("Typhera", f"Latencias guardadas en {path}")
+
+    def event(self, event: QEvent) -> bool:
+        # Refresca el tooltip al pasar el puntero por el icono, donde la
+        # plataforma lo notifica (X11); en el resto se refresca al hacer clic,
+        # al abrir el menú y al cambiar de estado
+        if event.type() == QEvent.ToolTip:
+            self.update_tooltip()
+        return super().event(event)
 
     def on_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         # Abre la ventana al hacer doble clic en el icono
+        self.update_tooltip()
         if reason == QSystemTrayIcon.DoubleClick:
             self.show_window()
 
@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Mide el coste de arranque de Typhera
+# main.py registra marcas de inicialización con mark(); este módulo, ejecutado
+# como script, lanza la aplicación varias veces en procesos nuevos con
+# `-X importtime` y reporta la mediana del tiempo de importación por módulo
+# y de cada etapa de inicialización hasta que el bucle de eventos está listo.
+#
+#   python -m app.utils.startup_profile --runs 5
+#   python -m app.utils.startup_profile --runs 5 --json resultados.json
+#   python -m app.utils.startup_profile --runs 5 --headless
+
+# Variable de entorno que activa las marcas y el cierre automático de main.py
+PROFILE_ENV: str = "TYPHERA_STARTUP_PROFILE"
+# Prefijo de la línea con el resultado que imprime main.py
+REPORT_PREFIX: str = "TYPHERA_STARTUP "
+
+_origin: float = time.perf_counter()
+_marks: List[Tuple[str, float]] = []
+
+def is_enabled() -> bool:
+    # Indica si el proceso actual se está perfilando
+    return bool(os.getenv(PROFILE_ENV))
+
+def mark(stage: str) -> None:
+    # Registra el fin de una etapa de inicialización (ms desde el arranque)
+    if is_enabled():
+        _marks.append((stage, (time.perf_counter() - _origin) * 1000.0))
+
+def report() -> None:
+    # Imprime las duraciones de cada etapa en una sola línea JSON
+    stages: Dict[str, float] = {}
+    previous: float = 0.0
+    for stage, at in _marks:
+        stages[stage] = at - previous
+        previous = at
+    stages["total"] = previous
+    print(REPORT_PREFIX + json.dumps(stages), flush=True)
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def _parse_importtime(stderr: str) -> Dict[str, float]:
+    # Retorna el tiempo acumulado (ms) de cada paquete externo importado en
+    # primer nivel y de cada módulo propio de la aplicación (app.*)
+    totals: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        name: str = match.group(4)
+        top_level: bool = len(match.group(3)) == 1
+        if top_level or name.startswith("app."):
+            key: str = name if name.startswith("app") else name.split(".")[0]
+            totals[key] = totals.get(key, 0.0) + int(match.group(2)) / 1000.0
+    return totals
+
+def _run_once(main_path: str, args: List[str]) -> Tuple[Dict[str, float], Dict[str, float]]:
+    # Lanza la aplicación una vez y retorna (importaciones, etapas)
+    env: Dict[str, str] = dict(os.environ)
+    env[PROFILE_ENV] = "1"
+    proc = subprocess.run([sys.executable, "-X", "importtime", main_path] + args,
+                          env=env, capture_output=True, text=True, timeout=120)
+    stages: Dict[str, float] = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith(REPORT_PREFIX):
+            stages = json.loads(line[len(REPORT_PREFIX):])
+    if not stages:
+        raise RuntimeError(f"La aplicación no reportó tiempos de arranque:\n{proc.stderr[-2000:]}")
+    return _parse_importtime(proc.stderr), stages
+
+def _median(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    # Calcula la mediana por clave (las ausentes cuentan como 0)
+    keys: List[str] = []
+    for sample in samples:
+        keys += [key for key in sample if key not in keys]
+    return {key: statistics.median(sample.get(key, 0.0) for sample in samples) for key in keys}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Perfil de arranque de Typhera")
+    parser.add_argument("--runs", type=int, default=5, help="número de ejecuciones")
+    parser.add_argument("--top", type=int, default=15, help="módulos a mostrar")
+    parser.add_argument("--json", dest="json_path", help="guarda el resultado en JSON")
+    parser.add_argument("--headless", action="store_true", help="mide el modo sin interfaz")
+    args = parser.parse_args(argv)
+
+    main_path: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))), "main.py")
+
+    imports: List[Dict[str, float]] = []
+    stages: List[Dict[str, float]] = []
+    for _ in range(max(1, args.runs)):
+        run_imports, run_stages = _run_once(main_path, ["--headless"] if args.headless else [])
+        imports.append(run_imports)
+        stages.append(run_stages)
+
+    import_median: Dict[str, float] = _median(imports)
+    stage_median: Dict[str, float] = _median(stages)
+
+    print(f"Mediana de {len(stages)} ejecuciones\n")
+    print("Importaciones (ms acumulados)")
+    for name, ms in sorted(import_median.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<28}{ms:9.1f}")
+    print("\nEtapas de inicialización (ms)")
+    for name, ms in stage_median.items():
+        print(f"  {name:<28}{ms:9.1f}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({"runs": len(stages), "imports": import_median, "stages": stage_median}, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import hashlib
+import json
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Servidor local que imita el endpoint de la última release de GitHub
+# Sirve para probar el verificador de actualizaciones sin red ni límites de la
+# API: responde con ETag y Last-Modified, contesta 304 a las peticiones
+# condicionales y puede simular fallos para comprobar la espera creciente.
+#
+#   python -m app.utils.update_stub --tag 9.9.9 --port 8765
+#   settings.json: "update_url": "http://127.0.0.1:8765/releases/latest"
+
+def release_body(tag: str) -> bytes:
+    # Cuerpo con los campos que lee UpdateChecker
+    data: Dict[str, Any] = {
+        "tag_name": f"v{tag}",
+        "html_url": f"https://github.com/KnnabizCode/Typhera/releases/tag/v{tag}",
+    }
+    return json.dumps(data).encode('utf-8')
+
+def make_handler(tag: str, fail: int, status: int, retry_after: int) -> type:
+    body: bytes = release_body(tag)
+    etag: str = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+    last_modified: str = formatdate(time.time(), usegmt=True)
+    # Peticiones que aún deben fallar (compartido entre hilos del servidor)
+    remaining: List[int] = [fail]
+
+    class StubHandler(BaseHTTPRequestHandler):
+        # Códigos respondidos, en orden (las pruebas los consultan)
+        served: List[int] = []
+
+        def send_response(self, code: int, message: Optional[str] = None) -> None:
+            StubHandler.served.append(code)
+            super().send_response(code, message)
+
+        def do_GET(self) -> None:
+            if remaining[0] > 0:
+                remaining[0] -= 1
+                self.send_response(status)
+                if retry_after > 0:
+                    self.send_header("Retry-After", str(retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            # Solo se compara el ETag si viene; si no, la fecha
+            if_none_match: Optional[str] = self.headers.get("If-None-Match")
+            if_modified_since: Optional[str] = self.headers.get("If-Modified-Since")
+            if (if_none_match == etag if if_none_match is not None
+                    else if_modified_since == last_modified):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Registro breve: cada petición y su respuesta (200, 304, fallo)
+            print(f"{self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+    return StubHandler
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor local de releases para probar actualizaciones")
+    parser.add_argument("--tag", default="9.9.9", help="versión que anuncia el servidor")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail", type=int, default=0,
+                        help="número de peticiones iniciales que fallan")
+    parser.add_argument("--status", type=int, default=503, help="código de las respuestas fallidas")
+    parser.add_argument("--retry-after", type=int, default=0,
+                        help="segundos de Retry-After en las respuestas fallidas")
+    args = parser.parse_args(argv)
+
+    server: ThreadingHTTPServer = ThreadingHTTPServer(
+        ("127.0.0.1", args.port), make_handler(args.tag, args.fail, args.status, args.retry_after))
+    print(f"Release v{args.tag} en http://127.0.0.1:{args.port}/releases/latest")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
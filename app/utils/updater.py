@@ -11,58 +11,109 @@ from app.core.config_manager import ConfigManager
 from app import __version__
 
 GITHUB_REPO: str = "KnnabizCode/Typhera"
+UPDATE_URL: str = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
 CHECK_INTERVAL_HOURS: int = 24
+# Espera tras un fallo: se duplica con cada fallo consecutivo hasta el máximo
+BACKOFF_BASE_MINUTES: int = 15
+BACKOFF_MAX_HOURS: int = 24
 
 # Gestiona la verificación de actualizaciones en segundo plano utilizando QtNetwork
+# Las consultas son condicionales: se guardan el ETag y la fecha Last-Modified de
+# la última respuesta y, si la release no cambió, el servidor responde 304 sin
+# cuerpo y se reutiliza la versión guardada. El estado vive en la clave
+# `update_cache` de settings.json y se escribe una sola vez por consulta.
 class UpdateChecker(QObject):
     # Emite una señal cuando se detecta una nueva versión: (tag_versión, url_descarga)
     update_available: Signal = Signal(str, str)
 
     def __init__(self, parent: Optional[QObject] = None) -> None:
         super().__init__(parent)
+        self.config: ConfigManager = ConfigManager()
         self.manager: QNetworkAccessManager = QNetworkAccessManager(self)
         self.manager.finished.connect(self.on_request_finished)
 
-    def check(self) -> None:
+    def load_cache(self) -> Dict[str, Any]:
+        # Retorna una copia del estado guardado de la última consulta
+        cache: Any = self.config.get("update_cache", {})
+        return dict(cache) if isinstance(cache, dict) else {}
+
+    def check(self, force: bool = False) -> None:
         # Inicia la consulta de actualizaciones si ha pasado el tiempo suficiente
+        # y no hay una espera pendiente tras un fallo (salvo que se fuerce)
         try:
-            config: ConfigManager = ConfigManager()
-            last_check_str: Any = config.get("last_update_check")
-            
+            cache: Dict[str, Any] = self.load_cache()
+            now: datetime = datetime.now()
+
             # Valida el límite de frecuencia de solicitudes (Rate Limiting local)
-            if last_check_str:
+            if not force:
                 try:
-                    last_check: datetime = datetime.fromisoformat(last_check_str)
-                    if datetime.now() - last_check < timedelta(hours=CHECK_INTERVAL_HOURS):
-                        return 
+                    if cache.get("retry_at") and now < datetime.fromisoformat(cache["retry_at"]):
+                        return
+                    if cache.get("checked_at") and \
+                            now - datetime.fromisoformat(cache["checked_at"]) < timedelta(hours=CHECK_INTERVAL_HOURS):
+                        return
                 except ValueError:
                     pass
 
-            # Prepara la solicitud a la API de GitHub
-            url: QUrl = QUrl(f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest")
+            # Prepara la solicitud; el endpoint es configurable (p. ej. update_stub.py)
+            url: QUrl = QUrl(str(self.config.get("update_url", UPDATE_URL)) or UPDATE_URL)
             request: QNetworkRequest = QNetworkRequest(url)
             request.setHeader(QNetworkRequest.UserAgentHeader, "Typhera-App")
-            
+            request.setRawHeader(b"Accept", b"application/vnd.github+json")
+
+            # Solo se pide la condición si hay una versión guardada que reutilizar
+            if cache.get("tag"):
+                if cache.get("etag"):
+                    request.setRawHeader(b"If-None-Match", str(cache["etag"]).encode('latin-1'))
+                if cache.get("last_modified"):
+                    request.setRawHeader(b"If-Modified-Since",
+                                         str(cache["last_modified"]).encode('latin-1'))
+
             self.manager.get(request)
-            
-            # Registra el intento de actualización
-            config.set("last_update_check", datetime.now().isoformat())
-            
         except Exception:
             pass
 
     def on_request_finished(self, reply: QNetworkReply) -> None:
         # Procesa la respuesta de la API de GitHub
         try:
-            if reply.error() == QNetworkReply.NoError:
+            cache: Dict[str, Any] = self.load_cache()
+            status: Any = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            now: datetime = datetime.now()
+
+            if status == 304:
+                # La release no cambió: no hay cuerpo que leer
+                pass
+            elif reply.error() == QNetworkReply.NoError and status == 200:
                 data: Dict[str, Any] = json.loads(str(reply.readAll(), 'utf-8'))
-                
-                latest_tag: str = data.get("tag_name", "").lstrip("v")
-                html_url: str = data.get("html_url", "")
-                
-                # Compara las versiones semánticas
-                if self.is_newer(latest_tag, __version__):
-                    self.update_available.emit(latest_tag, html_url)
+                cache["tag"] = data.get("tag_name", "").lstrip("v")
+                cache["url"] = data.get("html_url", "")
+                cache["etag"] = str(reply.rawHeader("ETag"), 'latin-1')
+                cache["last_modified"] = str(reply.rawHeader("Last-Modified"), 'latin-1')
+            else:
+                # Error de red o del servidor (incluido el límite de peticiones):
+                # espera creciente antes del siguiente intento automático
+                failures: int = int(cache.get("failures", 0)) + 1
+                delay: timedelta = min(timedelta(minutes=BACKOFF_BASE_MINUTES * 2 ** (failures - 1)),
+                                       timedelta(hours=BACKOFF_MAX_HOURS))
+                retry_after: bytes = bytes(reply.rawHeader("Retry-After"))
+                if retry_after.isdigit():
+                    delay = max(delay, timedelta(seconds=int(retry_after)))
+                cache["failures"] = failures
+                cache["retry_at"] = (now + delay).isoformat()
+                self.config.set("update_cache", cache)
+                print(f"No se pudo comprobar actualizaciones (estado {status}); "
+                      f"reintento en {int(delay.total_seconds())}s")
+                return
+
+            cache["checked_at"] = now.isoformat()
+            cache["failures"] = 0
+            cache["retry_at"] = ""
+            self.config.set("update_cache", cache)
+
+            # Compara las versiones semánticas
+            latest_tag: str = str(cache.get("tag", ""))
+            if latest_tag and self.is_newer(latest_tag, __version__):
+                self.update_available.emit(latest_tag, str(cache.get("url", "")))
         except Exception:
             pass
         finally:
@@ -148,17 +199,16 @@ class UpdateDialog(QDialog):
 # Interfaz pública para iniciar el proceso de actualización
 def check_for_updates(parent_window: Optional[Any] = None, force: bool = False) -> None:
     # Inicia el chequeo de actualizaciones y vincula el diálogo al padre si es necesario
+    # El padre puede ser la ventana o el icono de bandeja (chequeo diferido del arranque)
     if parent_window:
-        if force:
-            ConfigManager().set("last_update_check", "")
-
-        # Mantiene la referencia viva adjuntándola a la ventana padre
+        # Mantiene la referencia viva adjuntándola al padre
         checker: UpdateChecker = UpdateChecker(parent_window)
         parent_window._update_checker = checker
-        
-        checker.update_available.connect(lambda ver, url: show_update_dialog(ver, url, parent_window))
-        
-        checker.check()
+
+        dialog_parent: Optional[QWidget] = parent_window if isinstance(parent_window, QWidget) else None
+        checker.update_available.connect(lambda ver, url: show_update_dialog(ver, url, dialog_parent))
+
+        checker.check(force)
 
 def show_update_dialog(version: str, url: str, parent: Optional[QWidget]) -> None:
     # Instancia y muestra el diálogo de actualización de manera modal
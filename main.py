@@ -1,43 +1,174 @@
+import argparse
 import sys
 import os
-from PySide6.QtWidgets import QApplication
+from pathlib import Path
+from typing import List
 
 # Configura la ruta de búsqueda para módulos locales
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Registra el instante de arranque antes de cualquier importación pesada
+from app.utils import startup_profile
+
+# Proceso de audio lanzado por ProcessEngine (ver app/core/engine_process.py)
+if __name__ == "__main__" and "--audio-worker" in sys.argv[1:]:
+    from app.core.engine_process import worker_main
+    worker_main(sys.argv[1:])
+    sys.exit(0)
+
+# Si ya hay una instancia en ejecución (con o sin interfaz), le reenvía la orden
+# y termina sin importar QtWidgets ni crear otro motor y otro listener
+# (ver app/core/instance.py). Una ejecución sin interfaz repetida solo consulta
+# el estado.
+if __name__ == "__main__" and not startup_profile.is_enabled():
+    from app.core.instance import forward_to_running, command_from_args
+    if forward_to_running(sys.argv[1:], "status" if "--headless" in sys.argv[1:] else "show"):
+        sys.exit(0)
+    # Consultar o cerrar no tiene sentido si no hay nada en ejecución
+    if command_from_args(sys.argv[1:]) in ("status", "quit"):
+        print("Typhera no está en ejecución")
+        sys.exit(1)
+
+# El modo sin interfaz tiene su propio punto de entrada y no importa QtWidgets
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    from app.headless import main as headless_main
+    headless_main(sys.argv[1:])
+    sys.exit(0)
+
+from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtCore import QTimer
+
 from app.core.config_manager import ConfigManager
 from app.core.keyboard_listener import KeyboardMonitor
-from app.core.sound_engine import initialize_sound_engine
-from app.ui.main_window import TypheraWindow
+from app.core.sound_engine import (initialize_sound_engine, initialize_process_engine,
+                                   shutdown_sound_engine, get_engine)
+from app.core.latency import latency_tracker
+from app.core.rate_governor import rate_governor
+from app.core import metrics
+from app.core.instance import (InstanceServer, add_command_arguments, command_from_args,
+                               forward_to_running)
 from app.ui.tray import TypheraTray
 
+startup_profile.mark("imports")
+
+def create_window() -> QMainWindow:
+    # Importa y construye la ventana principal solo cuando se necesita
+    # (arrastra QtNetwork y el verificador de actualizaciones)
+    from app.ui.main_window import TypheraWindow
+    return TypheraWindow()
+
+# Comprobación de actualizaciones del arranque: primera espera y sondeo del teclado
+UPDATE_DELAY_MS: int = 30000
+UPDATE_IDLE_MS: int = 5000
+
+def deferred_update_check(owner: TypheraTray, last_events: int = -1) -> None:
+    # Espera a que no lleguen pulsaciones durante un intervalo completo para no
+    # competir con el audio; QtNetwork y el verificador se importan solo entonces
+    events: int = metrics.metrics.events_received
+    if events != last_events:
+        QTimer.singleShot(UPDATE_IDLE_MS, lambda: deferred_update_check(owner, events))
+        return
+    from app.utils.updater import check_for_updates
+    check_for_updates(owner)
+
+def connect_pack_library() -> None:
+    # Vigila la carpeta de sonidos una vez que el bucle de eventos está activo
+    from app.core.pack_library import get_pack_library
+    engine = get_engine()
+    if engine is not None:
+        get_pack_library().pack_modified.connect(engine.invalidate_pack)
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    # Opciones del modo con interfaz; las de Qt (p. ej. -style) se dejan pasar
+    parser = argparse.ArgumentParser(description="Typhera")
+    parser.add_argument("--record", default=None,
+                        help="graba las pulsaciones en una traza (ver app/core/key_trace.py)")
+    add_command_arguments(parser)
+    return parser.parse_known_args(argv)[0]
+
 # Orquesta la inicialización de servicios y el ciclo de vida de la UI
 def main() -> None:
+    # Valida la línea de comandos antes de crear nada; un --record sin archivo
+    # termina con un error de uso
+    args: argparse.Namespace = parse_args(sys.argv[1:])
+
     # Inicializa el contexto de la aplicación Qt
     app: QApplication = QApplication(sys.argv)
     
     # Mantiene la ejecución activa en segundo plano al cerrar ventanas
     app.setQuitOnLastWindowClosed(False)
+    startup_profile.mark("qt_app")
+
+    # Reserva el canal de instancia única; si otra instancia arrancó a la vez,
+    # le cede la orden y termina. Las órdenes esperan hasta que exista la bandeja
+    instance_server: InstanceServer = InstanceServer()
+    if not startup_profile.is_enabled() and not instance_server.listen() \
+            and forward_to_running(sys.argv[1:]):
+        sys.exit(0)
 
     # Carga la configuración del sistema
     _config: ConfigManager = ConfigManager()
+    startup_profile.mark("config")
     
-    # Prepara el motor de audio
-    initialize_sound_engine()
+    # Prepara el motor de audio en su hilo dedicado o, si se configuró, en un
+    # proceso aparte conectado por memoria compartida
+    if _config.get("audio_process", False):
+        initialize_process_engine()
+    else:
+        initialize_sound_engine()
+    engine = get_engine()
+    startup_profile.mark("sound_engine")
     
     # Inicia el monitoreo de eventos de teclado en hilo separado
-    kb_monitor: KeyboardMonitor = KeyboardMonitor()
+    kb_monitor: KeyboardMonitor = KeyboardMonitor(str(_config.get("input_backend", "auto")))
+    kb_monitor.set_warm_up(engine.warm_up)
+    if hasattr(engine, "ring"):
+        kb_monitor.set_queue(engine.ring)
+    # Graba las pulsaciones de la sesión si se pidió con --record <archivo>
+    if args.record:
+        kb_monitor.start_recording(Path(args.record))
     kb_monitor.start()
+    startup_profile.mark("keyboard")
+
+    # Publica las métricas en metrics.json y en 127.0.0.1 si está configurado
+    metrics.start_publishing(float(_config.get("metrics_interval_s", 0)),
+                             int(_config.get("metrics_port", 0)))
+
+    # Muestra el icono de bandeja; la ventana se crea al abrirla por primera vez
+    _tray: TypheraTray = TypheraTray(create_window)
+    instance_server.set_handler(_tray.run_command)
+    startup_profile.mark("tray")
 
-    # Instancia y conecta los componentes visuales
-    window: TypheraWindow = TypheraWindow()
-    _tray: TypheraTray = TypheraTray(window)
+    # Aplica la orden de la línea de comandos (p. ej. --pause) en esta instancia
+    startup_command = command_from_args(sys.argv[1:])
+    if startup_command is not None:
+        QTimer.singleShot(0, lambda: _tray.run_command(startup_command))
+
+    # Difiere el trabajo no esencial hasta que el bucle de eventos esté libre
+    QTimer.singleShot(0, connect_pack_library)
+    if _config.get("update_check", True) and not startup_profile.is_enabled():
+        QTimer.singleShot(UPDATE_DELAY_MS, lambda: deferred_update_check(_tray))
+
+    # En modo perfil, cierra tras la primera iteración del bucle de eventos
+    if startup_profile.is_enabled():
+        QTimer.singleShot(0, lambda: (startup_profile.mark("event_loop"), startup_profile.report(), app.quit()))
 
     # Ejecuta el bucle de eventos principal
     exit_code: int = app.exec()
 
     # Finaliza hilos y libera recursos
+    instance_server.close()
     kb_monitor.stop()
+    shutdown_sound_engine()
+    metrics.stop_publishing()
+
+    # Garantiza que los cambios de configuración pendientes lleguen al disco
+    _config.flush()
+
+    # Vuelca las estadísticas de latencia recogidas durante la sesión
+    if latency_tracker.enabled:
+        latency_tracker.dump()
+    rate_governor.report()
     sys.exit(exit_code)
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# Las pruebas importan el paquete `app` desde la raíz del repositorio
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# La configuración y las cachés se escriben en un directorio temporal, nunca en
+# el perfil del usuario (get_config_path lee APPDATA en cada llamada)
+os.environ["APPDATA"] = tempfile.mkdtemp(prefix="typhera-tests-")
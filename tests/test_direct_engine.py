@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Any, List, Optional
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.core.direct_engine import DirectEngine
+from app.core.event_queue import KeyEventQueue
+from app.core.key_trace import ClockOutput
+
+# Salida de reloj cuyo arranque tarda como abrir un dispositivo real
+class SlowOutput(ClockOutput):
+    def __init__(self) -> None:
+        super().__init__()
+        self.open_s: float = 0.0
+        self.started: List[str] = []
+
+    def start(self, mixer: Any, before_render: Optional[Any] = None) -> None:
+        time.sleep(self.open_s)
+        self.started.append(threading.current_thread().name)
+        super().start(mixer, before_render)
+
+@pytest.fixture
+def engine() -> Any:
+    result: DirectEngine = DirectEngine(output=SlowOutput(), queue=KeyEventQueue())
+    result.idle_suspend_s = 0.01
+    result.start()
+    yield result
+    result.stop()
+
+def _suspend(engine: DirectEngine) -> None:
+    time.sleep(0.02)
+    engine.tick()
+    assert engine.suspended
+
+def _wait_resumed(engine: DirectEngine) -> None:
+    deadline: float = time.monotonic() + 2.0
+    while engine.suspended and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert not engine.suspended
+
+def test_warm_up_does_not_block_the_caller(engine: DirectEngine) -> None:
+    _suspend(engine)
+    engine.output.open_s = 0.2
+    started: float = time.perf_counter()
+    engine.warm_up()
+    # El gancho de teclado vuelve enseguida; el flujo se abre en otro hilo
+    assert time.perf_counter() - started < 0.05
+    _wait_resumed(engine)
+    assert engine.output.started[-1] == "audio-resume"
+
+def test_first_event_wakes_a_suspended_engine(engine: DirectEngine) -> None:
+    _suspend(engine)
+    engine.queue.push(0, 30, 0, 0)
+    _wait_resumed(engine)
+
+def test_warm_up_while_running_is_a_no_op(engine: DirectEngine) -> None:
+    engine.warm_up()
+    time.sleep(0.02)
+    assert engine.output.started == ["MainThread"]
@@ -0,0 +1,51 @@
+from typing import Any, List, Tuple
+
+from app.core.event_queue import KeyEventQueue
+
+def _drain(queue: KeyEventQueue) -> List[Tuple[int, Any, int, int]]:
+    events: List[Tuple[int, Any, int, int]] = []
+    queue.drain(lambda *event: events.append(event))
+    return events
+
+def test_capacity_rounds_up_to_a_power_of_two() -> None:
+    assert KeyEventQueue(5).capacity == 8
+    assert KeyEventQueue(8).capacity == 8
+
+def test_events_survive_index_wraparound() -> None:
+    queue: KeyEventQueue = KeyEventQueue(4)
+    # Tres vueltas completas con la cola a medio llenar en cada una
+    for round_ in range(6):
+        queue.push(round_, "a", 1, 2)
+        queue.push(round_, "b", 3, 4)
+        assert len(queue) == 2
+        assert _drain(queue) == [(round_, "a", 1, 2), (round_, "b", 3, 4)]
+    assert len(queue) == 0
+
+def test_full_queue_drops_and_counts() -> None:
+    queue: KeyEventQueue = KeyEventQueue(4)
+    assert all(queue.push(index, index, 0, 0) for index in range(4))
+    assert not queue.push(4, 4, 0, 0)
+    assert not queue.push(5, 5, 0, 0)
+    assert queue.dropped == 2
+    # Los eventos que ya estaban no se pisan
+    assert [event[0] for event in _drain(queue)] == [0, 1, 2, 3]
+    assert queue.push(6, 6, 0, 0)
+    assert queue.dropped == 2
+
+def test_clear_discards_pending_events() -> None:
+    queue: KeyEventQueue = KeyEventQueue(4)
+    queue.push(0, 0, 0, 0)
+    queue.clear()
+    assert len(queue) == 0
+    assert _drain(queue) == []
+
+def test_waker_is_coalesced_until_the_next_drain() -> None:
+    queue: KeyEventQueue = KeyEventQueue(4)
+    wakes: List[int] = []
+    queue.set_waker(lambda: wakes.append(1))
+    queue.push(0, 0, 0, 0)
+    queue.push(1, 1, 0, 0)
+    assert wakes == [1]
+    _drain(queue)
+    queue.push(2, 2, 0, 0)
+    assert wakes == [1, 1]
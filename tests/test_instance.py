@@ -0,0 +1,157 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+pytest.importorskip("PySide6.QtNetwork")
+
+from PySide6.QtCore import QCoreApplication
+
+from app.core import instance
+from app.core.config_manager import ConfigManager
+from app.core.instance import InstanceServer, command_from_args, send_command
+from app.core.state import AppState
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def qt_app() -> Any:
+    return QCoreApplication.instance() or QCoreApplication([])
+
+NAME: str = f"typhera-test-{os.getpid()}"
+
+@pytest.fixture(autouse=True)
+def private_name(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Un nombre propio para no hablar con una instancia real del usuario
+    monkeypatch.setattr(instance, "server_name", lambda: NAME)
+
+@pytest.fixture
+def server(qt_app: Any) -> Iterator[InstanceServer]:
+    result: InstanceServer = InstanceServer(lambda command: f"ok {command}")
+    assert result.listen()
+    yield result
+    result.close()
+
+def _in_other_process(code: str) -> str:
+    # Ejecuta un cliente en otro proceso, como una segunda ejecución de main.py,
+    # mientras este atiende su bucle de eventos
+    prelude: str = f"from app.core import instance; instance.server_name = lambda: {NAME!r}; "
+    env: Dict[str, str] = dict(os.environ, PYTHONPATH=ROOT)
+    process: subprocess.Popen = subprocess.Popen([sys.executable, "-c", prelude + code],
+                                                 stdout=subprocess.PIPE, text=True, env=env)
+    deadline: float = time.monotonic() + 20.0
+    while process.poll() is None and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+    output: str = process.communicate(timeout=5.0)[0]
+    return output.strip()
+
+def test_command_from_args() -> None:
+    assert command_from_args([]) is None
+    assert command_from_args(["--headless", "--pause"]) == "pause"
+    assert command_from_args(["--pack", "Mi Pack"]) == "pack Mi Pack"
+    assert command_from_args(["--send", "volume 30"]) == "volume 30"
+
+def test_commands_round_trip(server: InstanceServer) -> None:
+    code: str = "print(instance.send_command('status')); print(instance.send_command('  pack Blue  '))"
+    assert _in_other_process(code).splitlines() == ["ok status", "ok pack Blue"]
+
+def test_forward_uses_the_default_command(server: InstanceServer) -> None:
+    code: str = "print(instance.forward_to_running(['--headless'], default='status'))"
+    assert _in_other_process(code).splitlines() == ["ok status", "True"]
+
+def test_second_instance_defers_to_the_first(server: InstanceServer) -> None:
+    # La carrera de arranque: el segundo no debe reemplazar el socket del primero
+    code: str = ("from PySide6.QtCore import QCoreApplication; app = QCoreApplication([]); "
+                 "print(instance.InstanceServer(lambda c: 'x').listen())")
+    assert _in_other_process(code) == "False"
+    assert _in_other_process("print(instance.send_command('status'))") == "ok status"
+
+def test_commands_wait_for_the_handler(qt_app: Any) -> None:
+    # Una orden que llega antes de que exista la bandeja se atiende al instalarla
+    from PySide6.QtNetwork import QLocalSocket
+    early: InstanceServer = InstanceServer()
+    client: QLocalSocket = QLocalSocket()
+    try:
+        assert early.listen()
+        client.connectToServer(NAME)
+        assert client.waitForConnected(1000)
+        client.write(b"status\n")
+        client.flush()
+        for _ in range(20):
+            QCoreApplication.processEvents()
+            time.sleep(0.01)
+        assert client.bytesAvailable() == 0
+        early.set_handler(lambda command: f"ok {command}")
+        reply: bytes = b""
+        deadline: float = time.monotonic() + 5.0
+        while not reply.endswith(b"\n") and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            reply += bytes(client.readAll())
+        assert reply == b"ok status\n"
+    finally:
+        client.abort()
+        early.close()
+
+def test_no_instance_means_no_reply(qt_app: Any) -> None:
+    assert send_command("status", 200) is None
+
+@pytest.mark.skipif(sys.platform == "win32", reason="socket Unix")
+def test_stale_socket_is_replaced(qt_app: Any) -> None:
+    # Un socket abandonado por un proceso que terminó mal no impide arrancar
+    from PySide6.QtCore import QDir
+    path: str = os.path.join(QDir.tempPath(), NAME)
+    stale: socket.socket = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+    fresh: InstanceServer = InstanceServer(lambda command: "y")
+    try:
+        assert fresh.listen()
+    finally:
+        fresh.close()
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.current_pack_name: str = "Default"
+        self.volume: int = 50
+
+    def load_sound_pack(self, name: str) -> None:
+        self.current_pack_name = name
+
+    def set_volume(self, volume: int) -> None:
+        self.volume = volume
+
+def test_headless_command_handler(qt_app: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    from app import headless
+    from app.core import pack_library
+
+    class FakeLibrary:
+        def pack_names(self) -> List[str]:
+            return ["Default", "Blue"]
+
+    monkeypatch.setattr(pack_library, "get_pack_library", lambda: FakeLibrary())
+    engine: FakeEngine = FakeEngine()
+    quits: List[bool] = []
+    handle = headless._command_handler(engine, lambda: quits.append(True))
+
+    try:
+        assert handle("pause") == "ok paused pack=Default volume=50"
+        assert not AppState.is_active()
+        assert handle("toggle").startswith("ok active")
+        assert handle("pack Blue") == "ok active pack=Blue volume=50"
+        assert ConfigManager().get("sound_pack") == "Blue"
+        assert handle("pack Nope").startswith("error")
+        assert handle("volume 30").endswith("volume=30")
+        assert engine.volume == 30
+        assert handle("volume loud").startswith("error")
+        assert handle("show").startswith("error")
+        assert handle("bogus").startswith("error")
+        assert handle("quit") == "ok"
+        QCoreApplication.processEvents()
+        assert quits == [True]
+    finally:
+        AppState.set_active(True)
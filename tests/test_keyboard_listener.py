@@ -0,0 +1,116 @@
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from app.core import keyboard_listener
+from app.core.event_queue import KeyEventQueue
+from app.core.input_backends import InputBackend
+from app.core.key_map import key_map
+from app.core.keyboard_listener import KeyboardMonitor
+from app.core.state import AppState
+
+# Fuente controlada por la prueba: entrega eventos a mano y puede fallar al engancharse
+class FakeBackend(InputBackend):
+    name: str = "fake"
+
+    def __init__(self, on_press: Any, on_release: Any) -> None:
+        super().__init__(on_press, on_release)
+        self.started: bool = False
+        self.fail: bool = False
+        self.held: List[int] = []
+
+    def key_codes(self) -> Dict[str, List[int]]:
+        return {"alphanumeric": [30, 31], "modifier": [42]}
+
+    def start(self) -> None:
+        if self.fail:
+            raise OSError("sin permiso")
+        self.started = True
+
+    def stop(self) -> None:
+        self.started = False
+
+    def held_keys(self) -> List[int]:
+        return list(self.held)
+
+@pytest.fixture
+def monitor(monkeypatch: pytest.MonkeyPatch) -> Iterator[KeyboardMonitor]:
+    monkeypatch.setattr(keyboard_listener, "create_backend",
+                        lambda name, on_press, on_release, source, speed: FakeBackend(on_press, on_release))
+    AppState.set_active(True)
+    # Todas las teclas suenan también al soltarse (muestra 1)
+    key_map.set_release({}, 1)
+    result: KeyboardMonitor = KeyboardMonitor()
+    result.set_queue(KeyEventQueue())
+    result.start()
+    yield result
+    result.stop()
+    AppState._listeners.remove(result._on_state_changed)
+    AppState.set_active(True)
+    key_map.set_release({}, -1)
+
+def _pushed(monitor: KeyboardMonitor) -> List[Any]:
+    # Vacía la cola del monitor y retorna (muestra, tecla) de cada evento
+    events: List[Any] = []
+    monitor.queue.drain(lambda sound, code, t_hook, t_push: events.append((sound, code)))
+    return events
+
+def test_input_backend_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        InputBackend(print, print)
+
+def test_failed_resume_stays_paused(monitor: KeyboardMonitor) -> None:
+    notified: List[bool] = []
+    AppState.add_listener(notified.append)
+    try:
+        AppState.set_active(False)
+        monitor.backend.fail = True
+        AppState.set_active(True)
+    finally:
+        AppState._listeners.remove(notified.append)
+    assert not AppState.is_active()
+    assert not monitor.backend.started
+    # Los oyentes registrados después del monitor nunca ven el estado revertido
+    assert True not in notified
+
+def test_failed_start_begins_paused(monkeypatch: pytest.MonkeyPatch) -> None:
+    def failing(name: str, on_press: Any, on_release: Any, source: Any, speed: float) -> FakeBackend:
+        backend: FakeBackend = FakeBackend(on_press, on_release)
+        backend.fail = True
+        return backend
+    monkeypatch.setattr(keyboard_listener, "create_backend", failing)
+    AppState.set_active(True)
+    result: KeyboardMonitor = KeyboardMonitor()
+    try:
+        result.start()
+        assert not AppState.is_active()
+        # Al reanudar con la fuente disponible se engancha
+        result.backend.fail = False
+        AppState.set_active(True)
+        assert result.backend.started
+    finally:
+        result.stop()
+        AppState._listeners.remove(result._on_state_changed)
+        AppState.set_active(True)
+
+def test_keys_held_across_pause_stay_silent(monitor: KeyboardMonitor) -> None:
+    AppState.set_active(False)
+    monitor.backend.held = [30]
+    AppState.set_active(True)
+    assert monitor.backend.started
+    # Repetición automática y liberación de la tecla mantenida: sin sonido
+    monitor.on_press(30)
+    monitor.on_release(30)
+    # Las demás teclas y la siguiente pulsación de la misma suenan con normalidad
+    monitor.on_press(31)
+    monitor.on_release(31)
+    monitor.on_press(30)
+    assert _pushed(monitor) == [(0, 31), (1, 31), (0, 30)]
+
+def test_pause_forgets_pressed_keys(monitor: KeyboardMonitor) -> None:
+    monitor.on_press(30)
+    AppState.set_active(False)
+    AppState.set_active(True)
+    # La liberación de una tecla soltada durante la pausa no suena
+    monitor.on_release(30)
+    assert _pushed(monitor) == [(0, 30)]
@@ -0,0 +1,20 @@
+import json
+import os
+from pathlib import Path
+
+from app.core.metrics import Metrics
+
+def test_dump_writes_the_snapshot_atomically(tmp_path: Path) -> None:
+    target: Path = tmp_path / "metrics.json"
+    Metrics().dump(str(target))
+    assert "events_received" in json.loads(target.read_text(encoding='utf-8'))
+    assert os.listdir(tmp_path) == ["metrics.json"]
+
+def test_dump_logs_and_survives_write_errors(tmp_path: Path, capsys) -> None:
+    Metrics().dump(str(tmp_path / "missing" / "metrics.json"))
+    assert "Error guardando métricas" in capsys.readouterr().out
+    # Destino ocupado por una carpeta: falla os.replace y no queda el temporal
+    (tmp_path / "busy.json").mkdir()
+    Metrics().dump(str(tmp_path / "busy.json"))
+    assert "Error guardando métricas" in capsys.readouterr().out
+    assert sorted(os.listdir(tmp_path)) == ["busy.json"]
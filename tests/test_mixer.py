@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.mixer import Mixer
+
+def test_float32_samples_get_their_peak_level() -> None:
+    # Las muestras decodificadas (WAV/FLAC/OGG) son float32 en [-1, 1]
+    mixer: Mixer = Mixer(48000, 2)
+    loud = np.full((100, 2), 0.8, dtype=np.float32)
+    quiet = np.full((100, 2), -0.25, dtype=np.float32)
+    mixer.set_samples([loud, quiet])
+    assert mixer._levels == pytest.approx([0.8, 0.25])
+
+def test_int16_levels_are_normalised_and_gain_applied() -> None:
+    # -32768 no debe desbordar al calcular el pico y la ganancia escala el nivel
+    mixer: Mixer = Mixer(48000, 2)
+    full = np.array([[-32768, 0], [100, 200]], dtype=np.int16)
+    half = np.array([[16384, -16384]], dtype=np.int16)
+    mixer.set_samples([full, half], gains=[1.0, 0.5])
+    assert mixer._levels == pytest.approx([1.0, 0.25])
+    assert mixer._scales[0] == pytest.approx(1.0 / 32768.0)
+
+def test_quietest_policy_steals_the_quiet_float_voice() -> None:
+    mixer: Mixer = Mixer(48000, 2, max_voices=2, steal_policy="quietest")
+    mixer.set_samples([np.full((48000, 2), 0.9, dtype=np.float32),
+                       np.full((48000, 2), 0.1, dtype=np.float32)])
+    mixer.trigger(1, "a")
+    mixer.trigger(0, "b")
+    mixer.trigger(0, "c")
+    # La voz silenciosa (muestra 1) es la que se reutiliza
+    assert sorted(mixer._voice_sample.tolist()) == [0, 0]
+
+def test_trigger_ignores_indices_outside_the_current_pack() -> None:
+    mixer: Mixer = Mixer(48000, 2)
+    sample = np.zeros((100, 2), dtype=np.float32)
+    mixer.set_samples([sample, sample])
+    # Un evento encolado para el pack anterior llega tras cambiar a uno más corto
+    mixer.set_samples([sample])
+    mixer.trigger(1, "a")
+    mixer.trigger(-1, "b")
+    assert mixer.active_voices() == 0
@@ -0,0 +1,58 @@
+from app.core.pack_cache import CachedPack, PackCache
+from app.core.sound_pack import SoundPack
+
+def _entry(name: str, nbytes: int) -> CachedPack:
+    return CachedPack(SoundPack(name, [], {}), nbytes=nbytes)
+
+def _cache(budget: int, *sizes: int) -> PackCache:
+    # Caché con los packs p0, p1... insertados en orden
+    cache: PackCache = PackCache(budget)
+    for index, nbytes in enumerate(sizes):
+        cache.put(f"p{index}", _entry(f"p{index}", nbytes))
+    return cache
+
+def test_least_recently_used_pack_is_evicted_over_budget() -> None:
+    cache: PackCache = _cache(100, 40, 40)
+    cache.put("p2", _entry("p2", 40))
+    assert list(cache) == ["p1", "p2"]
+    assert cache.total_bytes == 80
+
+def test_get_refreshes_recency() -> None:
+    cache: PackCache = _cache(100, 40, 40)
+    assert cache.get("p0") is not None
+    cache.put("p2", _entry("p2", 40))
+    assert list(cache) == ["p0", "p2"]
+    assert cache.get("missing") is None
+
+def test_eviction_frees_as_many_packs_as_needed() -> None:
+    cache: PackCache = _cache(100, 30, 30, 30)
+    cache.put("big", _entry("big", 90))
+    assert list(cache) == ["big"]
+    assert cache.total_bytes == 90
+
+def test_pinned_and_new_packs_are_never_evicted() -> None:
+    cache: PackCache = _cache(100, 60)
+    cache.put("p1", _entry("p1", 60), pinned="p0")
+    # Ambos superan el presupuesto juntos, pero ninguno puede descartarse
+    assert list(cache) == ["p0", "p1"]
+    assert cache.total_bytes == 120
+    cache.put("p2", _entry("p2", 10), pinned="p0")
+    assert list(cache) == ["p0", "p2"]
+    assert cache.total_bytes == 70
+
+def test_replace_and_invalidate_keep_the_byte_count() -> None:
+    cache: PackCache = _cache(100, 40, 20)
+    cache.put("p0", _entry("p0", 10))
+    assert cache.total_bytes == 30
+    assert list(cache) == ["p1", "p0"]
+    cache.invalidate("p1")
+    cache.invalidate("missing")
+    assert cache.total_bytes == 10
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+def test_zero_budget_keeps_only_the_newest_pack() -> None:
+    cache: PackCache = _cache(0, 10, 10)
+    assert list(cache) == ["p1"]
+    assert "p0" not in cache
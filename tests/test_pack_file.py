@@ -0,0 +1,128 @@
+import json
+import wave
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core import pack_file
+from app.core.pack_file import HEADER, PAGE_SIZE, load_samples, read_manifest, write_pack
+from app.core.sound_pack import SoundPack
+
+RATE: int = 48000
+
+def _write_wav(path: Path, frequency: float, frames: int) -> Any:
+    # WAV estéreo de 16 bits que empieza con volumen alto (sin silencio que recortar)
+    t = np.arange(frames) / RATE
+    mono = 0.5 * np.cos(2 * np.pi * frequency * t)
+    data = np.repeat(mono[:, None], 2, axis=1).astype(np.float32)
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((data * 32767.0).astype('<i2').tobytes())
+    return data
+
+@pytest.fixture
+def pack(tmp_path: Path) -> SoundPack:
+    folder: Path = tmp_path / "Blue"
+    folder.mkdir()
+    _write_wav(folder / "click.wav", 440.0, 1000)
+    _write_wav(folder / "space.wav", 220.0, 3000)
+    _write_wav(folder / "release.wav", 880.0, 500)
+    result = SoundPack.from_folder("Blue", folder)
+    assert result is not None
+    return result
+
+def _expected(pack: SoundPack) -> List[Any]:
+    # Las mismas muestras leídas directamente de los WAV
+    from app.core.mixer import decode_wav
+    return [(np.clip(decode_wav(path, RATE, 2), -1.0, 1.0) * 32767.0).astype('<i2')
+            for path in pack.bank()]
+
+def test_raw_round_trip_is_page_aligned(tmp_path: Path, pack: SoundPack) -> None:
+    target: Path = tmp_path / "Blue.typhera"
+    write_pack(target, pack, RATE, 2, compress=False)
+
+    manifest, samples = load_samples(target)
+    assert manifest["press_count"] == 2
+    assert manifest["groups"] == {"space": 1}
+    assert manifest["release_default"] == 0
+    for sample, expected in zip(samples, _expected(pack)):
+        assert sample.dtype == np.int16
+        assert np.array_equal(sample, expected)
+
+    # El inicio de datos y cada bloque caen en un límite de página
+    with open(target, 'rb') as f:
+        data_offset: int = HEADER.unpack(f.read(HEADER.size))[4]
+    assert data_offset % PAGE_SIZE == 0
+    assert all((data_offset + entry["offset"]) % PAGE_SIZE == 0 for entry in manifest["samples"])
+
+def test_compressed_round_trip(tmp_path: Path, pack: SoundPack) -> None:
+    pytest.importorskip("zstandard")
+    target: Path = tmp_path / "Blue.typhera"
+    write_pack(target, pack, RATE, 2, compress=True)
+    manifest, samples = load_samples(target)
+    assert read_manifest(target) == manifest
+    for sample, expected in zip(samples, _expected(pack)):
+        assert np.array_equal(sample, expected)
+
+def test_to_sound_pack_describes_the_container(tmp_path: Path, pack: SoundPack) -> None:
+    target: Path = tmp_path / "Blue.typhera"
+    write_pack(target, pack, RATE, 2, compress=False)
+    described: SoundPack = pack_file.to_sound_pack("Blue", target, read_manifest(target))
+    assert described.container == target
+    assert [p.name for p in described.bank()] == [p.name for p in pack.bank()]
+    assert described.release_indices() == pack.release_indices()
+
+@pytest.fixture
+def raw_pack(tmp_path: Path, pack: SoundPack) -> bytes:
+    target: Path = tmp_path / "Blue.typhera"
+    write_pack(target, pack, RATE, 2, compress=False)
+    return target.read_bytes()
+
+def _header(raw: bytes) -> tuple:
+    return HEADER.unpack(raw[:HEADER.size])
+
+@pytest.mark.parametrize("damage", ["empty", "short_header", "magic", "version",
+                                    "short_manifest", "bad_json", "missing_samples",
+                                    "overlap", "truncated_data", "wrong_size"])
+def test_damaged_packs_raise_value_error(tmp_path: Path, raw_pack: bytes, damage: str) -> None:
+    magic, version, flags, manifest_len, data_offset = _header(raw_pack)
+    manifest: Any = json.loads(raw_pack[HEADER.size:HEADER.size + manifest_len])
+
+    def rebuild(new_manifest: Any) -> bytes:
+        # Reescribe el manifiesto conservando la posición de los datos
+        encoded: bytes = json.dumps(new_manifest).encode('utf-8')
+        head: bytes = HEADER.pack(magic, version, flags, len(encoded), data_offset) + encoded
+        return head + b"\0" * (data_offset - len(head)) + raw_pack[data_offset:]
+
+    if damage == "empty":
+        data: bytes = b""
+    elif damage == "short_header":
+        data = raw_pack[:HEADER.size - 1]
+    elif damage == "magic":
+        data = b"NOTAPACK" + raw_pack[8:]
+    elif damage == "version":
+        data = HEADER.pack(magic, version + 1, flags, manifest_len, data_offset) + raw_pack[HEADER.size:]
+    elif damage == "short_manifest":
+        data = raw_pack[:HEADER.size + manifest_len // 2]
+    elif damage == "bad_json":
+        data = raw_pack[:HEADER.size] + b"{" * manifest_len + raw_pack[HEADER.size + manifest_len:]
+    elif damage == "missing_samples":
+        del manifest["samples"]
+        data = rebuild(manifest)
+    elif damage == "overlap":
+        data = HEADER.pack(magic, version, flags, manifest_len, HEADER.size) + raw_pack[HEADER.size:]
+    elif damage == "truncated_data":
+        data = raw_pack[:-10]
+    else:
+        manifest["samples"][0]["frames"] += 1
+        data = rebuild(manifest)
+
+    target: Path = tmp_path / "damaged.typhera"
+    target.write_bytes(data)
+    with pytest.raises(ValueError):
+        load_samples(target)
@@ -0,0 +1,46 @@
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.pack_file import write_pack
+from app.core.pack_library import _probe_sample
+from app.core.sound_pack import SoundPack
+
+def _write_wav(path: Path, frames: int, rate: int = 48000) -> None:
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x00\x10" * 2 * frames)
+
+def test_wav_header_gives_duration_and_format(tmp_path: Path) -> None:
+    _write_wav(tmp_path / "click.wav", 24000, 48000)
+    assert _probe_sample(str(tmp_path / "click.wav")) == {
+        "duration": 0.5, "format": {"rate": 48000, "channels": 2, "width": 2}}
+
+def test_container_metadata_comes_from_the_manifest(tmp_path: Path) -> None:
+    folder: Path = tmp_path / "Blue"
+    folder.mkdir()
+    _write_wav(folder / "click.wav", 4800, 48000)
+    pack = SoundPack.from_folder("Blue", folder)
+    target: Path = tmp_path / "Blue.typhera"
+    write_pack(target, pack, 44100, 1, compress=False)
+    probe = _probe_sample(str(target))
+    assert probe["format"] == {"rate": 44100, "channels": 1, "width": 2}
+    assert probe["duration"] == pytest.approx(0.1, abs=0.002)
+
+def test_unreadable_samples_have_no_format(tmp_path: Path) -> None:
+    for name in ("broken.wav", "broken.typhera"):
+        (tmp_path / name).write_bytes(b"nope")
+        assert _probe_sample(str(tmp_path / name)) == {"duration": 0.0, "format": None}
+    assert _probe_sample(str(tmp_path / "missing.wav"))["format"] is None
+
+def test_flac_metadata_uses_soundfile(tmp_path: Path) -> None:
+    soundfile = pytest.importorskip("soundfile")
+    soundfile.write(str(tmp_path / "click.flac"), np.zeros((4800, 1), dtype=np.float32), 48000,
+                    subtype="PCM_16")
+    assert _probe_sample(str(tmp_path / "click.flac")) == {
+        "duration": 0.1, "format": {"rate": 48000, "channels": 1, "width": 2}}
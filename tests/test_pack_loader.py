@@ -0,0 +1,36 @@
+import wave
+from pathlib import Path
+
+import pytest
+
+from app.core import sound_import
+from app.core.pack_loader import native_bank
+from app.core.sound_pack import SoundPack, get_default_sound
+
+def _write_wav(path: Path) -> None:
+    # Clic corto de 16 bits, mono, a 48 kHz
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(48000)
+        wav.writeframes(b"\x00\x40" * 480)
+
+@pytest.fixture
+def no_decoder(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sound_import, "soundfile", None)
+
+def test_undecodable_samples_fall_back_to_the_main_sample(tmp_path: Path, no_decoder: None) -> None:
+    _write_wav(tmp_path / "click.wav")
+    (tmp_path / "space.flac").write_bytes(b"fLaC")
+    pack: SoundPack = SoundPack("Test", [tmp_path / "click.wav", tmp_path / "space.flac"],
+                                {"space": 1})
+    bank = native_bank(pack, 48000, 1)
+    assert len(bank) == 2
+    assert bank[1] is bank[0]
+    assert bank[0].path.suffix == ".wav"
+
+def test_pack_without_any_wav_uses_the_bundled_click(tmp_path: Path, no_decoder: None) -> None:
+    (tmp_path / "click.ogg").write_bytes(b"OggS")
+    pack: SoundPack = SoundPack("Test", [tmp_path / "click.ogg"], {})
+    bank = native_bank(pack, 48000, 1)
+    assert [item.path for item in bank] == [get_default_sound()]
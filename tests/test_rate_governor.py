@@ -0,0 +1,57 @@
+from app.core.rate_governor import EXIT_RATIO, WINDOW_NS, RateGovernor
+
+MS: int = 1_000_000
+
+def _type(governor: RateGovernor, start: int, rate: float, seconds: float) -> int:
+    # Entrega pulsaciones a frecuencia constante y retorna cuántas pasaron
+    step: int = int(1e9 / rate)
+    admitted: int = 0
+    for index in range(int(rate * seconds)):
+        admitted += governor.admit(start + index * step)
+    return admitted
+
+def test_fast_typing_is_never_thinned() -> None:
+    governor: RateGovernor = RateGovernor(60)
+    # 20 pulsaciones/s con sus liberaciones: 40 eventos/s por debajo de 60
+    step: int = 50 * MS
+    for index in range(100):
+        assert governor.admit(index * step)
+        assert governor.admit_release()
+    assert not governor.thinning
+    assert governor.dropped == 0
+
+def test_burst_is_thinned_to_the_threshold() -> None:
+    governor: RateGovernor = RateGovernor(50)
+    admitted: int = _type(governor, 0, 500, 1.0)
+    assert governor.thinning
+    # La primera ventana pasa entera; después una pulsación cada 20 ms
+    assert 90 <= admitted <= 110
+    assert governor.dropped == 500 - admitted
+    # En modo aclarado las liberaciones no suenan
+    assert not governor.admit_release()
+
+def test_thinning_needs_a_full_window_to_start() -> None:
+    governor: RateGovernor = RateGovernor(50)
+    _type(governor, 0, 500, (WINDOW_NS - MS) / 1e9)
+    assert not governor.thinning
+    governor.admit(WINDOW_NS)
+    assert governor.thinning
+
+def test_hysteresis_keeps_thinning_until_half_the_threshold() -> None:
+    governor: RateGovernor = RateGovernor(50)
+    _type(governor, 0, 500, 0.2)
+    assert governor.thinning
+    # Por debajo del límite pero por encima de la mitad sigue aclarando
+    start: int = 200 * MS
+    _type(governor, start, 40, 0.5)
+    assert governor.thinning
+    # Por debajo de la mitad sale del modo aclarado
+    start += 500 * MS
+    _type(governor, start, 50 * EXIT_RATIO / 2, 1.0)
+    assert not governor.thinning
+    assert governor.admit_release()
+
+def test_zero_threshold_disables_the_limit() -> None:
+    governor: RateGovernor = RateGovernor(0)
+    assert _type(governor, 0, 1000, 0.5) == 500
+    assert not governor.thinning
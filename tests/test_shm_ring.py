@@ -0,0 +1,81 @@
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+
+from app.core.engine_process import ProcessEngine
+from app.core.shm_ring import RECORD, SharedEventRing, _DATA
+
+@pytest.fixture
+def rings() -> Iterator[Tuple[SharedEventRing, SharedEventRing]]:
+    # Productor (dueño del segmento) y consumidor unidos por nombre
+    producer: SharedEventRing = SharedEventRing(capacity=4)
+    consumer: SharedEventRing = SharedEventRing(producer.name)
+    yield producer, consumer
+    consumer.close()
+    producer.close()
+
+def _drain(ring: SharedEventRing) -> List[Tuple[int, Any, int, int]]:
+    events: List[Tuple[int, Any, int, int]] = []
+    ring.drain(lambda *event: events.append(event))
+    return events
+
+def test_round_trip_and_wraparound(rings: Tuple[SharedEventRing, SharedEventRing]) -> None:
+    producer, consumer = rings
+    for round_ in range(3):
+        for index in range(3):
+            assert producer.push(index, 30 + index, round_, index)
+        assert len(consumer) == 3
+        assert _drain(consumer) == [(index, 30 + index, round_, index) for index in range(3)]
+    assert len(consumer) == 0
+
+def test_full_ring_counts_drops(rings: Tuple[SharedEventRing, SharedEventRing]) -> None:
+    producer, consumer = rings
+    assert all(producer.push(0, 1, 0, 0) for _ in range(4))
+    assert not producer.push(0, 1, 0, 0)
+    assert producer.dropped == 1
+    assert len(_drain(consumer)) == 4
+
+def test_unpublished_record_is_left_for_the_next_drain(
+        rings: Tuple[SharedEventRing, SharedEventRing]) -> None:
+    producer, consumer = rings
+    producer.push(1, 30, 0, 0)
+    producer.push(2, 31, 0, 0)
+    # Simula que el nuevo tail es visible antes que el segundo registro
+    RECORD.pack_into(producer.shm.buf, _DATA + RECORD.size, 0, 0, 0, 0, 0)
+    assert _drain(consumer) == [(1, 30, 0, 0)]
+    assert len(consumer) == 1
+    producer.push(3, 32, 0, 0)
+    RECORD.pack_into(producer.shm.buf, _DATA + RECORD.size, 2, 31, 0, 0, 2)
+    assert _drain(consumer) == [(2, 31, 0, 0), (3, 32, 0, 0)]
+
+def test_sleeping_consumer_is_woken_once(rings: Tuple[SharedEventRing, SharedEventRing]) -> None:
+    producer, consumer = rings
+    wakes: List[int] = []
+    producer.set_remote_waker(lambda: wakes.append(1))
+    producer.push(0, 30, 0, 0)
+    assert wakes == []
+    consumer.set_waker(lambda: None)
+    assert producer.sleeping
+    producer.push(0, 30, 0, 0)
+    producer.push(0, 31, 0, 0)
+    assert wakes == [1]
+    assert not consumer.sleeping
+
+def test_process_engine_sends_warm_only_while_suspended() -> None:
+    engine: ProcessEngine = ProcessEngine()
+    sent: List[str] = []
+    engine._send = lambda cmd, value=None: sent.append(cmd)
+    consumer: SharedEventRing = SharedEventRing(engine.ring.name)
+    try:
+        engine.warm_up()
+        engine.ring.push(0, 30, 0, 0)
+        assert sent == []
+        consumer.set_waker(lambda: None)
+        engine.warm_up()
+        assert sent == ["warm"]
+        consumer.set_waker(lambda: None)
+        engine.ring.push(0, 30, 0, 0)
+        assert sent == ["warm", "warm"]
+    finally:
+        consumer.close()
+        engine.ring.close()
@@ -0,0 +1,57 @@
+import os
+import wave
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.core import sound_import
+from app.core.sound_import import ImportedSample, import_sample
+
+def _write_wav(path: Path, amplitude: int) -> None:
+    # Onda cuadrada de 16 bits, mono, a 48 kHz, que suena desde la primera muestra
+    frame: bytes = amplitude.to_bytes(2, 'little', signed=True)
+    inverse: bytes = (-amplitude).to_bytes(2, 'little', signed=True)
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(48000)
+        wav.writeframes((frame * 24 + inverse * 24) * 100)
+
+@pytest.fixture(autouse=True)
+def trusted_mtime(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Sin la espera de archivos recién modificados, para probar la firma sola
+    monkeypatch.setattr(sound_import, "RACY_NS", -1)
+
+def test_in_place_edit_with_restored_mtime_is_reimported(tmp_path: Path) -> None:
+    path: Path = tmp_path / "click.wav"
+    _write_wav(path, 0x1000)
+    first: ImportedSample = import_sample(path, 48000, 1)
+    stat = path.stat()
+    # Mismo tamaño y mismo mtime, contenido distinto (p. ej. cp -p)
+    _write_wav(path, 0x2000)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert path.stat().st_size == stat.st_size
+    second: ImportedSample = import_sample(path, 48000, 1)
+    assert second.gain == pytest.approx(first.gain / 2, rel=0.01)
+
+def test_identical_file_edited_later_is_not_reused(tmp_path: Path) -> None:
+    original: Path = tmp_path / "a.wav"
+    copy: Path = tmp_path / "b.wav"
+    _write_wav(original, 0x1000)
+    _write_wav(copy, 0x1000)
+    # El WAV nativo se usa tal cual: la entrada apunta al primer archivo importado
+    assert import_sample(original, 48000, 1).path == original
+    _write_wav(original, 0x2000)
+    imported: ImportedSample = import_sample(copy, 48000, 1)
+    assert imported.path == copy
+
+def test_unchanged_file_reuses_the_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path: Path = tmp_path / "click.wav"
+    _write_wav(path, 0x1000)
+    first: ImportedSample = import_sample(path, 48000, 1)
+    monkeypatch.setattr(sound_import, "decode_audio",
+                        lambda *args: pytest.fail("se volvió a decodificar"))
+    second: ImportedSample = import_sample(path, 48000, 1)
+    assert (second.path, second.gain) == (first.path, first.gain)
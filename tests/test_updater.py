@@ -0,0 +1,124 @@
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+pytest.importorskip("PySide6.QtNetwork")
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from app.core.config_manager import ConfigManager
+from app.utils.update_stub import make_handler
+from app.utils.updater import BACKOFF_BASE_MINUTES, UpdateChecker
+
+# Pruebas del verificador contra el servidor local de update_stub.py
+
+@pytest.fixture(scope="module")
+def qt_app() -> Any:
+    return QCoreApplication.instance() or QCoreApplication([])
+
+def _serve(fail: int = 0, status: int = 503, retry_after: int = 0) -> Tuple[ThreadingHTTPServer, type]:
+    handler: type = make_handler("9.9.9", fail, status, retry_after)
+    handler.log_message = lambda *args: None
+    server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ConfigManager().set("update_url", f"http://127.0.0.1:{server.server_port}/releases/latest")
+    return server, handler
+
+@pytest.fixture
+def checker(qt_app: Any) -> Iterator[UpdateChecker]:
+    ConfigManager().set("update_cache", {})
+    result: UpdateChecker = UpdateChecker()
+    result.found: List[Tuple[str, str]] = []
+    result.update_available.connect(lambda tag, url: result.found.append((tag, url)))
+    yield result
+    result.deleteLater()
+
+def _check(checker: UpdateChecker, force: bool = False) -> None:
+    # Lanza la consulta y espera a que termine la respuesta
+    loop: QEventLoop = QEventLoop()
+    checker.manager.finished.connect(loop.quit)
+    QTimer.singleShot(5000, loop.quit)
+    checker.check(force)
+    loop.exec()
+    checker.manager.finished.disconnect(loop.quit)
+
+def _cache() -> Dict[str, Any]:
+    return dict(ConfigManager().get("update_cache", {}))
+
+def test_unchanged_release_comes_back_as_304(checker: UpdateChecker) -> None:
+    server, handler = _serve()
+    try:
+        _check(checker, force=True)
+        cache: Dict[str, Any] = _cache()
+        assert handler.served == [200]
+        assert cache["tag"] == "9.9.9"
+        assert cache["etag"] and cache["last_modified"]
+
+        # If-None-Match: 304 sin cuerpo y la versión guardada se reutiliza
+        _check(checker, force=True)
+        assert handler.served == [200, 304]
+        assert _cache()["etag"] == cache["etag"]
+        assert [tag for tag, url in checker.found] == ["9.9.9", "9.9.9"]
+
+        # Sin ETag guardado basta If-Modified-Since
+        ConfigManager().set("update_cache", dict(_cache(), etag=""))
+        _check(checker, force=True)
+        assert handler.served == [200, 304, 304]
+    finally:
+        server.shutdown()
+
+def test_recent_check_is_not_repeated(checker: UpdateChecker) -> None:
+    server, handler = _serve()
+    try:
+        _check(checker)
+        assert handler.served == [200]
+        # Dentro del intervalo de comprobación no sale ninguna petición
+        checker.check()
+        QCoreApplication.processEvents()
+        assert handler.served == [200]
+    finally:
+        server.shutdown()
+
+def test_failures_back_off_exponentially(checker: UpdateChecker) -> None:
+    server, handler = _serve(fail=2, status=503)
+    try:
+        _check(checker)
+        cache: Dict[str, Any] = _cache()
+        assert cache["failures"] == 1
+        wait: timedelta = datetime.fromisoformat(cache["retry_at"]) - datetime.now()
+        assert timedelta(minutes=BACKOFF_BASE_MINUTES - 1) < wait <= timedelta(minutes=BACKOFF_BASE_MINUTES)
+
+        # Durante la espera no se consulta
+        checker.check()
+        QCoreApplication.processEvents()
+        assert handler.served == [503]
+
+        # Vencida la espera, el segundo fallo la duplica
+        ConfigManager().set("update_cache", dict(cache, retry_at=datetime.now().isoformat()))
+        _check(checker)
+        cache = _cache()
+        assert cache["failures"] == 2
+        wait = datetime.fromisoformat(cache["retry_at"]) - datetime.now()
+        assert wait > timedelta(minutes=2 * BACKOFF_BASE_MINUTES - 1)
+
+        # Un acierto reinicia el contador
+        ConfigManager().set("update_cache", dict(cache, retry_at=datetime.now().isoformat()))
+        _check(checker)
+        assert handler.served == [503, 503, 200]
+        assert _cache()["failures"] == 0
+        assert _cache()["retry_at"] == ""
+    finally:
+        server.shutdown()
+
+def test_retry_after_extends_the_backoff(checker: UpdateChecker) -> None:
+    server, handler = _serve(fail=1, status=429, retry_after=7200)
+    try:
+        _check(checker)
+        wait: timedelta = datetime.fromisoformat(_cache()["retry_at"]) - datetime.now()
+        assert handler.served == [429]
+        assert timedelta(hours=1, minutes=59) < wait <= timedelta(hours=2)
+    finally:
+        server.shutdown()
@@ -0,0 +1,87 @@
+from typing import List
+
+from app.core.voices import DEFAULT_POLICY, VoiceAllocator
+
+def _fill(allocator: VoiceAllocator, levels: List[float]) -> List[int]:
+    # Ocupa una voz por nivel, una tecla distinta cada vez y 10 ns de separación
+    return [allocator.allocate(index, level, index * 10, 1000) for index, level in enumerate(levels)]
+
+def test_voices_are_created_lazily_and_reused_from_the_free_stack() -> None:
+    allocator: VoiceAllocator = VoiceAllocator(4)
+    assert _fill(allocator, [1.0, 1.0]) == [0, 1]
+    assert allocator.created == 2
+    assert allocator.active_count == 2
+    allocator.release(0)
+    assert allocator.active_count == 1
+    # La voz liberada se reutiliza antes de crear otra
+    assert allocator.allocate("a", 1.0, 100, 1000) == 0
+    assert allocator.created == 2
+    assert allocator.allocate("b", 1.0, 110, 1000) == 2
+    assert allocator.steals == 0
+
+def test_release_ignores_inactive_and_out_of_range_voices() -> None:
+    allocator: VoiceAllocator = VoiceAllocator(2)
+    _fill(allocator, [1.0])
+    allocator.release(0)
+    allocator.release(0)
+    allocator.release(5)
+    assert allocator.active_count == 0
+    assert allocator.allocate("a", 1.0, 0, 1000) == 0
+    assert allocator.allocate("b", 1.0, 0, 1000) == 1
+
+def test_oldest_policy_steals_in_start_order() -> None:
+    allocator: VoiceAllocator = VoiceAllocator(3, "oldest")
+    _fill(allocator, [1.0, 1.0, 1.0])
+    assert allocator.allocate("a", 1.0, 100, 1000) == 0
+    assert allocator.last_stolen
+    assert allocator.allocate("b", 1.0, 110, 1000) == 1
+    # Una voz liberada sale de la lista: la siguiente más antigua es la 0 reutilizada
+    allocator.release(2)
+    assert allocator.allocate("c", 1.0, 120, 1000) == 2
+    assert not allocator.last_stolen
+    assert allocator.allocate("d", 1.0, 130, 1000) == 0
+    assert allocator.steals == 3
+    assert allocator.active_count == 3
+
+def test_quietest_policy_weighs_level_by_remaining_time() -> None:
+    allocator: VoiceAllocator = VoiceAllocator(3, "quietest")
+    allocator.allocate("a", 0.9, 0, 200)
+    allocator.allocate("b", 0.5, 0, 2000)
+    allocator.allocate("c", 0.6, 0, 1000)
+    # A 100 ns: 0.9 x 0.5 < 0.5 x 0.95 < 0.6 x 0.9, la voz fuerte y corta es la más baja
+    assert allocator.allocate("d", 1.0, 100, 1000) == 0
+    # A 1100 ns la voz 2 ya terminó: nivel 0 aunque la 1 siga sonando
+    assert allocator.allocate("e", 1.0, 1100, 1000) == 2
+    assert allocator.steals == 2
+
+def test_retrigger_policy_restarts_the_same_key() -> None:
+    allocator: VoiceAllocator = VoiceAllocator(3, "retrigger")
+    assert allocator.allocate(30, 1.0, 0, 1000) == 0
+    assert allocator.allocate(31, 1.0, 10, 1000) == 1
+    assert allocator.allocate(30, 1.0, 20, 1000) == 0
+    assert allocator.retriggers == 1
+    assert allocator.last_stolen
+    assert allocator.active_count == 2
+    # Reiniciada, la voz 0 pasa a ser la más reciente: con todas ocupadas se roba la 1
+    allocator.allocate(32, 1.0, 30, 1000)
+    assert allocator.allocate(33, 1.0, 40, 1000) == 1
+    # La tecla 31 ya no tiene voz propia
+    assert allocator.allocate(31, 1.0, 50, 1000) == 0
+    assert allocator.retriggers == 1
+
+def test_retrigger_mapping_is_dropped_on_release_and_reset() -> None:
+    allocator: VoiceAllocator = VoiceAllocator(2, "retrigger")
+    allocator.allocate(30, 1.0, 0, 1000)
+    allocator.release(0)
+    allocator.allocate(31, 1.0, 10, 1000)
+    assert allocator.allocate(30, 1.0, 20, 1000) == 1
+    assert allocator.retriggers == 0
+    allocator.reset()
+    assert allocator.active_count == 0
+    assert allocator.created == 0
+    assert allocator.allocate(30, 1.0, 30, 1000) == 0
+    assert allocator.retriggers == 0
+
+def test_unknown_policy_falls_back_to_default() -> None:
+    assert VoiceAllocator(0, "loudest").policy == DEFAULT_POLICY
+    assert VoiceAllocator(0).capacity == 1